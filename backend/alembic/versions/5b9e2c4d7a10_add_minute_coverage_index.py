@@ -0,0 +1,100 @@
+"""add minute coverage index
+
+Revision ID: 5b9e2c4d7a10
+Revises: 3d26f8f1a8c7
+Create Date: 2026-10-18 06:10:00.000000
+"""
+
+from collections.abc import Sequence
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b9e2c4d7a10"
+down_revision: str | None = "3d26f8f1a8c7"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+_COVERAGE_DAY_MINUTES = 25 * 60
+_MARKET_TZ = ZoneInfo("America/New_York")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "market_bars_minute_coverage",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("ticker", sa.String(length=16), nullable=False),
+        sa.Column("trade_date", sa.Date(), nullable=False),
+        sa.Column("present_mask", postgresql.BIT(length=_COVERAGE_DAY_MINUTES), nullable=False),
+        sa.Column("final_mask", postgresql.BIT(length=_COVERAGE_DAY_MINUTES), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "ticker",
+            "trade_date",
+            name="uq_market_bars_minute_coverage_ticker_trade_date",
+        ),
+    )
+    op.create_index(
+        "ix_market_bars_minute_coverage_trade_date",
+        "market_bars_minute_coverage",
+        ["trade_date"],
+        unique=False,
+    )
+
+    # Minute bars are kept for a short retention window, so the backfill stays small.
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(
+            """
+            SELECT ticker, trade_date, start_at, is_final
+            FROM market_bars_minute
+            ORDER BY ticker, trade_date
+            """
+        )
+    )
+    masks: dict[tuple[str, object], list[int]] = {}
+    for ticker, trade_date, start_at, is_final in rows:
+        day_start = datetime.combine(trade_date, time.min, tzinfo=_MARKET_TZ).astimezone(timezone.utc)
+        index = (start_at.astimezone(timezone.utc) - day_start) // timedelta(minutes=1)
+        if index < 0 or index >= _COVERAGE_DAY_MINUTES:
+            continue
+        item = masks.setdefault((ticker, trade_date), [0, 0])
+        item[0] |= 1 << index
+        if is_final:
+            item[1] |= 1 << index
+
+    if masks:
+        coverage = sa.table(
+            "market_bars_minute_coverage",
+            sa.column("ticker", sa.String()),
+            sa.column("trade_date", sa.Date()),
+            sa.column("present_mask", postgresql.BIT(length=_COVERAGE_DAY_MINUTES)),
+            sa.column("final_mask", postgresql.BIT(length=_COVERAGE_DAY_MINUTES)),
+        )
+        op.bulk_insert(
+            coverage,
+            [
+                {
+                    "ticker": ticker,
+                    "trade_date": trade_date,
+                    "present_mask": _to_bit_string(present),
+                    "final_mask": _to_bit_string(final),
+                }
+                for (ticker, trade_date), (present, final) in masks.items()
+            ],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_market_bars_minute_coverage_trade_date", table_name="market_bars_minute_coverage")
+    op.drop_table("market_bars_minute_coverage")
+
+
+def _to_bit_string(mask: int) -> str:
+    return format(mask, f"0{_COVERAGE_DAY_MINUTES}b")[::-1]
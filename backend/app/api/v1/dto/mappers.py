@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from pydantic import TypeAdapter
+
 from app.api.v1.dto.auth import AccessTokenOut, UserOut
 from app.api.v1.dto.market_data import MarketBarOut, MarketSnapshotOut
 from app.api.v1.dto.watchlist import WatchlistItemDeletedOut, WatchlistItemOut
@@ -7,6 +9,8 @@ from app.domain.auth.schemas import AccessToken, User
 from app.domain.market_data.schemas import MarketBar, MarketSnapshot
 from app.domain.watchlist.schemas import WatchlistItem
 
+_MARKET_BARS_OUT = TypeAdapter(list[MarketBarOut])
+
 
 def to_user_out(user: User) -> UserOut:
     return UserOut(
@@ -54,6 +58,10 @@ def to_market_bar_out(bar: MarketBar) -> MarketBarOut:
     )
 
 
+def encode_market_bars_json(bars: list[MarketBar]) -> str:
+    return _MARKET_BARS_OUT.dump_json([to_market_bar_out(bar) for bar in bars]).decode()
+
+
 def to_market_snapshot_out(snapshot: MarketSnapshot) -> MarketSnapshotOut:
     return MarketSnapshotOut(
         ticker=snapshot.ticker,
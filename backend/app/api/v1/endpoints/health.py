@@ -1,8 +1,15 @@
 from fastapi import APIRouter
 
+from app.application import container
+
 router = APIRouter()
 
 
 @router.get("/health")
 async def health() -> dict:
     return {"status": "ok"}
+
+
+@router.get("/health/market-data")
+async def market_data_health() -> dict:
+    return {"status": "ok", "components": container.market_data_diagnostics()}
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Header, Response
 
 from app.api.deps import (
     get_current_user,
@@ -18,7 +18,8 @@ from app.api.v1.dto.market_data import (
     parse_market_snapshots_request,
     parse_market_trading_days_request,
 )
-from app.api.v1.dto.mappers import to_market_bar_out, to_market_snapshot_out
+from app.api.v1.dto.mappers import encode_market_bars_json, to_market_snapshot_out
+from app.application.market_data.entity_tags import entity_tag_for, entity_tag_matches
 from app.application.market_data.errors import (
     MarketDataRangeTooLargeError,
     MarketDataRateLimitedError,
@@ -28,6 +29,8 @@ from app.application.market_data.service import MarketDataApplicationService
 from app.domain.auth.schemas import User
 
 router = APIRouter()
+# Clients may keep responses but must revalidate each poll with If-None-Match.
+_REVALIDATE_CACHE_CONTROL = "private, no-cache"
 _MARKET_DATA_ERROR_MAPPING = {
     MarketDataRangeTooLargeError: (
         413,
@@ -49,14 +52,14 @@ _MARKET_DATA_ERROR_MAPPING = {
 
 @router.get("/bars", response_model=list[MarketBarOut])
 async def list_bars(
-    response: Response,
     request: MarketBarsRequest = Depends(parse_market_bars_request),
     service: MarketDataApplicationService = Depends(get_market_data_service),
     current_user: User = Depends(get_current_user),
-) -> list[MarketBarOut]:
+    if_none_match: str | None = Header(default=None),
+) -> Response:
     _ = current_user
     try:
-        result = await service.list_bars_with_meta(
+        result = await service.list_bars_encoded(
             ticker=request.symbol,
             timespan=request.timespan,
             multiplier=request.multiplier,
@@ -65,11 +68,20 @@ async def list_bars(
             end_date=request.to_date,
             limit=request.limit,
             enforce_range_limit=True,
+            encode=encode_market_bars_json,
+            if_none_match=if_none_match,
         )
-        bars = result.bars
-        response.headers["X-Data-Source"] = result.data_source
-        response.headers["X-Partial-Range"] = "true" if result.partial_range else "false"
-        return [to_market_bar_out(bar) for bar in bars]
+        headers = {
+            "ETag": result.etag,
+            "Cache-Control": _REVALIDATE_CACHE_CONTROL,
+            "X-Data-Source": result.data_source,
+            "X-Partial-Range": "true" if result.partial_range else "false",
+            "X-Cache": "HIT" if result.cache_hit else "MISS",
+        }
+        if result.not_modified:
+            return Response(status_code=304, headers=headers)
+        # The body is already encoded (possibly by another worker), so skip response_model serialization.
+        return Response(content=result.body, media_type="application/json", headers=headers)
     except ValueError as exc:
         _raise_market_data_service_error(exc)
 
@@ -79,11 +91,21 @@ async def list_snapshots(
     request: MarketSnapshotsRequest = Depends(parse_market_snapshots_request),
     service: MarketDataApplicationService = Depends(get_market_data_service),
     current_user: User = Depends(get_current_user),
-) -> MarketSnapshotsOut:
+    if_none_match: str | None = Header(default=None),
+) -> Response:
     _ = current_user
     try:
         snapshots = await service.list_snapshots(tickers=request.tickers)
-        return MarketSnapshotsOut(items=[to_market_snapshot_out(snapshot) for snapshot in snapshots])
+        body = MarketSnapshotsOut(items=[to_market_snapshot_out(snapshot) for snapshot in snapshots]).model_dump_json()
+        # Snapshots have no stored validator, so the lookup above always runs; a 304 only saves the transfer.
+        etag = entity_tag_for(
+            body=body,
+            latest_at=max((snapshot.updated_at for snapshot in snapshots), default=None),
+        )
+        headers = {"ETag": etag, "Cache-Control": _REVALIDATE_CACHE_CONTROL}
+        if entity_tag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
     except ValueError as exc:
         _raise_market_data_service_error(exc)
 
@@ -192,8 +192,9 @@ async def market_data_stream(
 
         async def send_loop() -> None:
             while True:
-                payload = await event_queue.get()
-                await _send_ws_json(websocket, payload=payload, send_lock=send_lock)
+                frame = await event_queue.get()
+                # Frames are encoded once by the hub and shared by every subscribed connection.
+                await _send_ws_text(websocket, text=frame.text, send_lock=send_lock)
 
         async def heartbeat_loop() -> None:
             while True:
@@ -378,6 +379,16 @@ async def _send_ws_json(
         await websocket.send_json(payload)
 
 
+async def _send_ws_text(
+    websocket: WebSocket,
+    *,
+    text: str,
+    send_lock: asyncio.Lock,
+) -> None:
+    async with send_lock:
+        await websocket.send_text(text)
+
+
 def _utc_now_iso() -> str:
     return datetime.now(tz=timezone.utc).isoformat().replace("+00:00", "Z")
 
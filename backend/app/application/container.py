@@ -6,8 +6,13 @@ import socket
 
 from app.application.auth.service import AuthApplicationService
 from app.application.demo_market.service import DemoMarketDataApplicationService
+from app.application.market_data.concurrency import ConcurrencyLimiter
+from app.application.market_data.minute_bucket_cache import FinalizedMinuteBucketCache
 from app.application.market_data.realtime_publisher import StockMarketRealtimePublisher
 from app.application.market_data.service import MarketDataApplicationService
+from app.application.market_data.single_flight import SingleFlightRegistry
+from app.application.market_data.snapshot_coalescer import SnapshotRequestCoalescer
+from app.application.market_data.snapshot_state import SnapshotStateStore
 from app.application.market_data.stream_hub import StockMarketStreamHub
 from app.application.market_data.stream_policy import (
     allowed_stream_channels,
@@ -15,14 +20,30 @@ from app.application.market_data.stream_policy import (
     normalized_delay_minutes,
 )
 from app.application.market_data.trading_calendar import TradingCalendar
+from app.application.market_data.upstream_governor import (
+    UPSTREAM_PRIORITY_INTERACTIVE,
+    UPSTREAM_PRIORITY_MAINTENANCE,
+    UPSTREAM_PRIORITY_PREFETCH,
+    GovernedMassiveClient,
+    TokenBucket,
+    UpstreamRateGovernor,
+)
 from app.application.watchlist.service import WatchlistApplicationService
 from app.core.config import settings
+from app.domain.market_data.schemas import MarketBar
 from app.infrastructure.auth.login_throttle import RedisAuthLoginThrottle
 from app.infrastructure.clients.massive import MassiveClient
+from app.infrastructure.clients.massive_http import MassiveHttpClient
 from app.infrastructure.clients.massive_stream import MassiveStocksWebSocketClient
+from app.infrastructure.coordination.redis_bars_response_cache import RedisBarsResponseCache
+from app.infrastructure.coordination.redis_fetch_lease import RedisFetchLeaseCoordinator
+from app.infrastructure.coordination.redis_holiday_store import RedisHolidayOverrideStore
+from app.infrastructure.coordination.redis_final_bar_generations import RedisFinalBarGenerations
+from app.infrastructure.coordination.redis_rate_budget import RedisRateBudget
 from app.infrastructure.db.session import close_db_engine
 from app.infrastructure.db.session import SessionLocal
 from app.infrastructure.db.uow import SqlAlchemyUnitOfWork
+from app.infrastructure.repositories.final_bar_cache import FinalBarSegmentCache
 from app.infrastructure.streaming.redis_event_bus import (
     RedisMarketEventPublisher,
     RedisMarketEventSubscriber,
@@ -31,19 +52,172 @@ from app.infrastructure.streaming.redis_topic_registry import RedisMarketTopicRe
 
 
 @lru_cache
-def _massive_client() -> MassiveClient | None:
+def _local_rate_budget() -> TokenBucket:
+    return TokenBucket(
+        rate_per_second=settings.market_data_upstream_rate_per_second,
+        burst=settings.market_data_upstream_burst,
+    )
+
+
+@lru_cache
+def _shared_rate_budget() -> RedisRateBudget | None:
+    if not settings.market_data_upstream_shared_budget_enabled:
+        return None
+    return RedisRateBudget(
+        redis_url=settings.redis_url,
+        rate_per_second=settings.market_data_upstream_rate_per_second,
+        burst=settings.market_data_upstream_burst,
+        key=settings.market_data_upstream_budget_key,
+        fallback=_local_rate_budget(),
+    )
+
+
+@lru_cache
+def _upstream_rate_governor() -> UpstreamRateGovernor:
+    return UpstreamRateGovernor(
+        budget=_shared_rate_budget() or _local_rate_budget(),
+        interactive_reserve=settings.market_data_upstream_interactive_reserve,
+        max_wait_seconds={
+            UPSTREAM_PRIORITY_INTERACTIVE: settings.market_data_upstream_interactive_max_wait_seconds,
+            UPSTREAM_PRIORITY_PREFETCH: settings.market_data_upstream_prefetch_max_wait_seconds,
+            UPSTREAM_PRIORITY_MAINTENANCE: settings.market_data_upstream_maintenance_max_wait_seconds,
+        },
+    )
+
+
+@lru_cache
+def _massive_client() -> MassiveClient | MassiveHttpClient | GovernedMassiveClient | None:
+    client = _massive_rest_client()
+    if client is None or not settings.market_data_upstream_governor_enabled:
+        return client
+    return GovernedMassiveClient(client=client, governor=_upstream_rate_governor())
+
+
+@lru_cache
+def _massive_rest_client() -> MassiveClient | MassiveHttpClient | None:
     if not settings.massive_api_key:
         return None
-    return MassiveClient(settings.massive_api_key)
+    backend = settings.massive_rest_backend.strip().lower()
+    if backend == "http":
+        return MassiveHttpClient(
+            settings.massive_api_key,
+            settings.massive_rest_base_url,
+            max_connections=settings.massive_http_max_connections,
+            max_keepalive_connections=settings.massive_http_max_keepalive_connections,
+            keepalive_expiry_seconds=settings.massive_http_keepalive_expiry_seconds,
+            max_concurrency_per_host=settings.massive_http_max_concurrency_per_host,
+            timeout_seconds=settings.massive_http_timeout_seconds,
+        )
+    if backend != "sdk":
+        raise ValueError("massive_rest_backend must be one of: sdk, http")
+    return MassiveClient(settings.massive_api_key, settings.massive_rest_base_url)
+
+
+@lru_cache
+def _holiday_override_store() -> RedisHolidayOverrideStore | None:
+    if not settings.market_calendar_shared_holidays_enabled:
+        return None
+    return RedisHolidayOverrideStore(
+        redis_url=settings.redis_url,
+        key_prefix=settings.market_calendar_holiday_key_prefix,
+    )
 
 
 @lru_cache
 def _trading_calendar() -> TradingCalendar:
-    return TradingCalendar(massive_client=_massive_client())
+    return TradingCalendar(
+        massive_client=_massive_client(),
+        holiday_store=_holiday_override_store(),
+    )
+
+
+def build_trading_calendar() -> TradingCalendar:
+    return _trading_calendar()
+
+
+@lru_cache
+def _baseline_refresh_registry() -> SingleFlightRegistry[list[MarketBar]]:
+    return SingleFlightRegistry()
+
+
+@lru_cache
+def _market_data_fetch_lease() -> RedisFetchLeaseCoordinator | None:
+    if not settings.market_data_fetch_lease_enabled:
+        return None
+    return RedisFetchLeaseCoordinator(
+        redis_url=settings.redis_url,
+        key_prefix=settings.market_data_fetch_lease_prefix,
+        lease_ttl_seconds=settings.market_data_fetch_lease_ttl_seconds,
+        wait_timeout_seconds=settings.market_data_fetch_lease_wait_seconds,
+    )
+
+
+@lru_cache
+def _snapshot_coalescer() -> SnapshotRequestCoalescer | None:
+    client = _massive_client()
+    if client is None or not settings.market_data_snapshot_coalesce_enabled:
+        return None
+    return SnapshotRequestCoalescer(
+        client=client,
+        window_seconds=settings.market_data_snapshot_coalesce_window_ms / 1000,
+        ttl_seconds=settings.market_data_snapshot_coalesce_ttl_seconds,
+        max_batch_size=settings.market_data_snapshot_coalesce_max_batch,
+    )
+
+
+@lru_cache
+def _snapshot_state_store() -> SnapshotStateStore | None:
+    if not settings.market_data_snapshot_live_state_enabled:
+        return None
+    return SnapshotStateStore(max_age_seconds=settings.market_data_snapshot_live_state_max_age_seconds)
+
+
+@lru_cache
+def _bars_response_cache() -> RedisBarsResponseCache | None:
+    if not settings.market_data_bars_response_cache_enabled:
+        return None
+    return RedisBarsResponseCache(
+        redis_url=settings.redis_url,
+        key_prefix=settings.market_data_bars_response_cache_prefix,
+    )
+
+
+@lru_cache
+def _market_data_upstream_limiter() -> ConcurrencyLimiter:
+    return ConcurrencyLimiter(limit=settings.market_data_upstream_max_concurrency)
+
+
+@lru_cache
+def _final_bar_segment_cache() -> FinalBarSegmentCache | None:
+    if settings.market_data_final_bar_cache_max_bytes <= 0:
+        return None
+    return FinalBarSegmentCache(max_bytes=settings.market_data_final_bar_cache_max_bytes)
+
+
+@lru_cache
+def _final_bar_generations() -> RedisFinalBarGenerations | None:
+    if _final_bar_segment_cache() is None or not settings.market_data_final_bar_generations_enabled:
+        return None
+    return RedisFinalBarGenerations(
+        redis_url=settings.redis_url,
+        key_prefix=settings.market_data_final_bar_generations_prefix,
+        sync_interval_seconds=settings.market_data_final_bar_generations_sync_seconds,
+    )
+
+
+@lru_cache
+def _minute_bucket_cache() -> FinalizedMinuteBucketCache | None:
+    if settings.market_data_minute_bucket_cache_max_entries <= 0:
+        return None
+    return FinalizedMinuteBucketCache(max_entries=settings.market_data_minute_bucket_cache_max_entries)
 
 
 def build_uow() -> SqlAlchemyUnitOfWork:
-    return SqlAlchemyUnitOfWork(session_factory=SessionLocal)
+    return SqlAlchemyUnitOfWork(
+        session_factory=SessionLocal,
+        final_bar_cache=_final_bar_segment_cache(),
+        final_bar_generations=_final_bar_generations(),
+    )
 
 
 def build_market_data_service() -> MarketDataApplicationService:
@@ -51,9 +225,40 @@ def build_market_data_service() -> MarketDataApplicationService:
         uow=build_uow(),
         massive_client=_massive_client(),
         trading_calendar=_trading_calendar(),
+        baseline_refresh_registry=_baseline_refresh_registry(),
+        fetch_lease=_market_data_fetch_lease(),
+        upstream_limiter=_market_data_upstream_limiter(),
+        uow_factory=build_uow,
+        response_cache=_bars_response_cache(),
+        snapshot_coalescer=_snapshot_coalescer(),
+        snapshot_state=_snapshot_state_store(),
+        minute_bucket_cache=_minute_bucket_cache(),
     )
 
 
+def market_data_diagnostics() -> dict[str, object]:
+    # Counters of the process-local market data helpers; components not built yet are left out
+    # so that reading diagnostics never constructs clients or caches.
+    diagnostics: dict[str, object] = {}
+    if _baseline_refresh_registry.cache_info().currsize > 0:
+        diagnostics["baseline_refresh"] = _baseline_refresh_registry().stats()
+    if _upstream_rate_governor.cache_info().currsize > 0:
+        diagnostics["upstream_governor"] = _upstream_rate_governor().stats()
+    components = {
+        "snapshot_coalescer": _snapshot_coalescer,
+        "snapshot_state": _snapshot_state_store,
+        "final_bar_cache": _final_bar_segment_cache,
+        "minute_bucket_cache": _minute_bucket_cache,
+    }
+    for name, factory in components.items():
+        if factory.cache_info().currsize == 0:
+            continue
+        component = factory()
+        if component is not None:
+            diagnostics[name] = component.stats()
+    return diagnostics
+
+
 @lru_cache
 def _demo_market_data_service() -> DemoMarketDataApplicationService:
     return DemoMarketDataApplicationService(
@@ -107,6 +312,8 @@ def _redis_market_event_publisher() -> RedisMarketEventPublisher:
     return RedisMarketEventPublisher(
         redis_url=settings.redis_url,
         channel=settings.market_stream_redis_channel,
+        sharded=settings.market_stream_redis_sharded,
+        max_batch_size=settings.market_stream_publish_batch_size,
     )
 
 
@@ -115,6 +322,7 @@ def _redis_market_event_subscriber() -> RedisMarketEventSubscriber:
     return RedisMarketEventSubscriber(
         redis_url=settings.redis_url,
         channel=settings.market_stream_redis_channel,
+        sharded=settings.market_stream_redis_sharded,
     )
 
 
@@ -147,6 +355,8 @@ def _market_stream_hub() -> StockMarketStreamHub:
         default_channels=_market_stream_default_channels(),
         realtime_enabled=settings.market_stream_realtime_enabled,
         delay_minutes=_market_stream_delay_minutes(),
+        snapshot_state=_snapshot_state_store(),
+        max_updates_per_second=settings.market_stream_max_updates_per_second_per_symbol,
     )
 
 
@@ -202,5 +412,51 @@ async def shutdown_auth_login_throttle() -> None:
     _auth_login_throttle.cache_clear()
 
 
+async def shutdown_massive_client() -> None:
+    if _massive_rest_client.cache_info().currsize == 0:
+        return
+    client = _massive_rest_client()
+    close = getattr(client, "aclose", None)
+    if close is not None:
+        await close()
+    # Drop the closed client and the singletons wrapping it so the next loop builds fresh ones.
+    _massive_client.cache_clear()
+    _massive_rest_client.cache_clear()
+    _snapshot_coalescer.cache_clear()
+    _trading_calendar.cache_clear()
+
+
+async def shutdown_bars_response_cache() -> None:
+    if _bars_response_cache.cache_info().currsize == 0:
+        return
+    cache = _bars_response_cache()
+    if cache is not None:
+        await cache.close()
+
+
+async def shutdown_final_bar_generations() -> None:
+    if _final_bar_generations.cache_info().currsize == 0:
+        return
+    generations = _final_bar_generations()
+    if generations is not None:
+        await generations.close()
+
+
+async def shutdown_market_data_fetch_lease() -> None:
+    if _market_data_fetch_lease.cache_info().currsize == 0:
+        return
+    fetch_lease = _market_data_fetch_lease()
+    if fetch_lease is not None:
+        await fetch_lease.close()
+
+
+async def shutdown_upstream_rate_budget() -> None:
+    if _shared_rate_budget.cache_info().currsize == 0:
+        return
+    budget = _shared_rate_budget()
+    if budget is not None:
+        await budget.close()
+
+
 async def shutdown_db_runtime() -> None:
     await close_db_engine()
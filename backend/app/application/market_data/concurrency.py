@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import threading
+import weakref
+
+
+class ConcurrencyLimiter:
+    def __init__(self, *, limit: int) -> None:
+        self._limit = max(1, int(limit))
+        self._lock = threading.Lock()
+        # Semaphores are bound to one loop; the cap applies per loop (API vs. worker loops).
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            asyncio.Semaphore,
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self._limit)
+                self._semaphores[loop] = semaphore
+        async with semaphore:
+            yield
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime
+import hashlib
+
+
+def entity_tag_for(*, body: str, latest_at: datetime | None, is_final: bool | None = None) -> str:
+    # Strong validator: latest item time and finality up front, then a hash of the exact body bytes.
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:24]
+    if latest_at is None:
+        return f'"0-{digest}"'
+    state = "f" if is_final is True else "o"
+    return f'"{int(latest_at.timestamp() * 1000)}-{state}-{digest}"'
+
+
+def entity_tag_for_watermark(*, key: str, watermark: Sequence[str]) -> str:
+    # Validator derived from the stored state a body is read from, so it can be checked without the body.
+    digest = hashlib.sha256("|".join([key, *watermark]).encode("utf-8")).hexdigest()[:24]
+    return f'"w-{digest}"'
+
+
+def entity_tag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match or not etag:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match uses weak comparison, so a W/ prefix from a proxy still matches.
+        if candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+import threading
+
+from app.domain.market_data.schemas import MarketBar
+
+# ticker, multiplier, trade_date
+_BucketKey = tuple[str, int, date]
+
+
+@dataclass(slots=True, frozen=True)
+class MinuteBucketCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+
+
+@dataclass(slots=True, frozen=True)
+class _BucketEntry:
+    # Number of minute bars the buckets were built from; a backfilled gap changes it and forces a rebuild.
+    source_bars: int
+    buckets: tuple[MarketBar, ...]
+
+
+class FinalizedMinuteBucketCache:
+    # Finalized buckets of closed trade dates for minute multipliers that are not precomputed into the DB.
+    def __init__(self, *, max_entries: int = 2048) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[_BucketKey, _BucketEntry] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, *, ticker: str, multiplier: int, trade_date: date, source_bars: int) -> list[MarketBar] | None:
+        key = (ticker, multiplier, trade_date)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.source_bars != source_bars:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return list(entry.buckets)
+
+    def put(
+        self,
+        *,
+        ticker: str,
+        multiplier: int,
+        trade_date: date,
+        source_bars: int,
+        buckets: list[MarketBar],
+    ) -> None:
+        key = (ticker, multiplier, trade_date)
+        with self._lock:
+            self._entries[key] = _BucketEntry(source_bars=source_bars, buckets=tuple(buckets))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> MinuteBucketCacheStats:
+        with self._lock:
+            return MinuteBucketCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+            )
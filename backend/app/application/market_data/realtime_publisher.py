@@ -147,17 +147,16 @@ class StockMarketRealtimePublisher:
     async def _handle_upstream_events(self, events: list[dict[str, Any]]) -> None:
         if not events:
             return
-        mapped_count = 0
+        payloads: list[dict[str, Any]] = []
         dropped_count = 0
-        published_count = 0
         for event in events:
             payload = map_massive_event_to_market_message(event)
             if payload is None:
                 dropped_count += 1
                 continue
-            mapped_count += 1
-            await self._event_publisher.publish(payload)
-            published_count += 1
+            payloads.append(payload)
+        mapped_count = len(payloads)
+        published_count = await self._publish_batch(payloads)
 
         self._events_in_total += len(events)
         self._events_mapped_total += mapped_count
@@ -172,6 +171,13 @@ class StockMarketRealtimePublisher:
             dropped_count,
         )
 
+    async def _publish_batch(self, payloads: list[dict[str, Any]]) -> int:
+        # Each upstream frame is flushed as one batch; the bus splits it into size-bounded pipelines.
+        if not payloads:
+            return 0
+        await self._event_publisher.publish_many(payloads)
+        return len(payloads)
+
     async def _handle_upstream_status(self, state: str, message: str | None) -> None:
         if state == "error" and _is_realtime_entitlement_error(message):
             await self._event_publisher.publish(
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, replace
+from functools import partial
+import heapq
+import logging
 import re
 from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
 
 from app.application.market_data.errors import (
     MarketDataRangeTooLargeError,
@@ -15,22 +20,44 @@ from app.application.market_data.policy import (
     is_range_too_large,
     normalize_timespan,
 )
+from app.application.market_data.concurrency import ConcurrencyLimiter
+from app.application.market_data.entity_tags import (
+    entity_tag_for,
+    entity_tag_for_watermark,
+    entity_tag_matches,
+)
+from app.application.market_data.minute_bucket_cache import FinalizedMinuteBucketCache
+from app.application.market_data.single_flight import SingleFlightRegistry
+from app.application.market_data.snapshot_coalescer import SnapshotRequestCoalescer
 from app.application.market_data.snapshot_mapper import to_market_snapshot
+from app.application.market_data.snapshot_state import LiveSessionState, SnapshotStateStore
 from app.application.market_data.stream_policy import normalized_delay_minutes
 from app.application.market_data.trading_calendar import TradingCalendar
+from app.application.market_data.upstream_governor import UPSTREAM_PRIORITY_PREFETCH, upstream_priority
 from app.core.config import settings
 from app.domain.market_data.aggregation import (
     MARKET_CLOSE_TIME,
     MARKET_OPEN_TIME,
     MARKET_TIMEZONE,
     aggregate_bucket,
-    aggregate_minute_bars,
+    aggregate_day_bars,
     market_trade_date,
+    resolve_bucket_bounds,
     resolve_current_open_bucket,
+    resolve_period_bounds,
+)
+from app.domain.market_data.columnar_aggregation import aggregate_minute_bars_columnar
+from app.domain.market_data.coverage import (
+    MinuteCoverage,
+    coverage_day_start,
+    mask_minute_ranges,
+    minute_range_mask,
 )
 from app.domain.market_data.schemas import MarketBar, MarketSnapshot
 from app.infrastructure.clients.massive import MassiveClient
 from app.infrastructure.clients.massive_mapper import map_massive_aggregates_to_market_bars
+from app.infrastructure.coordination.redis_bars_response_cache import RedisBarsResponseCache
+from app.infrastructure.coordination.redis_fetch_lease import RedisFetchLeaseCoordinator
 from app.infrastructure.db.uow import SqlAlchemyUnitOfWork
 
 _TICKER_PATTERN = re.compile(r"^[A-Z.]{1,15}$")
@@ -38,6 +65,9 @@ _SUPPORTED_MINUTE_AGG_MULTIPLIERS = {5, 15, 60}
 _SUPPORTED_BAR_SESSIONS = {"regular", "pre", "night"}
 _PREMARKET_OPEN_TIME = time(4, 0)
 _MAX_TRADING_DAY_BACKTRACK_DAYS = 370
+_MINUTE_REFRESH_MERGE_GAP_MINUTES = 15
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(slots=True)
@@ -47,6 +77,17 @@ class MarketBarsQueryResult:
     partial_range: bool = False
 
 
+@dataclass(slots=True)
+class MarketBarsEncodedResult:
+    body: str
+    data_source: str
+    partial_range: bool = False
+    cache_hit: bool = False
+    etag: str = ""
+    # Set when the caller's If-None-Match already matches; `body` is left empty.
+    not_modified: bool = False
+
+
 @dataclass(slots=True)
 class _BarsQuery:
     ticker: str
@@ -60,6 +101,27 @@ class _BarsQuery:
     limit: int | None
 
 
+@dataclass(slots=True)
+class _BaselineRead:
+    bars: list[MarketBar]
+    fetched: bool = False
+    # Cached bars served while a refresh of the stale part runs in the background.
+    partial: bool = False
+
+
+@dataclass(slots=True)
+class _MinuteRefreshPlan:
+    # Upstream ranges as (first minute start, last minute start), plus the minutes each trade date
+    # needed; only those may be settled when upstream has no bar for them.
+    ranges: list[tuple[datetime, datetime]]
+    gaps: dict[date, int]
+
+
+_DateWindowsKey = tuple[str, str, tuple[tuple[date, date], ...]]
+_MinuteRangesKey = tuple[str, str, tuple[tuple[datetime, datetime], ...]]
+_BaselineRefreshKey = _DateWindowsKey | _MinuteRangesKey
+
+
 @dataclass(slots=True)
 class _DailySnapshotBaseline:
     snapshot: MarketSnapshot
@@ -73,12 +135,26 @@ class MarketDataApplicationService:
         uow: SqlAlchemyUnitOfWork,
         massive_client: MassiveClient | None = None,
         trading_calendar: TradingCalendar | None = None,
+        baseline_refresh_registry: SingleFlightRegistry[list[MarketBar]] | None = None,
+        fetch_lease: RedisFetchLeaseCoordinator | None = None,
+        upstream_limiter: ConcurrencyLimiter | None = None,
+        uow_factory: Callable[[], SqlAlchemyUnitOfWork] | None = None,
+        response_cache: RedisBarsResponseCache | None = None,
+        snapshot_coalescer: SnapshotRequestCoalescer | None = None,
+        snapshot_state: SnapshotStateStore | None = None,
+        minute_bucket_cache: FinalizedMinuteBucketCache | None = None,
     ) -> None:
         self._uow = uow
+        self._uow_factory = uow_factory
+        self._response_cache = response_cache
+        self._snapshot_coalescer = snapshot_coalescer
+        self._snapshot_state = snapshot_state
+        self._minute_bucket_cache = minute_bucket_cache
         self._massive_client = massive_client
         self._trading_calendar = trading_calendar or TradingCalendar(massive_client=massive_client)
-        self._baseline_refresh_tasks: dict[tuple[str, str, tuple[tuple[date, date], ...]], asyncio.Task[list[MarketBar]]] = {}
-        self._baseline_refresh_tasks_lock = asyncio.Lock()
+        self._baseline_refresh_registry = baseline_refresh_registry or SingleFlightRegistry()
+        self._fetch_lease = fetch_lease
+        self._upstream_limiter = upstream_limiter
 
     async def list_bars(
         self,
@@ -128,13 +204,147 @@ class MarketDataApplicationService:
             enforce_range_limit=enforce_range_limit,
             trading_calendar=self._trading_calendar,
         )
+        return await self._list_bars_for_query(query=query)
+
+    async def list_bars_encoded(
+        self,
+        *,
+        ticker: str,
+        timespan: str,
+        multiplier: int = 1,
+        session: str = "regular",
+        start_date: date | None = None,
+        end_date: date | None = None,
+        limit: int | None = None,
+        enforce_range_limit: bool = False,
+        encode: Callable[[list[MarketBar]], str],
+        if_none_match: str | None = None,
+    ) -> MarketBarsEncodedResult:
+        await self._trading_calendar.ensure_holiday_cache()
+        query = _build_bars_query(
+            ticker=ticker,
+            timespan=timespan,
+            multiplier=multiplier,
+            session=session,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            enforce_range_limit=enforce_range_limit,
+            trading_calendar=self._trading_calendar,
+        )
+        cache_key = _bars_response_cache_key(query)
+        watermark_etag: str | None = None
+        if query.timespan == "minute" and query.multiplier == 1:
+            watermark_etag = await self._minute_baseline_entity_tag(query=query, cache_key=cache_key)
+            if watermark_etag is not None and entity_tag_matches(if_none_match, watermark_etag):
+                return MarketBarsEncodedResult(
+                    body="",
+                    data_source="DB",
+                    partial_range=False,
+                    etag=watermark_etag,
+                    not_modified=True,
+                )
+        if self._response_cache is not None:
+            if if_none_match:
+                # Cached entries are dropped on every write to their range, so a matching stored
+                # validator answers the poll without loading the body or touching the database.
+                validator = await self._response_cache.get_fields(
+                    key=cache_key,
+                    fields=["etag", "data_source", "partial_range"],
+                )
+                if validator is not None and entity_tag_matches(if_none_match, validator.get("etag", "")):
+                    return MarketBarsEncodedResult(
+                        body="",
+                        data_source=validator.get("data_source", "DB"),
+                        partial_range=validator.get("partial_range") == "true",
+                        cache_hit=True,
+                        etag=validator["etag"],
+                        not_modified=True,
+                    )
+            cached = await self._response_cache.get(key=cache_key)
+            if cached is not None and "body" in cached and "etag" in cached:
+                return MarketBarsEncodedResult(
+                    body=cached["body"],
+                    data_source=cached.get("data_source", "DB"),
+                    partial_range=cached.get("partial_range") == "true",
+                    cache_hit=True,
+                    etag=cached["etag"],
+                )
+
+        result = await self._list_bars_for_query(query=query)
+        body = encode(result.bars)
+        latest = result.bars[-1] if result.bars else None
+        encoded = MarketBarsEncodedResult(
+            body=body,
+            data_source=result.data_source,
+            partial_range=result.partial_range,
+            etag=(
+                watermark_etag
+                if watermark_etag is not None and result.data_source == "DB"
+                else entity_tag_for(
+                    body=body,
+                    latest_at=latest.start_at if latest is not None else None,
+                    is_final=latest.is_final if latest is not None else None,
+                )
+            ),
+        )
+        if self._response_cache is not None:
+            index_start, index_end = _bars_response_index_range(query=query, trading_calendar=self._trading_calendar)
+            await self._response_cache.put(
+                key=cache_key,
+                ticker=query.ticker,
+                start_date=index_start,
+                end_date=index_end,
+                fields={
+                    "body": encoded.body,
+                    "etag": encoded.etag,
+                    "data_source": encoded.data_source,
+                    "partial_range": "true" if encoded.partial_range else "false",
+                },
+                ttl_seconds=_bars_response_ttl_seconds(query=query, result=result),
+                index_ttl_seconds=settings.market_data_bars_response_cache_final_ttl_seconds,
+            )
+        if entity_tag_matches(if_none_match, encoded.etag):
+            return replace(encoded, body="", not_modified=True)
+        return encoded
+
+    async def _minute_baseline_entity_tag(self, *, query: _BarsQuery, cache_key: str) -> str | None:
+        # Every minute bar write upserts its coverage row, so when nothing in range is due for a refresh
+        # the rows' masks and write times identify the body without loading any bars.
+        now = datetime.now(tz=timezone.utc)
+        async with self._uow as uow:
+            repo = _require_market_data_repo(uow)
+            coverage = await repo.list_minute_coverage(
+                ticker=query.ticker,
+                start_date=query.start_date,
+                end_date=query.end_date,
+            )
+        watermark: list[str] = []
+        for item in coverage:
+            if item.updated_at is None:
+                return None
+            watermark.append(
+                f"{item.trade_date.isoformat()}:{item.present:x}:{item.final:x}:{item.updated_at.isoformat()}"
+            )
+        plan = _resolve_minute_refresh_plan(
+            query=query,
+            coverage=coverage,
+            now=now,
+            trading_calendar=self._trading_calendar,
+        )
+        if plan.ranges:
+            return None
+        return entity_tag_for_watermark(key=cache_key, watermark=watermark)
 
+    async def _list_bars_for_query(self, *, query: _BarsQuery) -> MarketBarsQueryResult:
         if query.timespan == "day" and query.multiplier == 1:
             return await self._list_day_baseline(query=query)
         if query.timespan == "minute" and query.multiplier == 1:
             return await self._list_minute_baseline(query=query)
-        if query.timespan == "minute" and query.multiplier in _SUPPORTED_MINUTE_AGG_MULTIPLIERS:
+        if query.timespan == "minute" and query.multiplier > 1:
             return await self._list_minute_aggregated(query=query)
+        if _is_day_period_query(query):
+            return await self._list_day_periods(query=query)
         return await self._list_direct_fallback(query=query)
 
     async def prefetch_default(self, *, ticker: str) -> None:
@@ -142,28 +352,29 @@ class MarketDataApplicationService:
         if not normalized:
             raise ValueError("Ticker is required")
 
-        await self._trading_calendar.ensure_holiday_cache()
-        today = date.today()
-        daily_start = today - timedelta(days=settings.market_data_daily_lookback_days)
-        intraday_start = self._trading_calendar.shift_trading_day(
-            target_date=today,
-            trading_days=-(settings.market_data_intraday_lookback_days - 1),
-        )
+        with upstream_priority(UPSTREAM_PRIORITY_PREFETCH):
+            await self._trading_calendar.ensure_holiday_cache()
+            today = date.today()
+            daily_start = today - timedelta(days=settings.market_data_daily_lookback_days)
+            intraday_start = self._trading_calendar.shift_trading_day(
+                target_date=today,
+                trading_days=-(settings.market_data_intraday_lookback_days - 1),
+            )
 
-        await self.list_bars(
-            ticker=normalized,
-            timespan="day",
-            multiplier=1,
-            start_date=daily_start,
-            end_date=today,
-        )
-        await self.list_bars(
-            ticker=normalized,
-            timespan="minute",
-            multiplier=1,
-            start_date=intraday_start,
-            end_date=today,
-        )
+            await self.list_bars(
+                ticker=normalized,
+                timespan="day",
+                multiplier=1,
+                start_date=daily_start,
+                end_date=today,
+            )
+            await self.list_bars(
+                ticker=normalized,
+                timespan="minute",
+                multiplier=1,
+                start_date=intraday_start,
+                end_date=today,
+            )
 
     async def list_snapshots(self, *, tickers: list[str]) -> list[MarketSnapshot]:
         normalized_tickers = _normalize_tickers(tickers=tickers)
@@ -177,15 +388,31 @@ class MarketDataApplicationService:
         delay_minutes = normalized_delay_minutes(settings.market_stream_delay_minutes)
         status_point = now_utc - timedelta(minutes=delay_minutes)
         market_open_for_status = self._trading_calendar.is_in_trading_session(point=status_point)
+        serve_live = self._snapshot_state is not None and today_is_trading_day and market_open_for_status
+        live_symbols: set[str] = set()
+        if serve_live:
+            for symbol in normalized_tickers:
+                live_snapshot = self._live_snapshot(
+                    symbol=symbol,
+                    baseline=baselines.get(symbol),
+                    today=today,
+                    as_of=status_point,
+                    market_open=market_open_for_status,
+                )
+                if live_snapshot is not None:
+                    snapshots_by_symbol[symbol] = live_snapshot
+                    live_symbols.add(symbol)
         missing_symbols = [symbol for symbol in normalized_tickers if symbol not in snapshots_by_symbol]
+        stale_symbols = [symbol for symbol in normalized_tickers if symbol not in live_symbols]
         should_fetch_massive = self._massive_client is not None and (
-            today_is_trading_day or bool(missing_symbols)
+            (today_is_trading_day and bool(stale_symbols)) or bool(missing_symbols)
         )
 
         if should_fetch_massive:
-            request_tickers = normalized_tickers if today_is_trading_day else missing_symbols
+            request_tickers = stale_symbols if today_is_trading_day else missing_symbols
             try:
-                payload = await self._massive_client.list_snapshots(tickers=request_tickers)
+                snapshot_source = self._snapshot_coalescer or self._massive_client
+                payload = await snapshot_source.list_snapshots(tickers=request_tickers)
             except Exception as exc:
                 if not snapshots_by_symbol:
                     raise _map_market_data_upstream_error(exc) from exc
@@ -195,6 +422,8 @@ class MarketDataApplicationService:
                     if mapped is None:
                         continue
                     mapped = _with_resolved_market_status(snapshot=mapped, market_open=market_open_for_status)
+                    if serve_live:
+                        self._snapshot_state.seed(mapped)  # type: ignore[union-attr]
                     baseline = baselines.get(mapped.ticker)
                     snapshots_by_symbol[mapped.ticker] = _merge_snapshot(
                         baseline=baseline,
@@ -240,7 +469,22 @@ class MarketDataApplicationService:
         lookback_trade_days: int = 10,
         now: datetime | None = None,
     ) -> int:
-        if multiplier not in _SUPPORTED_MINUTE_AGG_MULTIPLIERS:
+        produced = await self.precompute_minute_aggregate_resolutions(
+            multipliers=[multiplier],
+            lookback_trade_days=lookback_trade_days,
+            now=now,
+        )
+        return produced[multiplier]
+
+    async def precompute_minute_aggregate_resolutions(
+        self,
+        *,
+        multipliers: list[int],
+        lookback_trade_days: int = 10,
+        now: datetime | None = None,
+    ) -> dict[int, int]:
+        multipliers = sorted(set(multipliers))
+        if not multipliers or any(item not in _SUPPORTED_MINUTE_AGG_MULTIPLIERS for item in multipliers):
             raise ValueError("Unsupported minute aggregation multiplier")
         if lookback_trade_days < 1:
             raise ValueError("lookback_trade_days must be >= 1")
@@ -257,31 +501,46 @@ class MarketDataApplicationService:
         async with self._uow as uow:
             repo = _require_market_data_repo(uow)
             tickers = await repo.list_minute_tickers(start_at=start_at, end_at=end_at)
+            watermarks: dict[tuple[str, int], datetime] = {}
+            if tickers:
+                watermarks = await repo.list_minute_agg_watermarks(multipliers=multipliers, tickers=tickers)
 
-            produced = 0
+            produced = dict.fromkeys(multipliers, 0)
+            pending: list[MarketBar] = []
             for ticker in tickers:
+                read_from = {
+                    multiplier: _resolve_minute_agg_read_from(
+                        watermark=watermarks.get((ticker, multiplier)),
+                        multiplier=multiplier,
+                        lookback_start_at=start_at,
+                    )
+                    for multiplier in multipliers
+                }
+                # One read per ticker feeds every resolution.
                 minute_bars = await repo.list_minute_bars(
                     ticker=ticker,
-                    start_at=start_at,
+                    start_at=min(read_from.values()),
                     end_at=end_at,
                     limit=None,
+                    session="regular",
                 )
-                aggregated = aggregate_minute_bars(
-                    ticker=ticker,
-                    multiplier=multiplier,
-                    bars=minute_bars,
-                    source="DB_AGG",
-                    now=now,
-                    include_unfinished=False,
-                )
-                if not aggregated:
-                    continue
-                await repo.upsert_minute_agg_bars(aggregated)
-                produced += len(aggregated)
+                for multiplier in multipliers:
+                    aggregated = aggregate_minute_bars_columnar(
+                        ticker=ticker,
+                        multiplier=multiplier,
+                        bars=[bar for bar in minute_bars if bar.start_at >= read_from[multiplier]],
+                        source="DB_AGG",
+                        now=now,
+                        include_unfinished=False,
+                    )
+                    pending.extend(aggregated)
+                    produced[multiplier] += len(aggregated)
 
-            if produced > 0:
+            if pending:
+                await repo.upsert_minute_agg_bars(pending)
                 await uow.commit()
-            return produced
+        await self._invalidate_bars_responses(bars=pending)
+        return produced
 
     async def enforce_minute_retention(
         self,
@@ -342,20 +601,20 @@ class MarketDataApplicationService:
 
     async def _list_day_baseline(self, *, query: _BarsQuery) -> MarketBarsQueryResult:
         now = datetime.now(tz=timezone.utc)
-        bars, fetched = await self._refresh_day_baseline(query=query, now=now)
+        baseline = await self._refresh_day_baseline(query=query, now=now)
         return MarketBarsQueryResult(
-            bars=_apply_limit(bars, limit=query.limit),
-            data_source="REST" if fetched else "DB",
-            partial_range=False,
+            bars=_apply_limit(baseline.bars, limit=query.limit),
+            data_source="REST" if baseline.fetched else "DB",
+            partial_range=baseline.partial,
         )
 
     async def _list_minute_baseline(self, *, query: _BarsQuery) -> MarketBarsQueryResult:
         now = datetime.now(tz=timezone.utc)
-        bars, fetched = await self._refresh_minute_baseline(query=query, now=now)
+        baseline = await self._refresh_minute_baseline(query=query, now=now)
         return MarketBarsQueryResult(
-            bars=_apply_limit(bars, limit=query.limit),
-            data_source="REST" if fetched else "DB",
-            partial_range=False,
+            bars=_apply_limit(baseline.bars, limit=query.limit),
+            data_source="REST" if baseline.fetched else "DB",
+            partial_range=baseline.partial,
         )
 
     async def _list_minute_aggregated(self, *, query: _BarsQuery) -> MarketBarsQueryResult:
@@ -363,11 +622,43 @@ class MarketDataApplicationService:
             return await self._list_direct_fallback(query=query)
 
         now = datetime.now(tz=timezone.utc)
-        minute_bars, _ = await self._refresh_minute_baseline(query=query, now=now)
+        baseline = await self._refresh_minute_baseline(query=query, now=now)
+        minute_bars = baseline.bars
+
+        if query.multiplier in _SUPPORTED_MINUTE_AGG_MULTIPLIERS:
+            finalized = await self._store_finalized_minute_aggregates(query=query, minute_bars=minute_bars, now=now)
+        else:
+            finalized = self._build_finalized_minute_buckets(query=query, minute_bars=minute_bars, now=now)
+
+        realtime_item = self._realtime_minute_bucket(query=query, minute_bars=minute_bars, now=now)
+        merged = _merge_aggregated_bars(
+            finalized=finalized,
+            realtime_item=realtime_item,
+            start_at=query.start_at,
+            end_at=query.end_at,
+            limit=query.limit,
+        )
+        if merged:
+            return MarketBarsQueryResult(
+                bars=merged,
+                data_source="DB_AGG_MIXED" if realtime_item is not None else "DB_AGG",
+                partial_range=baseline.partial,
+            )
+
+        if settings.market_data_enable_direct_fallback:
+            return await self._list_direct_fallback(query=query)
+        return MarketBarsQueryResult(bars=[], data_source="DB_AGG", partial_range=False)
 
+    async def _store_finalized_minute_aggregates(
+        self,
+        *,
+        query: _BarsQuery,
+        minute_bars: list[MarketBar],
+        now: datetime,
+    ) -> list[MarketBar]:
         async with self._uow as uow:
             repo = _require_market_data_repo(uow)
-            rebuilt_finalized = aggregate_minute_bars(
+            rebuilt_finalized = aggregate_minute_bars_columnar(
                 ticker=query.ticker,
                 multiplier=query.multiplier,
                 bars=minute_bars,
@@ -389,57 +680,119 @@ class MarketDataApplicationService:
             if rebuilt_finalized and _bars_differ(existing=existing_finalized, incoming=rebuilt_finalized):
                 await repo.upsert_minute_agg_bars(rebuilt_finalized)
                 await uow.commit()
+                await self._invalidate_bars_responses(bars=rebuilt_finalized)
+        return finalized
 
-            mixed_bucket = None
-            if self._trading_calendar.is_trading_day(target_date=market_trade_date(point=now)):
-                mixed_bucket = resolve_current_open_bucket(now=now, multiplier=query.multiplier)
-            realtime_item: MarketBar | None = None
-            if mixed_bucket is not None:
-                bucket_start, bucket_end = mixed_bucket
-                if _ranges_intersect(
-                    left_start=query.start_at,
-                    left_end=query.end_at,
-                    right_start=bucket_start,
-                    right_end=bucket_end,
-                ):
-                    realtime_cutoff = min(
-                        bucket_end,
-                        now + timedelta(microseconds=1),
-                        query.end_at + timedelta(microseconds=1),
-                    )
-                    if realtime_cutoff > bucket_start:
-                        minute_items = [
-                            bar
-                            for bar in minute_bars
-                            if bucket_start <= bar.start_at < realtime_cutoff
-                        ]
-                        realtime_item = aggregate_bucket(
-                            ticker=query.ticker,
-                            multiplier=query.multiplier,
-                            bars=minute_items,
-                            bucket_start=bucket_start,
-                            bucket_end=bucket_end,
-                            source="DB_AGG_MIXED",
-                            is_final=False,
-                        )
-
-            merged = _merge_aggregated_bars(
-                finalized=finalized,
-                realtime_item=realtime_item,
-                start_at=query.start_at,
-                end_at=query.end_at,
-                limit=query.limit,
+    def _build_finalized_minute_buckets(
+        self,
+        *,
+        query: _BarsQuery,
+        minute_bars: list[MarketBar],
+        now: datetime,
+    ) -> list[MarketBar]:
+        # Multipliers without a precomputed table are aggregated per trade date; closed dates whose
+        # minute bars are all final are reused from memory.
+        today = market_trade_date(point=now)
+        bars_by_trade_date: dict[date, list[MarketBar]] = {}
+        for bar in minute_bars:
+            bars_by_trade_date.setdefault(market_trade_date(point=bar.start_at), []).append(bar)
+
+        finalized: list[MarketBar] = []
+        for trade_date, day_bars in sorted(bars_by_trade_date.items()):
+            sealed = (
+                self._minute_bucket_cache is not None
+                and trade_date < today
+                and all(bar.is_final is True for bar in day_bars)
             )
-            if merged:
-                return MarketBarsQueryResult(
-                    bars=merged,
-                    data_source="DB_AGG_MIXED" if realtime_item is not None else "DB_AGG",
-                    partial_range=False,
+            if sealed:
+                cached = self._minute_bucket_cache.get(  # type: ignore[union-attr]
+                    ticker=query.ticker,
+                    multiplier=query.multiplier,
+                    trade_date=trade_date,
+                    source_bars=len(day_bars),
+                )
+                if cached is not None:
+                    finalized.extend(cached)
+                    continue
+            buckets = aggregate_minute_bars_columnar(
+                ticker=query.ticker,
+                multiplier=query.multiplier,
+                bars=day_bars,
+                source="DB_AGG",
+                now=now,
+                include_unfinished=False,
+            )
+            if sealed:
+                self._minute_bucket_cache.put(  # type: ignore[union-attr]
+                    ticker=query.ticker,
+                    multiplier=query.multiplier,
+                    trade_date=trade_date,
+                    source_bars=len(day_bars),
+                    buckets=buckets,
                 )
+            finalized.extend(buckets)
+        return finalized
 
-        if settings.market_data_enable_direct_fallback:
-            return await self._list_direct_fallback(query=query)
-        return MarketBarsQueryResult(bars=[], data_source="DB_AGG", partial_range=False)
+    def _realtime_minute_bucket(
+        self,
+        *,
+        query: _BarsQuery,
+        minute_bars: list[MarketBar],
+        now: datetime,
+    ) -> MarketBar | None:
+        if not self._trading_calendar.is_trading_day(target_date=market_trade_date(point=now)):
+            return None
+        mixed_bucket = resolve_current_open_bucket(now=now, multiplier=query.multiplier)
+        if mixed_bucket is None:
+            return None
+        bucket_start, bucket_end = mixed_bucket
+        if not _ranges_intersect(
+            left_start=query.start_at,
+            left_end=query.end_at,
+            right_start=bucket_start,
+            right_end=bucket_end,
+        ):
+            return None
+        realtime_cutoff = min(
+            bucket_end,
+            now + timedelta(microseconds=1),
+            query.end_at + timedelta(microseconds=1),
+        )
+        if realtime_cutoff <= bucket_start:
+            return None
+        minute_items = [bar for bar in minute_bars if bucket_start <= bar.start_at < realtime_cutoff]
+        return aggregate_bucket(
+            ticker=query.ticker,
+            multiplier=query.multiplier,
+            bars=minute_items,
+            bucket_start=bucket_start,
+            bucket_end=bucket_end,
+            source="DB_AGG_MIXED",
+            is_final=False,
+        )
+
+    async def _list_day_periods(self, *, query: _BarsQuery) -> MarketBarsQueryResult:
+        now = datetime.now(tz=timezone.utc)
+        today = market_trade_date(point=now)
+        period_bounds = _day_period_bounds_resolver(query=query, trading_calendar=self._trading_calendar)
+        baseline = await self._refresh_day_baseline(
+            query=_day_period_baseline_query(query=query, period_bounds=period_bounds, today=today),
+            now=now,
+        )
+        periods = aggregate_day_bars(
+            ticker=query.ticker,
+            timespan=query.timespan,
+            multiplier=query.multiplier,
+            bars=baseline.bars,
+            period_bounds=period_bounds,
+            today=today,
+            source="DB_AGG",
+        )
+        return MarketBarsQueryResult(
+            bars=_apply_limit(periods, limit=query.limit),
+            data_source="DB_AGG",
+            partial_range=baseline.partial,
+        )
 
     async def _list_direct_fallback(self, *, query: _BarsQuery) -> MarketBarsQueryResult:
         bars = await self._fetch_from_massive(
@@ -467,7 +820,7 @@ class MarketDataApplicationService:
         *,
         query: _BarsQuery,
         now: datetime,
-    ) -> tuple[list[MarketBar], bool]:
+    ) -> _BaselineRead:
         async with self._uow as uow:
             repo = _require_market_data_repo(uow)
             existing = await repo.list_day_bars(
@@ -484,9 +837,9 @@ class MarketDataApplicationService:
             )
 
         if not refresh_windows:
-            return existing, False
+            return _BaselineRead(bars=existing)
 
-        async def _refresh() -> list[MarketBar]:
+        async def _fetch_and_store() -> list[MarketBar]:
             fetched = await self._fetch_baseline_windows(
                 ticker=query.ticker,
                 timespan="day",
@@ -501,47 +854,87 @@ class MarketDataApplicationService:
                 trading_calendar=self._trading_calendar,
                 finalize_trade_days=_day_finalize_trade_days(),
             )
-            async with self._uow as refresh_uow:
+            async with self._refresh_uow() as refresh_uow:
                 refresh_repo = _require_market_data_repo(refresh_uow)
                 await refresh_repo.upsert_day_bars(refreshed)
                 await refresh_uow.commit()
+            await self._invalidate_bars_responses(bars=refreshed)
             return refreshed
 
-        try:
-            refreshed = await self._run_baseline_refresh_once(
-                key=_baseline_refresh_key(
+        async def _reread_stored() -> list[MarketBar]:
+            async with self._refresh_uow() as reread_uow:
+                reread_repo = _require_market_data_repo(reread_uow)
+                stored: list[MarketBar] = []
+                for start_date, end_date in refresh_windows:
+                    stored.extend(
+                        await reread_repo.list_day_bars(
+                            ticker=query.ticker,
+                            start_at=datetime.combine(start_date, time.min, tzinfo=timezone.utc),
+                            end_at=datetime.combine(end_date, time.max, tzinfo=timezone.utc),
+                            limit=None,
+                        )
+                    )
+                return stored
+
+        async def _refresh() -> list[MarketBar]:
+            return await self._run_upstream_fetch_once(
+                key=_fetch_lease_key(
                     ticker=query.ticker,
                     timespan="day",
                     refresh_windows=refresh_windows,
                 ),
-                work=_refresh,
+                fetch=_fetch_and_store,
+                reread=_reread_stored,
+            )
+
+        refresh_key = _baseline_refresh_key(
+            ticker=query.ticker,
+            timespan="day",
+            refresh_windows=refresh_windows,
+        )
+        if self._can_serve_stale(
+            completeness=_day_cache_completeness(
+                query=query,
+                bars=existing,
+                trading_calendar=self._trading_calendar,
             )
+        ):
+            self._start_background_refresh(key=refresh_key, work=_refresh)
+            return _BaselineRead(bars=existing, partial=True)
+
+        try:
+            refreshed = await self._run_baseline_refresh_once(key=refresh_key, work=_refresh)
         except (MarketDataRateLimitedError, MarketDataUpstreamUnavailableError):
             if _has_complete_day_cache(
                 query=query,
                 bars=existing,
                 trading_calendar=self._trading_calendar,
             ):
-                return existing, False
+                return _BaselineRead(bars=existing)
             raise
         if not refreshed:
-            return existing, False
+            return _BaselineRead(bars=existing)
 
         incoming = _filter_bars_by_range(
             bars=refreshed,
             start_at=query.start_at,
             end_at=query.end_at,
         )
-        return _merge_bars_by_start_at(existing=existing, incoming=incoming), True
+        return _BaselineRead(bars=_merge_bars_by_start_at(existing=existing, incoming=incoming), fetched=True)
 
     async def _refresh_minute_baseline(
         self,
         *,
         query: _BarsQuery,
         now: datetime,
-    ) -> tuple[list[MarketBar], bool]:
+    ) -> _BaselineRead:
         async with self._uow as uow:
             repo = _require_market_data_repo(uow)
+            coverage = await repo.list_minute_coverage(
+                ticker=query.ticker,
+                start_date=query.start_date,
+                end_date=query.end_date,
+            )
             existing = await repo.list_minute_bars(
                 ticker=query.ticker,
                 start_at=query.start_at,
@@ -549,23 +942,25 @@ class MarketDataApplicationService:
                 limit=None,
                 session=query.session,
             )
-            refresh_windows = _resolve_minute_refresh_windows(
-                query=query,
-                existing_bars=existing,
-                now=now,
-                trading_calendar=self._trading_calendar,
-            )
+        plan = _resolve_minute_refresh_plan(
+            query=query,
+            coverage=coverage,
+            now=now,
+            trading_calendar=self._trading_calendar,
+        )
 
-        if not refresh_windows:
-            return existing, False
+        if not plan.ranges:
+            return _BaselineRead(bars=existing)
 
-        async def _refresh() -> list[MarketBar]:
-            fetched = await self._fetch_baseline_windows(
+        async def _fetch_and_store() -> list[MarketBar]:
+            fetched = await self._fetch_minute_ranges(ticker=query.ticker, refresh_ranges=plan.ranges)
+            settled = _settled_minute_coverage(
                 ticker=query.ticker,
-                timespan="minute",
-                refresh_windows=refresh_windows,
+                gaps=plan.gaps,
+                now=now,
+                finalize_delay_minutes=_minute_finalize_delay_minutes(),
             )
-            if not fetched:
+            if not fetched and not settled:
                 return []
 
             refreshed = _with_minute_finality(
@@ -573,21 +968,54 @@ class MarketDataApplicationService:
                 now=now,
                 finalize_delay_minutes=_minute_finalize_delay_minutes(),
             )
-            async with self._uow as refresh_uow:
+            async with self._refresh_uow() as refresh_uow:
                 refresh_repo = _require_market_data_repo(refresh_uow)
-                await refresh_repo.upsert_minute_bars(refreshed)
+                if refreshed:
+                    await refresh_repo.upsert_minute_bars(refreshed)
+                if settled:
+                    # Confirmed minutes without upstream bars are settled too, so they stop
+                    # looking like gaps on the next request.
+                    await refresh_repo.upsert_minute_coverage(settled)
                 await refresh_uow.commit()
+            await self._invalidate_bars_responses(bars=refreshed)
             return refreshed
 
-        try:
-            refreshed = await self._run_baseline_refresh_once(
-                key=_baseline_refresh_key(
-                    ticker=query.ticker,
-                    timespan="minute",
-                    refresh_windows=refresh_windows,
-                ),
-                work=_refresh,
+        async def _reread_stored() -> list[MarketBar]:
+            async with self._refresh_uow() as reread_uow:
+                reread_repo = _require_market_data_repo(reread_uow)
+                stored: list[MarketBar] = []
+                for start_at, end_at in plan.ranges:
+                    stored.extend(
+                        await reread_repo.list_minute_bars(
+                            ticker=query.ticker,
+                            start_at=start_at,
+                            end_at=end_at,
+                            limit=None,
+                        )
+                    )
+                return stored
+
+        async def _refresh() -> list[MarketBar]:
+            return await self._run_upstream_fetch_once(
+                key=_minute_fetch_lease_key(ticker=query.ticker, refresh_ranges=plan.ranges),
+                fetch=_fetch_and_store,
+                reread=_reread_stored,
+            )
+
+        refresh_key = _minute_refresh_key(ticker=query.ticker, refresh_ranges=plan.ranges)
+        if self._can_serve_stale(
+            completeness=_minute_cache_completeness(
+                query=query,
+                bars=existing,
+                now=now,
+                trading_calendar=self._trading_calendar,
             )
+        ):
+            self._start_background_refresh(key=refresh_key, work=_refresh)
+            return _BaselineRead(bars=existing, partial=True)
+
+        try:
+            refreshed = await self._run_baseline_refresh_once(key=refresh_key, work=_refresh)
         except (MarketDataRateLimitedError, MarketDataUpstreamUnavailableError):
             if _has_complete_minute_cache(
                 query=query,
@@ -595,10 +1023,10 @@ class MarketDataApplicationService:
                 now=now,
                 trading_calendar=self._trading_calendar,
             ):
-                return existing, False
+                return _BaselineRead(bars=existing)
             raise
         if not refreshed:
-            return existing, False
+            return _BaselineRead(bars=existing)
 
         incoming = _filter_bars_by_session(
             bars=_filter_bars_by_range(
@@ -608,7 +1036,7 @@ class MarketDataApplicationService:
             ),
             session=query.session,
         )
-        return _merge_bars_by_start_at(existing=existing, incoming=incoming), True
+        return _BaselineRead(bars=_merge_bars_by_start_at(existing=existing, incoming=incoming), fetched=True)
 
     async def _fetch_baseline_windows(
         self,
@@ -617,50 +1045,110 @@ class MarketDataApplicationService:
         timespan: str,
         refresh_windows: list[tuple[date, date]],
     ) -> list[MarketBar]:
-        fetched: list[MarketBar] = []
-        for start_date, end_date in refresh_windows:
-            incoming = await self._fetch_from_massive(
-                ticker=ticker,
-                timespan=timespan,
-                multiplier=1,
-                start_date=start_date,
-                end_date=end_date,
-            )
-            if incoming:
-                fetched = _merge_bars_by_start_at(existing=fetched, incoming=incoming)
-        return fetched
+        return await self._fetch_windows_concurrently(
+            [
+                partial(
+                    self._fetch_from_massive,
+                    ticker=ticker,
+                    timespan=timespan,
+                    multiplier=1,
+                    start_date=start_date,
+                    end_date=end_date,
+                )
+                for start_date, end_date in refresh_windows
+            ]
+        )
+
+    async def _fetch_minute_ranges(
+        self,
+        *,
+        ticker: str,
+        refresh_ranges: list[tuple[datetime, datetime]],
+    ) -> list[MarketBar]:
+        return await self._fetch_windows_concurrently(
+            [
+                partial(self._fetch_minute_range_from_massive, ticker=ticker, start_at=start_at, end_at=end_at)
+                for start_at, end_at in refresh_ranges
+            ]
+        )
+
+    async def _fetch_windows_concurrently(
+        self,
+        fetchers: list[Callable[[], Awaitable[list[MarketBar]]]],
+    ) -> list[MarketBar]:
+        window_slots = asyncio.Semaphore(_upstream_windows_per_request())
+
+        async def _fetch_window(fetch: Callable[[], Awaitable[list[MarketBar]]]) -> list[MarketBar]:
+            async with window_slots:
+                incoming = await fetch()
+            return sorted(incoming, key=lambda bar: bar.start_at)
+
+        if len(fetchers) == 1:
+            return await _fetch_window(fetchers[0])
+
+        tasks = [asyncio.create_task(_fetch_window(fetch)) for fetch in fetchers]
+        try:
+            fetched = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return _merge_sorted_window_bars(fetched)
 
     async def _run_baseline_refresh_once(
         self,
         *,
-        key: tuple[str, str, tuple[tuple[date, date], ...]],
-        work: Callable[[], Awaitable[list[MarketBar]]],
+        key: _BaselineRefreshKey,
+        work: Callable[[], Coroutine[Any, Any, list[MarketBar]]],
     ) -> list[MarketBar]:
-        async with self._baseline_refresh_tasks_lock:
-            task = self._baseline_refresh_tasks.get(key)
-            if task is None:
-                task = asyncio.create_task(work())
-                self._baseline_refresh_tasks[key] = task
-                task.add_done_callback(
-                    lambda completed, refresh_key=key: asyncio.create_task(
-                        self._clear_baseline_refresh_task(
-                            key=refresh_key,
-                            task=completed,
-                        )
-                    )
-                )
-        assert task is not None
-        return await asyncio.shield(task)
+        return await self._baseline_refresh_registry.run(key=key, work=work)
+
+    def _can_serve_stale(self, *, completeness: float) -> bool:
+        if not settings.market_data_bars_stale_while_revalidate:
+            return False
+        return completeness >= settings.market_data_bars_swr_min_completeness
 
-    async def _clear_baseline_refresh_task(
+    def _start_background_refresh(
         self,
         *,
-        key: tuple[str, str, tuple[tuple[date, date], ...]],
-        task: asyncio.Task[list[MarketBar]],
+        key: _BaselineRefreshKey,
+        work: Callable[[], Coroutine[Any, Any, list[MarketBar]]],
     ) -> None:
-        async with self._baseline_refresh_tasks_lock:
-            if self._baseline_refresh_tasks.get(key) is task:
-                self._baseline_refresh_tasks.pop(key, None)
+        task = self._baseline_refresh_registry.start(key=key, work=work)
+        task.add_done_callback(_log_background_refresh_failure)
+
+    async def _invalidate_bars_responses(self, *, bars: list[MarketBar]) -> None:
+        if self._response_cache is None or not bars:
+            return
+        trade_dates_by_ticker: dict[str, set[date]] = {}
+        for bar in bars:
+            trade_date = (
+                _day_bar_trade_date(start_at=bar.start_at)
+                if bar.timespan == "day"
+                else market_trade_date(point=bar.start_at)
+            )
+            trade_dates_by_ticker.setdefault(bar.ticker, set()).add(trade_date)
+        for ticker, trade_dates in trade_dates_by_ticker.items():
+            await self._response_cache.invalidate(ticker=ticker, trade_dates=trade_dates)
+
+    def _refresh_uow(self) -> SqlAlchemyUnitOfWork:
+        # Refreshes may outlive the request in the background, so they get their own unit of work.
+        if self._uow_factory is not None:
+            return self._uow_factory()
+        return self._uow
+
+    async def _run_upstream_fetch_once(
+        self,
+        *,
+        key: str,
+        fetch: Callable[[], Awaitable[list[MarketBar]]],
+        reread: Callable[[], Awaitable[list[MarketBar]]],
+    ) -> list[MarketBar]:
+        if self._fetch_lease is None:
+            return await fetch()
+        # Another worker may already be fetching the same windows; reuse what it stored.
+        return await self._fetch_lease.run_or_wait(key=key, leader=fetch, follower=reread)
 
     async def _fetch_from_massive(
         self,
@@ -670,20 +1158,53 @@ class MarketDataApplicationService:
         multiplier: int,
         start_date: date,
         end_date: date,
+    ) -> list[MarketBar]:
+        return await self._list_massive_aggs(
+            ticker=ticker,
+            timespan=timespan,
+            multiplier=multiplier,
+            from_bound=start_date.isoformat(),
+            to_bound=end_date.isoformat(),
+        )
+
+    async def _fetch_minute_range_from_massive(
+        self,
+        *,
+        ticker: str,
+        start_at: datetime,
+        end_at: datetime,
+    ) -> list[MarketBar]:
+        return await self._list_massive_aggs(
+            ticker=ticker,
+            timespan="minute",
+            multiplier=1,
+            from_bound=_massive_timestamp_bound(start_at),
+            to_bound=_massive_timestamp_bound(end_at),
+        )
+
+    async def _list_massive_aggs(
+        self,
+        *,
+        ticker: str,
+        timespan: str,
+        multiplier: int,
+        from_bound: str,
+        to_bound: str,
     ) -> list[MarketBar]:
         if self._massive_client is None:
             raise MarketDataUpstreamUnavailableError()
         try:
-            aggregates = await self._massive_client.list_aggs(
-                ticker=ticker,
-                multiplier=multiplier,
-                timespan=timespan,
-                from_date=start_date.isoformat(),
-                to_date=end_date.isoformat(),
-                adjusted=True,
-                sort="asc",
-                limit=50000,
-            )
+            async with self._upstream_slot():
+                aggregates = await self._massive_client.list_aggs(
+                    ticker=ticker,
+                    multiplier=multiplier,
+                    timespan=timespan,
+                    from_date=from_bound,
+                    to_date=to_bound,
+                    adjusted=True,
+                    sort="asc",
+                    limit=50000,
+                )
         except Exception as exc:
             raise _map_market_data_upstream_error(exc) from exc
         return map_massive_aggregates_to_market_bars(
@@ -693,6 +1214,32 @@ class MarketDataApplicationService:
             aggregates=aggregates,
         )
 
+    @asynccontextmanager
+    async def _upstream_slot(self) -> AsyncIterator[None]:
+        if self._upstream_limiter is None:
+            yield
+            return
+        async with self._upstream_limiter.slot():
+            yield
+
+    def _live_snapshot(
+        self,
+        *,
+        symbol: str,
+        baseline: _DailySnapshotBaseline | None,
+        today: date,
+        as_of: datetime,
+        market_open: bool,
+    ) -> MarketSnapshot | None:
+        # Change is only meaningful against a stored previous close, so symbols without one go upstream.
+        prev_close = _session_prev_close(baseline=baseline, today=today)
+        if prev_close is None or self._snapshot_state is None:
+            return None
+        live = self._snapshot_state.get(symbol=symbol, trade_date=today, as_of=as_of)
+        if live is None:
+            return None
+        return _snapshot_from_live_state(live=live, prev_close=prev_close, market_open=market_open)
+
     async def _list_daily_snapshot_baselines(self, *, tickers: list[str]) -> dict[str, _DailySnapshotBaseline]:
         baselines: dict[str, _DailySnapshotBaseline] = {}
         async with self._uow as uow:
@@ -700,37 +1247,36 @@ class MarketDataApplicationService:
             if repo is None:
                 return baselines
 
-            for symbol in tickers:
-                list_recent = getattr(repo, "list_recent_day_bars", None)
-                if list_recent is None:
-                    continue
-                day_bars = await list_recent(ticker=symbol, limit=2)
-                if not day_bars:
-                    continue
+            day_bars_by_symbol = await repo.list_recent_day_bars_for_tickers(tickers=tickers, limit=2)
 
-                latest = day_bars[-1]
-                previous = day_bars[-2] if len(day_bars) > 1 else None
-                prev_close = previous.close if previous is not None else None
-                change, change_pct = _calc_change(
-                    current=latest.close,
-                    previous=prev_close,
-                )
-                baselines[symbol] = _DailySnapshotBaseline(
-                    snapshot=MarketSnapshot(
-                        ticker=symbol,
-                        last=latest.close,
-                        change=change,
-                        change_pct=change_pct,
-                        open=latest.open,
-                        high=latest.high,
-                        low=latest.low,
-                        volume=int(latest.volume),
-                        updated_at=latest.start_at,
-                        market_status="closed",
-                        source="DB",
-                    ),
-                    prev_close=prev_close,
-                )
+        for symbol in tickers:
+            day_bars = day_bars_by_symbol.get(symbol)
+            if not day_bars:
+                continue
+
+            latest = day_bars[-1]
+            previous = day_bars[-2] if len(day_bars) > 1 else None
+            prev_close = previous.close if previous is not None else None
+            change, change_pct = _calc_change(
+                current=latest.close,
+                previous=prev_close,
+            )
+            baselines[symbol] = _DailySnapshotBaseline(
+                snapshot=MarketSnapshot(
+                    ticker=symbol,
+                    last=latest.close,
+                    change=change,
+                    change_pct=change_pct,
+                    open=latest.open,
+                    high=latest.high,
+                    low=latest.low,
+                    volume=int(latest.volume),
+                    updated_at=latest.start_at,
+                    market_status="closed",
+                    source="DB",
+                ),
+                prev_close=prev_close,
+            )
         return baselines
 
 
@@ -781,6 +1327,32 @@ def _merge_snapshot(
     return upstream
 
 
+def _session_prev_close(*, baseline: _DailySnapshotBaseline | None, today: date) -> float | None:
+    if baseline is None:
+        return None
+    # The latest stored day bar is either today's partial bar or the previous session itself.
+    if _day_bar_trade_date(start_at=baseline.snapshot.updated_at) < today:
+        return baseline.snapshot.last
+    return baseline.prev_close
+
+
+def _snapshot_from_live_state(*, live: LiveSessionState, prev_close: float, market_open: bool) -> MarketSnapshot:
+    change, change_pct = _calc_change(current=live.last, previous=prev_close)
+    return MarketSnapshot(
+        ticker=live.symbol,
+        last=live.last,
+        change=change,
+        change_pct=change_pct,
+        open=live.open,
+        high=live.high,
+        low=live.low,
+        volume=int(live.volume),
+        updated_at=live.last_at,
+        market_status="open" if market_open else "closed",
+        source="WS",
+    )
+
+
 def _calc_change(*, current: float, previous: float | None) -> tuple[float, float]:
     if previous is None or previous == 0:
         return 0.0, 0.0
@@ -864,6 +1436,90 @@ def _build_bars_query(
     )
 
 
+def _bars_response_cache_key(query: _BarsQuery) -> str:
+    limit = query.limit if query.limit is not None else "all"
+    return (
+        f"{query.ticker}:{query.timespan}:{query.multiplier}:{query.session}:"
+        f"{query.start_date.isoformat()}:{query.end_date.isoformat()}:{limit}"
+    )
+
+
+def _bars_response_index_range(*, query: _BarsQuery, trading_calendar: TradingCalendar) -> tuple[date, date]:
+    # Period bars are built from every session in their period, so writes anywhere in it must invalidate.
+    if not _is_day_period_query(query):
+        return query.start_date, query.end_date
+    period_bounds = _day_period_bounds_resolver(query=query, trading_calendar=trading_calendar)
+    return (
+        min(query.start_date, period_bounds(query.start_date)[0]),
+        max(query.end_date, period_bounds(query.end_date)[1]),
+    )
+
+
+def _is_day_period_query(query: _BarsQuery) -> bool:
+    return query.timespan in {"week", "month"} or (query.timespan == "day" and query.multiplier > 1)
+
+
+def _day_period_bounds_resolver(
+    *,
+    query: _BarsQuery,
+    trading_calendar: TradingCalendar,
+) -> Callable[[date], tuple[date, date]]:
+    if query.timespan in {"week", "month"}:
+        return lambda trade_date: resolve_period_bounds(
+            trade_date=trade_date,
+            timespan=query.timespan,
+            multiplier=query.multiplier,
+        )
+
+    # Multi-day bars count sessions from the first trading day of the request, as upstream does.
+    multiplier = query.multiplier
+    anchor = trading_calendar.shift_trading_day(target_date=query.start_date - timedelta(days=1), trading_days=1)
+
+    def _bounds(trade_date: date) -> tuple[date, date]:
+        index = max(0, trading_calendar.count_trading_days(start_date=anchor, end_date=trade_date) - 1)
+        period_start = trading_calendar.shift_trading_day(
+            target_date=anchor,
+            trading_days=(index // multiplier) * multiplier,
+        )
+        return period_start, trading_calendar.shift_trading_day(target_date=period_start, trading_days=multiplier - 1)
+
+    return _bounds
+
+
+def _day_period_baseline_query(
+    *,
+    query: _BarsQuery,
+    period_bounds: Callable[[date], tuple[date, date]],
+    today: date,
+) -> _BarsQuery:
+    # Read whole periods at both edges so boundary bars aggregate every session, but never past today.
+    start_date = min(query.start_date, period_bounds(query.start_date)[0])
+    end_date = max(query.end_date, min(period_bounds(query.end_date)[1], today))
+    return replace(
+        query,
+        timespan="day",
+        multiplier=1,
+        start_date=start_date,
+        end_date=end_date,
+        start_at=datetime.combine(start_date, time.min, tzinfo=timezone.utc),
+        end_at=datetime.combine(end_date, time.max, tzinfo=timezone.utc),
+        limit=None,
+    )
+
+
+def _bars_response_ttl_seconds(*, query: _BarsQuery, result: MarketBarsQueryResult) -> int:
+    # Ranges that end before today and hold only final bars cannot change until an upsert invalidates them.
+    finalized = (
+        bool(result.bars)
+        and not result.partial_range
+        and query.end_date < market_trade_date(point=datetime.now(tz=timezone.utc))
+        and all(bar.is_final is True for bar in result.bars)
+    )
+    if finalized:
+        return settings.market_data_bars_response_cache_final_ttl_seconds
+    return settings.market_data_bars_response_cache_tail_ttl_seconds
+
+
 def _require_market_data_repo(uow: SqlAlchemyUnitOfWork):
     if uow.market_data_repo is None:
         raise RuntimeError("Market data repository not configured")
@@ -909,64 +1565,113 @@ def _resolve_day_refresh_windows(
     return _group_contiguous_dates(dates=refresh_dates)
 
 
-def _resolve_minute_refresh_windows(
+def _resolve_minute_refresh_plan(
     *,
     query: _BarsQuery,
-    existing_bars: list[MarketBar],
+    coverage: list[MinuteCoverage],
     now: datetime,
     trading_calendar: TradingCalendar,
-) -> list[tuple[date, date]]:
-    finalize_delay_minutes = _minute_finalize_delay_minutes()
-    existing_by_trade_date: dict[date, list[MarketBar]] = {}
-    for bar in existing_bars:
-        trade_date = market_trade_date(point=bar.start_at)
-        existing_by_trade_date.setdefault(trade_date, []).append(bar)
-
-    refresh_dates: list[date] = []
+) -> _MinuteRefreshPlan:
+    confirmed_before = _minute_starts_through(
+        point=now - timedelta(minutes=max(1, _minute_finalize_delay_minutes()))
+    )
+    coverage_by_trade_date = {item.trade_date: item for item in coverage}
+    ranges: list[tuple[datetime, datetime]] = []
+    gaps: dict[date, int] = {}
     for trade_date in _list_query_trade_dates(
         start_date=query.start_date,
         end_date=query.end_date,
         trading_calendar=trading_calendar,
     ):
-        items = existing_by_trade_date.get(trade_date, [])
-        if not items:
-            if (
-                _expected_minute_session_bar_count(
-                    session=query.session,
-                    trade_date=trade_date,
-                    trading_calendar=trading_calendar,
-                    now=now,
-                )
-                > 0
-            ):
-                refresh_dates.append(trade_date)
-            continue
-        if any(
-            not _is_minute_bar_final_state_valid(
-                bar=bar,
-                now=now,
-                finalize_delay_minutes=finalize_delay_minutes,
-            )
-            for bar in items
-        ):
-            refresh_dates.append(trade_date)
-            continue
-        if not _has_complete_minute_session_cache(
+        expected = _expected_minute_session_mask(
             session=query.session,
             trade_date=trade_date,
-            bars=items,
             trading_calendar=trading_calendar,
             now=now,
-        ):
-            refresh_dates.append(trade_date)
+        )
+        if not expected:
             continue
-        if _is_minute_session_trade_date_mutable(
-            session=query.session,
+        item = coverage_by_trade_date.get(trade_date) or MinuteCoverage(ticker=query.ticker, trade_date=trade_date)
+        if _is_minute_session_trade_date_mutable(session=query.session, trade_date=trade_date, now=now):
+            revisit = expected
+        else:
+            # Stored bars still inside the confirmation delay are left alone until they are due.
+            revisit = ~item.present | minute_range_mask(
+                trade_date=trade_date,
+                start_at=coverage_day_start(trade_date=trade_date),
+                end_at=confirmed_before,
+            )
+        needed = expected & ~item.final & revisit
+        if not needed:
+            continue
+        gaps[trade_date] = needed
+        ranges.extend(
+            _merge_minute_gap_ranges(trade_date=trade_date, needed=needed, expected=expected, final=item.final)
+        )
+    return _MinuteRefreshPlan(ranges=ranges, gaps=gaps)
+
+
+def _merge_minute_gap_ranges(
+    *,
+    trade_date: date,
+    needed: int,
+    expected: int,
+    final: int,
+) -> list[tuple[datetime, datetime]]:
+    # Gaps of one trade date share an upstream call only when the minutes between them belong to the same
+    # session segment, and they are either close or not settled yet.
+    max_gap = timedelta(minutes=_MINUTE_REFRESH_MERGE_GAP_MINUTES + 1)
+    merged: list[tuple[datetime, datetime]] = []
+    for start, end in mask_minute_ranges(trade_date=trade_date, mask=needed):
+        if merged:
+            previous_start, previous_end = merged[-1]
+            between = minute_range_mask(
+                trade_date=trade_date,
+                start_at=previous_end + timedelta(minutes=1),
+                end_at=start,
+            )
+            same_segment = not between & ~expected
+            if same_segment and (start - previous_end <= max_gap or not between & final):
+                merged[-1] = (previous_start, end)
+                continue
+        merged.append((start, end))
+    return merged
+
+
+def _settled_minute_coverage(
+    *,
+    ticker: str,
+    gaps: dict[date, int],
+    now: datetime,
+    finalize_delay_minutes: int,
+) -> list[MinuteCoverage]:
+    # Only the confirmed minutes that were planned as gaps are settled; minutes a merged range
+    # merely spans were not asked for and keep their current coverage.
+    confirmed_before = _minute_starts_through(point=now - timedelta(minutes=max(1, finalize_delay_minutes)))
+    settled: list[MinuteCoverage] = []
+    for trade_date in sorted(gaps):
+        mask = gaps[trade_date] & minute_range_mask(
             trade_date=trade_date,
-            now=now,
-        ):
-            refresh_dates.append(trade_date)
-    return _group_contiguous_dates(dates=refresh_dates)
+            start_at=coverage_day_start(trade_date=trade_date),
+            end_at=confirmed_before,
+        )
+        if mask:
+            settled.append(MinuteCoverage(ticker=ticker, trade_date=trade_date, final=mask))
+    return settled
+
+
+def _resolve_minute_agg_read_from(
+    *,
+    watermark: datetime | None,
+    multiplier: int,
+    lookback_start_at: datetime,
+) -> datetime:
+    if watermark is None:
+        return lookback_start_at
+    # Rebuild the buckets whose minute bars could still settle after they were aggregated.
+    settle_from = watermark - timedelta(minutes=_minute_finalize_delay_minutes())
+    bucket_start, _ = resolve_bucket_bounds(point=settle_from, multiplier=multiplier)
+    return max(lookback_start_at, bucket_start)
 
 
 def _with_day_finality(
@@ -1079,10 +1784,31 @@ def _baseline_refresh_key(
     ticker: str,
     timespan: str,
     refresh_windows: list[tuple[date, date]],
-) -> tuple[str, str, tuple[tuple[date, date], ...]]:
+) -> _DateWindowsKey:
     return ticker, timespan, tuple(refresh_windows)
 
 
+def _minute_refresh_key(*, ticker: str, refresh_ranges: list[tuple[datetime, datetime]]) -> _MinuteRangesKey:
+    return ticker, "minute", tuple(refresh_ranges)
+
+
+def _fetch_lease_key(
+    *,
+    ticker: str,
+    timespan: str,
+    refresh_windows: list[tuple[date, date]],
+) -> str:
+    windows = ",".join(f"{start.isoformat()}..{end.isoformat()}" for start, end in refresh_windows)
+    return f"{timespan}:{ticker}:{windows}"
+
+
+def _minute_fetch_lease_key(*, ticker: str, refresh_ranges: list[tuple[datetime, datetime]]) -> str:
+    ranges = ",".join(
+        f"{_massive_timestamp_bound(start_at)}..{_massive_timestamp_bound(end_at)}" for start_at, end_at in refresh_ranges
+    )
+    return f"minute:{ticker}:{ranges}"
+
+
 def _day_bar_trade_date(*, start_at: datetime) -> date:
     if start_at.tzinfo is None:
         return start_at.date()
@@ -1093,6 +1819,10 @@ def _day_finalize_trade_days() -> int:
     return max(1, int(settings.market_data_day_finalize_trade_days))
 
 
+def _upstream_windows_per_request() -> int:
+    return max(1, int(settings.market_data_upstream_max_concurrency_per_request))
+
+
 def _minute_finalize_delay_minutes() -> int:
     return normalized_delay_minutes(settings.market_data_minute_finalize_delay_minutes)
 
@@ -1184,20 +1914,6 @@ def _align_on_or_before(*, target_date: date, trading_calendar: TradingCalendar)
     raise ValueError("Trading calendar could not align target date on or before requested date")
 
 
-def _is_minute_bar_final_state_valid(
-    *,
-    bar: MarketBar,
-    now: datetime,
-    finalize_delay_minutes: int,
-) -> bool:
-    should_be_final = _is_minute_bar_confirmation_due(
-        bar=bar,
-        now=now,
-        finalize_delay_minutes=finalize_delay_minutes,
-    )
-    return bar.is_final is should_be_final
-
-
 def _is_minute_bar_confirmation_due(
     *,
     bar: MarketBar,
@@ -1301,6 +2017,59 @@ def _expected_minute_session_bar_count(
     return 0
 
 
+def _expected_minute_session_mask(
+    *,
+    session: str,
+    trade_date: date,
+    trading_calendar: TradingCalendar,
+    now: datetime,
+) -> int:
+    completed_before = _minute_starts_through(point=now - timedelta(minutes=1))
+    segments: list[tuple[datetime, datetime]] = []
+    if session == "regular":
+        session_bounds = trading_calendar.session_bounds(target_date=trade_date)
+        if session_bounds is None:
+            session_bounds = (
+                datetime.combine(trade_date, MARKET_OPEN_TIME, tzinfo=MARKET_TIMEZONE),
+                datetime.combine(trade_date, MARKET_CLOSE_TIME, tzinfo=MARKET_TIMEZONE),
+            )
+        segments.append(session_bounds)
+    elif session == "pre":
+        segments.append(
+            (
+                datetime.combine(trade_date, _PREMARKET_OPEN_TIME, tzinfo=MARKET_TIMEZONE),
+                datetime.combine(trade_date, MARKET_OPEN_TIME, tzinfo=MARKET_TIMEZONE),
+            )
+        )
+    elif session == "night":
+        segments.append(
+            (
+                datetime.combine(trade_date, time.min, tzinfo=MARKET_TIMEZONE),
+                datetime.combine(trade_date, _PREMARKET_OPEN_TIME, tzinfo=MARKET_TIMEZONE),
+            )
+        )
+        segments.append(
+            (
+                datetime.combine(trade_date, MARKET_CLOSE_TIME, tzinfo=MARKET_TIMEZONE),
+                datetime.combine(trade_date + timedelta(days=1), time.min, tzinfo=MARKET_TIMEZONE),
+            )
+        )
+
+    mask = 0
+    for start_at, end_at in segments:
+        mask |= minute_range_mask(
+            trade_date=trade_date,
+            start_at=start_at,
+            end_at=min(end_at, completed_before),
+        )
+    return mask
+
+
+def _minute_starts_through(*, point: datetime) -> datetime:
+    # Exclusive bound covering every minute bar that starts at or before `point`.
+    return point.replace(second=0, microsecond=0) + timedelta(minutes=1)
+
+
 def _completed_session_minutes(*, start_at: datetime, end_at: datetime, point: datetime) -> int:
     if point <= start_at:
         return 0
@@ -1310,6 +2079,64 @@ def _completed_session_minutes(*, start_at: datetime, end_at: datetime, point: d
     return max(0, int((effective_end - start_at).total_seconds() // 60))
 
 
+def _day_cache_completeness(
+    *,
+    query: _BarsQuery,
+    bars: list[MarketBar],
+    trading_calendar: TradingCalendar,
+) -> float:
+    expected = set(
+        _list_query_trade_dates(
+            start_date=query.start_date,
+            end_date=query.end_date,
+            trading_calendar=trading_calendar,
+        )
+    )
+    if not expected:
+        return 1.0
+    observed = {_day_bar_trade_date(start_at=bar.start_at) for bar in bars}
+    return len(expected & observed) / len(expected)
+
+
+def _minute_cache_completeness(
+    *,
+    query: _BarsQuery,
+    bars: list[MarketBar],
+    now: datetime,
+    trading_calendar: TradingCalendar,
+) -> float:
+    observed_by_trade_date: dict[date, set[datetime]] = {}
+    for bar in bars:
+        observed_by_trade_date.setdefault(market_trade_date(point=bar.start_at), set()).add(bar.start_at)
+
+    expected_total = 0
+    observed_total = 0
+    for trade_date in _list_query_trade_dates(
+        start_date=query.start_date,
+        end_date=query.end_date,
+        trading_calendar=trading_calendar,
+    ):
+        expected = _expected_minute_session_bar_count(
+            session=query.session,
+            trade_date=trade_date,
+            trading_calendar=trading_calendar,
+            now=now,
+        )
+        expected_total += expected
+        observed_total += min(expected, len(observed_by_trade_date.get(trade_date, ())))
+    if expected_total <= 0:
+        return 1.0
+    return observed_total / expected_total
+
+
+def _log_background_refresh_failure(task: asyncio.Task[list[MarketBar]]) -> None:
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.warning("Background bars refresh failed: %s", exc)
+
+
 def _has_complete_day_cache(
     *,
     query: _BarsQuery,
@@ -1389,6 +2216,18 @@ def _apply_limit(bars: list[MarketBar], *, limit: int | None) -> list[MarketBar]
     return bars[:limit]
 
 
+def _merge_sorted_window_bars(results: list[list[MarketBar]]) -> list[MarketBar]:
+    # k-way merge of per-window sorted results; later windows win on equal start_at, as in
+    # _merge_bars_by_start_at.
+    merged: list[MarketBar] = []
+    for bar in heapq.merge(*results, key=lambda item: item.start_at):
+        if merged and merged[-1].start_at == bar.start_at:
+            merged[-1] = bar
+            continue
+        merged.append(bar)
+    return merged
+
+
 def _merge_bars_by_start_at(*, existing: list[MarketBar], incoming: list[MarketBar]) -> list[MarketBar]:
     merged = {bar.start_at: bar for bar in existing}
     for bar in incoming:
@@ -1413,6 +2252,11 @@ def _minute_query_bounds_utc(*, start_date: date, end_date: date, session: str)
     return market_start.astimezone(timezone.utc), market_last_bar_start.astimezone(timezone.utc)
 
 
+def _massive_timestamp_bound(value: datetime) -> str:
+    # Massive takes millisecond timestamps for intraday range bounds.
+    return str(int(value.timestamp()) * 1000 + value.microsecond // 1000)
+
+
 def _normalize_session(*, session: str) -> str:
     normalized = session.strip().lower()
     if normalized not in _SUPPORTED_BAR_SESSIONS:
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine, Hashable
+from dataclasses import dataclass
+import threading
+from typing import Any, Generic, TypeVar
+import weakref
+
+_T = TypeVar("_T")
+
+
+@dataclass(slots=True, frozen=True)
+class SingleFlightStats:
+    hits: int
+    misses: int
+    in_flight: int
+
+
+class SingleFlightRegistry(Generic[_T]):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Tasks are bound to the loop that created them; counters are shared across loops.
+        self._tasks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            dict[Hashable, asyncio.Task[_T]],
+        ] = weakref.WeakKeyDictionary()
+        self._hits = 0
+        self._misses = 0
+
+    async def run(self, *, key: Hashable, work: Callable[[], Coroutine[Any, Any, _T]]) -> _T:
+        return await asyncio.shield(self.start(key=key, work=work))
+
+    def start(self, *, key: Hashable, work: Callable[[], Coroutine[Any, Any, _T]]) -> asyncio.Task[_T]:
+        # Joins or starts the flight for `key` without waiting on it.
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            tasks = self._tasks.setdefault(loop, {})
+            task = tasks.get(key)
+            if task is None or task.done():
+                task = loop.create_task(work())
+                tasks[key] = task
+                self._misses += 1
+                task.add_done_callback(
+                    lambda completed, refresh_key=key, owner=loop: self._clear(
+                        loop=owner,
+                        key=refresh_key,
+                        task=completed,
+                    )
+                )
+            else:
+                self._hits += 1
+        return task
+
+    def stats(self) -> SingleFlightStats:
+        with self._lock:
+            in_flight = sum(len(tasks) for tasks in self._tasks.values())
+            return SingleFlightStats(hits=self._hits, misses=self._misses, in_flight=in_flight)
+
+    def _clear(
+        self,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        key: Hashable,
+        task: asyncio.Task[_T],
+    ) -> None:
+        with self._lock:
+            tasks = self._tasks.get(loop)
+            if tasks is None:
+                return
+            if tasks.get(key) is task:
+                tasks.pop(key, None)
+            if not tasks:
+                self._tasks.pop(loop, None)
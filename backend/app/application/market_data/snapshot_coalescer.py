@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Any
+import weakref
+
+_SnapshotPayload = dict[str, Any]
+
+
+@dataclass(slots=True, frozen=True)
+class SnapshotCoalescerStats:
+    requests: int
+    upstream_calls: int
+    upstream_tickers: int
+    fresh_hits: int
+
+
+@dataclass(slots=True)
+class _Batch:
+    tickers: set[str]
+    result: asyncio.Future[dict[str, _SnapshotPayload | None]]
+    timer: asyncio.TimerHandle | None = None
+
+
+@dataclass(slots=True)
+class _LoopState:
+    pending: _Batch | None = None
+    in_flight: dict[str, asyncio.Future[dict[str, _SnapshotPayload | None]]] = field(default_factory=dict)
+    fetches: set[asyncio.Task[None]] = field(default_factory=set)
+    # ticker -> (fetched_at, payload); None records that upstream had nothing for the ticker.
+    fresh: dict[str, tuple[float, _SnapshotPayload | None]] = field(default_factory=dict)
+
+
+class SnapshotRequestCoalescer:
+    # Stands in for the Massive client's list_snapshots: demands arriving within `window_seconds`
+    # share one upstream call for the union of tickers, and results are reused for `ttl_seconds`.
+    def __init__(
+        self,
+        *,
+        client: Any,
+        window_seconds: float = 0.025,
+        ttl_seconds: float = 1.0,
+        max_batch_size: int = 250,
+        time_provider: Callable[[], float] | None = None,
+    ) -> None:
+        self._client = client
+        self._window_seconds = max(0.0, float(window_seconds))
+        self._ttl_seconds = max(0.0, float(ttl_seconds))
+        self._max_batch_size = max(1, int(max_batch_size))
+        self._time_provider = time_provider or time.monotonic
+        self._lock = threading.Lock()
+        self._states: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState] = weakref.WeakKeyDictionary()
+        self._requests = 0
+        self._upstream_calls = 0
+        self._upstream_tickers = 0
+        self._fresh_hits = 0
+
+    async def list_snapshots(self, *, tickers: list[str]) -> list[_SnapshotPayload]:
+        loop = asyncio.get_running_loop()
+        state = self._loop_state(loop)
+        now = self._time_provider()
+        found: dict[str, _SnapshotPayload | None] = {}
+        waits: list[asyncio.Future[dict[str, _SnapshotPayload | None]]] = []
+
+        requested = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers if ticker.strip()))
+        for ticker in requested:
+            cached = state.fresh.get(ticker)
+            if cached is not None and now - cached[0] <= self._ttl_seconds:
+                found[ticker] = cached[1]
+                continue
+            waiting = state.in_flight.get(ticker)
+            if waiting is None:
+                waiting = self._enqueue(loop=loop, state=state, ticker=ticker)
+            if waiting not in waits:
+                waits.append(waiting)
+
+        with self._lock:
+            self._requests += 1
+            self._fresh_hits += len(found)
+
+        for waiting in waits:
+            # Shielded so one cancelled caller does not fail the batch for everyone else.
+            found.update(await asyncio.shield(waiting))
+        return [payload for ticker in requested if (payload := found.get(ticker)) is not None]
+
+    def stats(self) -> SnapshotCoalescerStats:
+        with self._lock:
+            return SnapshotCoalescerStats(
+                requests=self._requests,
+                upstream_calls=self._upstream_calls,
+                upstream_tickers=self._upstream_tickers,
+                fresh_hits=self._fresh_hits,
+            )
+
+    def _enqueue(
+        self,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        state: _LoopState,
+        ticker: str,
+    ) -> asyncio.Future[dict[str, _SnapshotPayload | None]]:
+        batch = state.pending
+        if batch is None:
+            batch = _Batch(tickers=set(), result=loop.create_future())
+            batch.timer = loop.call_later(self._window_seconds, self._dispatch, loop, state, batch)
+            state.pending = batch
+        batch.tickers.add(ticker)
+        state.in_flight[ticker] = batch.result
+        if len(batch.tickers) >= self._max_batch_size:
+            self._dispatch(loop, state, batch)
+        return batch.result
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop, state: _LoopState, batch: _Batch) -> None:
+        if state.pending is not batch:
+            return
+        state.pending = None
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = loop.create_task(self._fetch(state=state, batch=batch))
+        state.fetches.add(task)
+        task.add_done_callback(state.fetches.discard)
+
+    async def _fetch(self, *, state: _LoopState, batch: _Batch) -> None:
+        tickers = sorted(batch.tickers)
+        with self._lock:
+            self._upstream_calls += 1
+            self._upstream_tickers += len(tickers)
+        try:
+            payload = await self._client.list_snapshots(tickers=tickers)
+        except asyncio.CancelledError:
+            self._release(state=state, batch=batch)
+            batch.result.cancel()
+            raise
+        except Exception as exc:
+            self._release(state=state, batch=batch)
+            if not batch.result.done():
+                batch.result.set_exception(exc)
+                # Retrieved here so a batch nobody awaits any more does not log an unhandled error.
+                batch.result.exception()
+            return
+
+        by_ticker: dict[str, _SnapshotPayload | None] = dict.fromkeys(tickers)
+        for item in payload or []:
+            ticker = str(item.get("ticker") or "").strip().upper() if isinstance(item, dict) else ""
+            if ticker in by_ticker:
+                by_ticker[ticker] = item
+        fetched_at = self._time_provider()
+        for ticker, item in by_ticker.items():
+            state.fresh[ticker] = (fetched_at, item)
+        self._prune(state=state, now=fetched_at)
+        self._release(state=state, batch=batch)
+        if not batch.result.done():
+            batch.result.set_result(by_ticker)
+
+    def _release(self, *, state: _LoopState, batch: _Batch) -> None:
+        for ticker in batch.tickers:
+            if state.in_flight.get(ticker) is batch.result:
+                state.in_flight.pop(ticker, None)
+
+    def _prune(self, *, state: _LoopState, now: float) -> None:
+        expired = [ticker for ticker, (fetched_at, _) in state.fresh.items() if now - fetched_at > self._ttl_seconds]
+        for ticker in expired:
+            state.fresh.pop(ticker, None)
+
+    def _loop_state(self, loop: asyncio.AbstractEventLoop) -> _LoopState:
+        with self._lock:
+            state = self._states.get(loop)
+            if state is None:
+                state = _LoopState()
+                self._states[loop] = state
+            return state
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+import threading
+from typing import Any
+
+from app.domain.market_data.aggregation import MARKET_OPEN_TIME, MARKET_TIMEZONE, market_trade_date
+from app.domain.market_data.schemas import MarketSnapshot
+
+
+@dataclass(slots=True, frozen=True)
+class SnapshotStateStats:
+    events: int
+    symbols: int
+    hits: int
+    misses: int
+
+
+@dataclass(slots=True, frozen=True)
+class LiveSessionState:
+    symbol: str
+    trade_date: date
+    last: float
+    last_at: datetime
+    open: float
+    high: float
+    low: float
+    volume: float
+
+
+@dataclass(slots=True)
+class _SymbolState:
+    trade_date: date
+    last: float = 0.0
+    last_at: datetime | None = None
+    open: float = 0.0
+    high: float = 0.0
+    low: float = 0.0
+    volume: float = 0.0
+    # Session totals are only trusted once they start at the regular open or were seeded from upstream.
+    session_complete: bool = False
+    seeded_through: datetime | None = None
+    # Event time of the newest stream message; seeding alone never makes a symbol servable.
+    streamed_at: datetime | None = None
+
+
+class SnapshotStateStore:
+    # Per-process view of the live session for streamed symbols, fed by `market.trade` and minute
+    # `market.aggregate` bus messages. Only symbols with a recent event and a complete session are served;
+    # recency is judged on event time, so a lagging bus cannot pass old prices off as live.
+    def __init__(self, *, max_age_seconds: float = 15.0) -> None:
+        self._max_age = timedelta(seconds=max(0.0, float(max_age_seconds)))
+        self._lock = threading.Lock()
+        self._symbols: dict[str, _SymbolState] = {}
+        self._events = 0
+        self._hits = 0
+        self._misses = 0
+
+    def apply_event(self, payload: dict[str, Any]) -> None:
+        message_type = str(payload.get("type", "")).strip().lower()
+        if message_type not in {"market.trade", "market.aggregate"}:
+            return
+        data = payload.get("data")
+        if not isinstance(data, dict):
+            return
+        symbol = str(data.get("symbol", "")).strip().upper()
+        event_at = _parse_datetime(data.get("event_ts"))
+        if not symbol or event_at is None:
+            return
+
+        with self._lock:
+            self._events += 1
+            state = self._state_for(symbol=symbol, trade_date=market_trade_date(point=event_at))
+            if state is None:
+                return
+            if state.streamed_at is None or event_at > state.streamed_at:
+                state.streamed_at = event_at
+            if message_type == "market.trade":
+                self._apply_last(state=state, price=_to_float(data.get("price")), at=event_at)
+                return
+            if str(data.get("timespan", "")).strip().lower() == "minute":
+                self._apply_minute_bar(state=state, data=data)
+            self._apply_last(state=state, price=_to_float(data.get("close")), at=event_at)
+
+    def seed(self, snapshot: MarketSnapshot) -> None:
+        # An upstream snapshot carries the session so far; minute bars after it extend those totals.
+        if snapshot.open <= 0 or snapshot.last <= 0:
+            return
+        trade_date = market_trade_date(point=snapshot.updated_at)
+        with self._lock:
+            state = self._state_for(symbol=snapshot.ticker, trade_date=trade_date)
+            if state is None or state.session_complete:
+                return
+            state.open = snapshot.open
+            state.high = max(state.high, snapshot.high)
+            state.low = min(state.low, snapshot.low) if state.low > 0 else snapshot.low
+            state.volume = float(snapshot.volume)
+            state.session_complete = True
+            state.seeded_through = snapshot.updated_at
+            self._apply_last(state=state, price=snapshot.last, at=snapshot.updated_at)
+
+    def get(self, *, symbol: str, trade_date: date, as_of: datetime) -> LiveSessionState | None:
+        # `as_of` is the market time the caller serves, i.e. now minus any feed delay.
+        with self._lock:
+            state = self._symbols.get(symbol)
+            if (
+                state is None
+                or state.trade_date != trade_date
+                or not state.session_complete
+                or state.last_at is None
+                or state.last <= 0
+                or state.streamed_at is None
+                or as_of - state.streamed_at > self._max_age
+            ):
+                self._misses += 1
+                return None
+            self._hits += 1
+            return LiveSessionState(
+                symbol=symbol,
+                trade_date=state.trade_date,
+                last=state.last,
+                last_at=state.last_at,
+                open=state.open,
+                high=state.high,
+                low=state.low,
+                volume=state.volume,
+            )
+
+    def stats(self) -> SnapshotStateStats:
+        with self._lock:
+            return SnapshotStateStats(
+                events=self._events,
+                symbols=len(self._symbols),
+                hits=self._hits,
+                misses=self._misses,
+            )
+
+    def _state_for(self, *, symbol: str, trade_date: date) -> _SymbolState | None:
+        state = self._symbols.get(symbol)
+        if state is None or trade_date > state.trade_date:
+            state = _SymbolState(trade_date=trade_date)
+            self._symbols[symbol] = state
+        elif trade_date < state.trade_date:
+            return None
+        return state
+
+    def _apply_minute_bar(self, *, state: _SymbolState, data: dict[str, Any]) -> None:
+        start_at = _parse_datetime(data.get("start_at"))
+        end_at = _parse_datetime(data.get("end_at"))
+        open_price = _to_float(data.get("open"))
+        if start_at is None or open_price <= 0:
+            return
+        session_open = datetime.combine(state.trade_date, MARKET_OPEN_TIME, tzinfo=MARKET_TIMEZONE)
+        if start_at < session_open:
+            return
+        if state.seeded_through is not None and end_at is not None and end_at <= state.seeded_through:
+            return
+        if not state.session_complete:
+            if start_at > session_open:
+                # Joined mid-session: without the earlier bars open/volume would be wrong.
+                return
+            state.session_complete = True
+            state.open = open_price
+        high = _to_float(data.get("high"))
+        low = _to_float(data.get("low"))
+        state.high = max(state.high, high)
+        if low > 0:
+            state.low = min(state.low, low) if state.low > 0 else low
+        state.volume += _to_float(data.get("volume"))
+
+    def _apply_last(self, *, state: _SymbolState, price: float, at: datetime) -> None:
+        if price <= 0 or (state.last_at is not None and at < state.last_at):
+            return
+        state.last = price
+        state.last_at = at
+
+
+def _parse_datetime(value: object) -> datetime | None:
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _to_float(value: object) -> float:
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return 0.0
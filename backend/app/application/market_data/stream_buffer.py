@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+import time
+
+from app.application.market_data.stream_frames import StreamFrame
+
+# channel, symbol
+_ConflationKey = tuple[str, str]
+_Slot = StreamFrame | _ConflationKey
+
+
+class ConflatingStreamBuffer:
+    # Per-connection outbound buffer. Quotes and second aggregates only keep the latest frame per
+    # (channel, symbol) and hold their place in line until sent; trades, minute bars and system messages
+    # stay ordered and drop the oldest past `max_ordered`. Memory is bounded by `max_ordered` plus topics.
+    def __init__(
+        self,
+        *,
+        max_ordered: int = 512,
+        max_updates_per_second: float = 0.0,
+        time_provider: Callable[[], float] | None = None,
+    ) -> None:
+        self._max_ordered = max(1, int(max_ordered))
+        rate = float(max_updates_per_second)
+        self._min_interval = 1.0 / rate if rate > 0 else 0.0
+        self._time_provider = time_provider or time.monotonic
+        self._slots: deque[_Slot] = deque()
+        self._ordered = 0
+        self._latest: dict[_ConflationKey, StreamFrame] = {}
+        self._next_allowed_at: dict[_ConflationKey, float] = {}
+        self._ready = asyncio.Event()
+        self.conflated = 0
+        self.dropped = 0
+
+    def put_nowait(self, frame: StreamFrame) -> None:
+        key = _conflation_key(frame)
+        if key is None:
+            if self._ordered >= self._max_ordered:
+                self._drop_oldest_ordered()
+            self._slots.append(frame)
+            self._ordered += 1
+        elif key in self._latest:
+            self._latest[key] = frame
+            self.conflated += 1
+            return
+        else:
+            self._latest[key] = frame
+            self._slots.append(key)
+        self._ready.set()
+
+    def get_nowait(self) -> StreamFrame:
+        while self._slots:
+            slot = self._slots.popleft()
+            if isinstance(slot, StreamFrame):
+                self._ordered -= 1
+                return slot
+            frame = self._take_latest(slot)
+            if frame is not None:
+                return frame
+        raise asyncio.QueueEmpty
+
+    async def get(self) -> StreamFrame:
+        while True:
+            try:
+                return self.get_nowait()
+            except asyncio.QueueEmpty:
+                self._ready.clear()
+            await self._ready.wait()
+
+    def qsize(self) -> int:
+        return len(self._slots)
+
+    def empty(self) -> bool:
+        return not self._slots
+
+    def _take_latest(self, key: _ConflationKey) -> StreamFrame | None:
+        if self._min_interval <= 0:
+            return self._latest.pop(key, None)
+        now = self._time_provider()
+        allowed_at = self._next_allowed_at.get(key, 0.0)
+        if allowed_at > now:
+            # Rate-limited: the key keeps collecting the latest frame and rejoins the line when due.
+            asyncio.get_running_loop().call_later(allowed_at - now, self._release, key)
+            return None
+        frame = self._latest.pop(key, None)
+        if frame is not None:
+            if len(self._next_allowed_at) >= self._max_ordered:
+                self._next_allowed_at = {item: at for item, at in self._next_allowed_at.items() if at > now}
+            self._next_allowed_at[key] = now + self._min_interval
+        return frame
+
+    def _release(self, key: _ConflationKey) -> None:
+        if key in self._latest:
+            self._slots.append(key)
+            self._ready.set()
+
+    def _drop_oldest_ordered(self) -> None:
+        for index, slot in enumerate(self._slots):
+            if isinstance(slot, StreamFrame):
+                del self._slots[index]
+                self._ordered -= 1
+                self.dropped += 1
+                return
+
+
+def _conflation_key(frame: StreamFrame) -> _ConflationKey | None:
+    message_type = frame.payload.get("type")
+    data = frame.payload.get("data")
+    if not isinstance(data, dict):
+        return None
+    if message_type == "market.quote":
+        channel = "quote"
+    elif message_type == "market.aggregate" and data.get("timespan") == "second":
+        channel = "aggregate"
+    else:
+        return None
+    symbol = data.get("symbol")
+    if not isinstance(symbol, str) or not symbol:
+        return None
+    return channel, symbol
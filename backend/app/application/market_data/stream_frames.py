@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from typing import Any
+
+
+@dataclass(slots=True, frozen=True)
+class StreamFrame:
+    # One message encoded once and shared by every connection queue it is fanned out to.
+    payload: dict[str, Any]
+    text: str
+
+
+def encode_stream_frame(payload: dict[str, Any]) -> StreamFrame:
+    return StreamFrame(payload=payload, text=_dumps(payload))
+
+
+def _dumps(payload: dict[str, Any]) -> str:
+    # Same separators as Starlette's send_json, so pre-encoded frames match what it would send.
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
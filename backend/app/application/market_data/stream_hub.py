@@ -7,6 +7,9 @@ import logging
 import re
 from typing import Any
 
+from app.application.market_data.snapshot_state import SnapshotStateStore
+from app.application.market_data.stream_buffer import ConflatingStreamBuffer
+from app.application.market_data.stream_frames import encode_stream_frame
 from app.application.market_data.stream_policy import (
     SUPPORTED_STREAM_CHANNELS,
     delayed_latency_message,
@@ -24,13 +27,15 @@ _TOPIC_BY_CHANNEL = {
 
 logger = logging.getLogger(__name__)
 
+_SubscriberIndex = dict[tuple[str, str], tuple[ConflatingStreamBuffer, ...]]
+
 
 @dataclass(slots=True)
 class _ConnectionState:
     user_id: int
     symbols: set[str]
     channels: set[str]
-    queue: asyncio.Queue[dict[str, Any]]
+    queue: ConflatingStreamBuffer
 
 
 class StockMarketStreamHub:
@@ -47,17 +52,25 @@ class StockMarketStreamHub:
         default_channels: set[str] | None = None,
         realtime_enabled: bool = True,
         delay_minutes: int = 15,
+        snapshot_state: SnapshotStateStore | None = None,
+        max_updates_per_second: float = 0.0,
     ) -> None:
         self._event_subscriber = event_subscriber
+        self._snapshot_state = snapshot_state
         self._topic_registry = topic_registry
         self._instance_id = instance_id.strip() or "gateway"
         self._max_symbols = max_symbols_per_connection
         self._queue_size = max(64, queue_size)
+        self._max_updates_per_second = max(0.0, float(max_updates_per_second))
         self._lock = asyncio.Lock()
         self._runtime_lock = asyncio.Lock()
         self._registry_sync_lock = asyncio.Lock()
         self._connections: dict[str, _ConnectionState] = {}
         self._topic_ref_count: dict[str, int] = {}
+        # (channel, symbol) -> subscriber queues and all queues. Both are replaced wholesale under
+        # `_lock` and read without it, so bus dispatch never waits on subscription changes.
+        self._subscribers: _SubscriberIndex = {}
+        self._all_queues: tuple[ConflatingStreamBuffer, ...] = ()
         self._registry_refresh_seconds = max(5, registry_refresh_seconds)
         self._allowed_channels = _normalize_supported_channels(allowed_channels or SUPPORTED_STREAM_CHANNELS)
         configured_default_channels = default_channels if default_channels is not None else self._allowed_channels
@@ -87,6 +100,9 @@ class StockMarketStreamHub:
         async with self._lock:
             self._connections.clear()
             self._topic_ref_count.clear()
+            self._subscribers = {}
+            self._all_queues = ()
+        await self._sync_bus_topics()
         await self._sync_registry()
         await self._stop_runtime()
 
@@ -95,8 +111,11 @@ class StockMarketStreamHub:
         *,
         connection_id: str,
         user_id: int,
-    ) -> asyncio.Queue[dict[str, Any]]:
-        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=self._queue_size)
+    ) -> ConflatingStreamBuffer:
+        queue = ConflatingStreamBuffer(
+            max_ordered=self._queue_size,
+            max_updates_per_second=self._max_updates_per_second,
+        )
         state = _ConnectionState(
             user_id=user_id,
             symbols=set(),
@@ -106,6 +125,7 @@ class StockMarketStreamHub:
         should_start_runtime = False
         async with self._lock:
             self._connections[connection_id] = state
+            self._all_queues = (*self._all_queues, queue)
             should_start_runtime = len(self._connections) == 1
         if should_start_runtime:
             await self._ensure_runtime()
@@ -120,8 +140,16 @@ class StockMarketStreamHub:
                 return
             previous_topics = _build_topics(symbols=state.symbols, channels=state.channels)
             _decrease_topic_refs(self._topic_ref_count, previous_topics)
+            self._subscribers = _with_subscriber_changes(
+                self._subscribers,
+                queue=state.queue,
+                added=set(),
+                removed=_subscription_keys(symbols=state.symbols, channels=state.channels),
+            )
+            self._all_queues = tuple(queue for queue in self._all_queues if queue is not state.queue)
             has_connections = bool(self._connections)
 
+        await self._sync_bus_topics()
         await self._sync_registry()
         if not has_connections:
             self._set_delayed_state()
@@ -155,16 +183,25 @@ class StockMarketStreamHub:
                 raise ValueError("STREAM_CONNECTION_NOT_FOUND")
 
             old_topics = _build_topics(symbols=state.symbols, channels=state.channels)
+            old_keys = _subscription_keys(symbols=state.symbols, channels=state.channels)
             state.symbols = normalized_symbols
             state.channels = normalized_channels
             new_topics = _build_topics(symbols=state.symbols, channels=state.channels)
 
             _decrease_topic_refs(self._topic_ref_count, old_topics.difference(new_topics))
             _increase_topic_refs(self._topic_ref_count, new_topics.difference(old_topics))
+            new_keys = _subscription_keys(symbols=state.symbols, channels=state.channels)
+            self._subscribers = _with_subscriber_changes(
+                self._subscribers,
+                queue=state.queue,
+                added=new_keys.difference(old_keys),
+                removed=old_keys.difference(new_keys),
+            )
             remaining_topics = set(self._topic_ref_count.keys())
 
         if remaining_topics is not None:
             await self._ensure_runtime()
+            await self._sync_bus_topics()
             await self._sync_registry()
 
     async def _run_subscriber(self) -> None:
@@ -269,6 +306,15 @@ class StockMarketStreamHub:
             except Exception:
                 logger.exception("Failed to sync redis topic registry")
 
+    async def _sync_bus_topics(self) -> None:
+        # Lets a sharded bus subscriber follow `_topic_ref_count` instead of receiving every topic.
+        if self._event_subscriber is None:
+            return
+        try:
+            await self._event_subscriber.set_topics(await self._snapshot_topics())
+        except Exception:
+            logger.exception("Failed to update market stream bus subscriptions")
+
     async def _handle_bus_message(self, payload: dict[str, Any]) -> None:
         message_type = str(payload.get("type", "")).strip().lower()
         if message_type == "system.status":
@@ -282,6 +328,8 @@ class StockMarketStreamHub:
 
         if not message_type.startswith("market."):
             return
+        if self._snapshot_state is not None:
+            self._snapshot_state.apply_event(payload)
 
         channel = message_type.split(".", maxsplit=1)[1]
         if channel not in SUPPORTED_STREAM_CHANNELS or channel not in self._allowed_channels:
@@ -293,20 +341,20 @@ class StockMarketStreamHub:
         if not symbol:
             return
 
-        async with self._lock:
-            connections = list(self._connections.values())
-        for connection in connections:
-            if symbol not in connection.symbols:
-                continue
-            if channel not in connection.channels:
-                continue
-            _enqueue_payload(connection.queue, payload)
+        queues = self._subscribers.get((channel, symbol))
+        if not queues:
+            return
+        frame = encode_stream_frame(payload)
+        for queue in queues:
+            queue.put_nowait(frame)
 
     async def _broadcast(self, payload: dict[str, Any]) -> None:
-        async with self._lock:
-            queues = [connection.queue for connection in self._connections.values()]
+        queues = self._all_queues
+        if not queues:
+            return
+        frame = encode_stream_frame(payload)
         for queue in queues:
-            _enqueue_payload(queue, payload)
+            queue.put_nowait(frame)
 
     def _set_delayed_state(self) -> None:
         self._latency = "delayed"
@@ -413,6 +461,32 @@ def _build_topics(*, symbols: set[str], channels: set[str]) -> set[str]:
     return topics
 
 
+def _subscription_keys(*, symbols: set[str], channels: set[str]) -> set[tuple[str, str]]:
+    return {(channel, symbol) for channel in channels for symbol in symbols}
+
+
+def _with_subscriber_changes(
+    index: _SubscriberIndex,
+    *,
+    queue: ConflatingStreamBuffer,
+    added: set[tuple[str, str]],
+    removed: set[tuple[str, str]],
+) -> _SubscriberIndex:
+    # Copy-on-write: dispatch may be iterating the current index, so changes go into a new one.
+    if not added and not removed:
+        return index
+    updated = dict(index)
+    for key in removed:
+        remaining = tuple(item for item in updated.get(key, ()) if item is not queue)
+        if remaining:
+            updated[key] = remaining
+        else:
+            updated.pop(key, None)
+    for key in added:
+        updated[key] = (*updated.get(key, ()), queue)
+    return updated
+
+
 def _increase_topic_refs(refs: dict[str, int], topics: set[str]) -> None:
     for topic in topics:
         refs[topic] = refs.get(topic, 0) + 1
@@ -430,19 +504,3 @@ def _decrease_topic_refs(refs: dict[str, int], topics: set[str]) -> None:
 def _utc_now_iso() -> str:
     return datetime.now(tz=timezone.utc).isoformat().replace("+00:00", "Z")
 
-
-def _enqueue_payload(queue: asyncio.Queue[dict[str, Any]], payload: dict[str, Any]) -> None:
-    try:
-        queue.put_nowait(payload)
-        return
-    except asyncio.QueueFull:
-        pass
-
-    try:
-        queue.get_nowait()
-    except asyncio.QueueEmpty:
-        pass
-    try:
-        queue.put_nowait(payload)
-    except asyncio.QueueFull:
-        return
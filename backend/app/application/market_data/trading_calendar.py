@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
+import hashlib
+from itertools import accumulate
+import json
 import logging
 import threading
+from typing import Any
 import weakref
 from zoneinfo import ZoneInfo
 
@@ -13,10 +18,17 @@ import exchange_calendars as xcals
 from exchange_calendars.errors import DateOutOfBounds
 import pandas as pd
 
+from app.application.market_data.upstream_governor import UPSTREAM_PRIORITY_MAINTENANCE, upstream_priority
 from app.infrastructure.clients.massive import MassiveClient
+from app.infrastructure.coordination.redis_holiday_store import RedisHolidayOverrideStore
 
 MARKET_TIMEZONE = ZoneInfo("America/New_York")
 _HOLIDAY_CACHE_TTL = timedelta(minutes=15)
+# How often calendars backed by the shared store check its version stamp.
+_HOLIDAY_SYNC_INTERVAL = timedelta(seconds=30)
+# Shared overrides expire when nobody refreshes them, which sends calendars back to upstream.
+_SHARED_HOLIDAY_TTL_SECONDS = int(_HOLIDAY_CACHE_TTL.total_seconds()) * 2
+_HOLIDAY_REFRESH_LEASE_SECONDS = 60
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +41,49 @@ class _HolidayOverride:
     close_time: time | None
 
 
+@dataclass(slots=True, frozen=True)
+class _SessionTable:
+    # Sessions between the exchange calendar's first and last session, with holiday overrides applied.
+    first_day: date
+    last_day: date
+    ordinals: list[int]
+    opens: list[datetime]
+    closes: list[datetime]
+    # minute_prefix[i] is the session minutes of ordinals[:i].
+    minute_prefix: list[int]
+    # Overridden sessions shorter than a minute keep their bounds but are not trading days.
+    short_sessions: dict[int, tuple[datetime, datetime]]
+
+    def covers(self, target_date: date) -> bool:
+        return self.first_day <= target_date <= self.last_day
+
+    def bounds(self, target_date: date) -> tuple[datetime, datetime] | None:
+        ordinal = target_date.toordinal()
+        index = bisect_left(self.ordinals, ordinal)
+        if index < len(self.ordinals) and self.ordinals[index] == ordinal:
+            return self.opens[index], self.closes[index]
+        return self.short_sessions.get(ordinal)
+
+    def index_range(self, *, start_date: date, end_date: date) -> tuple[int, int]:
+        return (
+            bisect_left(self.ordinals, start_date.toordinal()),
+            bisect_right(self.ordinals, end_date.toordinal()),
+        )
+
+    def segments(self, *, start_date: date, end_date: date) -> Iterator[tuple[date, date, bool]]:
+        # Split [start_date, end_date] into pieces before, inside and after the table.
+        before_end = min(end_date, self.first_day - timedelta(days=1))
+        if start_date <= before_end:
+            yield start_date, before_end, False
+        inside_start = max(start_date, self.first_day)
+        inside_end = min(end_date, self.last_day)
+        if inside_start <= inside_end:
+            yield inside_start, inside_end, True
+        after_start = max(start_date, self.last_day + timedelta(days=1))
+        if after_start <= end_date:
+            yield after_start, end_date, False
+
+
 class TradingCalendar:
     def __init__(
         self,
@@ -36,20 +91,31 @@ class TradingCalendar:
         massive_client: MassiveClient | None,
         exchange: str = "XNYS",
         today_provider: Callable[[], date] | None = None,
+        holiday_store: RedisHolidayOverrideStore | None = None,
     ) -> None:
         self._massive_client = massive_client
+        self._holiday_store = holiday_store
         self._exchange_calendar = xcals.get_calendar(exchange)
         self._today_provider = today_provider or _market_today
         self._holiday_overrides: dict[date, _HolidayOverride] = {}
         self._holiday_cache_expire_at: datetime | None = None
+        self._holiday_version: str | None = None
+        self._upstream_attempted_at: datetime | None = None
         self._cache_state_lock = threading.Lock()
         self._refresh_tasks: weakref.WeakKeyDictionary[
             asyncio.AbstractEventLoop,
-            asyncio.Task[dict[date, _HolidayOverride]],
+            asyncio.Task[None],
+        ] = weakref.WeakKeyDictionary()
+        self._upstream_tasks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            asyncio.Task[bool],
         ] = weakref.WeakKeyDictionary()
+        self._base_sessions: tuple[list[int], list[datetime], list[datetime]] | None = None
+        # (holiday overrides, today, table); rebuilt when either input changes.
+        self._session_table: tuple[dict[date, _HolidayOverride], date, _SessionTable] | None = None
 
     async def ensure_holiday_cache(self) -> None:
-        if self._massive_client is None:
+        if self._massive_client is None and self._holiday_store is None:
             return
 
         now = datetime.now(tz=MARKET_TIMEZONE)
@@ -57,20 +123,36 @@ class TradingCalendar:
         with self._cache_state_lock:
             if self._holiday_cache_expire_at is not None and now < self._holiday_cache_expire_at:
                 return
+            warm = self._holiday_cache_expire_at is not None
             refresh_task = self._refresh_tasks.get(loop)
             if refresh_task is None or refresh_task.done():
-                refresh_task = loop.create_task(self._fetch_holiday_overrides())
+                refresh_task = loop.create_task(self._refresh_holiday_cache())
                 self._refresh_tasks[loop] = refresh_task
 
-        overrides = await refresh_task
+        if warm:
+            # Keep serving the current overrides while the refresh runs in the background.
+            return
+        # Cold start: wait for the shared store read, or for upstream when there is no store.
+        await asyncio.shield(refresh_task)
 
-        refreshed_now = datetime.now(tz=MARKET_TIMEZONE)
+    async def refresh_shared_holiday_overrides(self) -> bool:
+        # Fetch from upstream and publish to the shared store; the periodic refresher calls this.
         with self._cache_state_lock:
-            if self._refresh_tasks.get(loop) is refresh_task:
-                self._refresh_tasks.pop(loop, None)
-            if self._holiday_cache_expire_at is None or refreshed_now >= self._holiday_cache_expire_at:
-                self._holiday_overrides = overrides
-                self._holiday_cache_expire_at = refreshed_now + _HOLIDAY_CACHE_TTL
+            self._upstream_attempted_at = datetime.now(tz=MARKET_TIMEZONE)
+        overrides = await self._fetch_holiday_overrides()
+        if overrides is None:
+            return False
+
+        version = _holiday_overrides_version(overrides)
+        if self._holiday_store is not None:
+            await self._holiday_store.write(
+                version=version,
+                refreshed_at=datetime.now(tz=MARKET_TIMEZONE).timestamp(),
+                overrides=[_serialize_holiday_override(item) for item in overrides.values()],
+                ttl_seconds=_SHARED_HOLIDAY_TTL_SECONDS,
+            )
+        self._apply_holiday_overrides(overrides=overrides, version=version, valid_for=self._holiday_sync_interval())
+        return True
 
     def is_trading_day(self, *, target_date: date) -> bool:
         return self.session_minutes(target_date=target_date) > 0
@@ -84,33 +166,21 @@ class TradingCalendar:
         return opened_at <= market_point < closed_at
 
     def session_bounds(self, *, target_date: date) -> tuple[datetime, datetime] | None:
-        base_bounds = self._base_session_bounds(target_date=target_date)
-        if base_bounds is None:
-            return None
-
-        if target_date < self._today_provider():
-            return base_bounds
-
-        override = self._holiday_override(target_date=target_date)
-        if override is None:
-            return base_bounds
-        if override.closed:
-            return None
-        if override.open_time is None or override.close_time is None:
-            return base_bounds
-
-        opened_at = datetime.combine(target_date, override.open_time, tzinfo=MARKET_TIMEZONE)
-        closed_at = datetime.combine(target_date, override.close_time, tzinfo=MARKET_TIMEZONE)
-        if closed_at <= opened_at:
-            return None
-        return opened_at, closed_at
+        table = self._sessions()
+        if table.covers(target_date):
+            return table.bounds(target_date)
+        return self._resolve_session_bounds(
+            target_date=target_date,
+            overrides=self._holiday_overrides,
+            today=self._today_provider(),
+        )
 
     def session_minutes(self, *, target_date: date) -> int:
         session_bounds = self.session_bounds(target_date=target_date)
         if session_bounds is None:
             return 0
         opened_at, closed_at = session_bounds
-        return max(0, int((closed_at - opened_at).total_seconds() // 60))
+        return _session_length_minutes(opened_at, closed_at)
 
     def count_trading_days(
         self,
@@ -122,14 +192,25 @@ class TradingCalendar:
         if end_date < start_date:
             return 0
 
+        table = self._sessions()
+        # A capped count stops at the first trading day past the cap.
+        cap_result = None if max_count is None else max(1, max_count + 1)
         count = 0
-        cursor = start_date
-        while cursor <= end_date:
-            if self.is_trading_day(target_date=cursor):
-                count += 1
-                if max_count is not None and count > max_count:
-                    return count
-            cursor += timedelta(days=1)
+        for segment_start, segment_end, covered in table.segments(start_date=start_date, end_date=end_date):
+            if covered:
+                low, high = table.index_range(start_date=segment_start, end_date=segment_end)
+                count += high - low
+                if cap_result is not None and count >= cap_result:
+                    return cap_result
+                continue
+
+            cursor = segment_start
+            while cursor <= segment_end:
+                if self.is_trading_day(target_date=cursor):
+                    count += 1
+                    if max_count is not None and count > max_count:
+                        return count
+                cursor += timedelta(days=1)
         return count
 
     def count_session_minutes(
@@ -141,19 +222,41 @@ class TradingCalendar:
     ) -> int:
         if end_date < start_date:
             return 0
+        if max_minutes is not None and max_minutes < 0:
+            return self.session_minutes(target_date=start_date)
 
+        table = self._sessions()
+        prefix = table.minute_prefix
         total_minutes = 0
-        cursor = start_date
-        while cursor <= end_date:
-            total_minutes += self.session_minutes(target_date=cursor)
-            if max_minutes is not None and total_minutes > max_minutes:
-                return total_minutes
-            cursor += timedelta(days=1)
+        for segment_start, segment_end, covered in table.segments(start_date=start_date, end_date=end_date):
+            if covered:
+                low, high = table.index_range(start_date=segment_start, end_date=segment_end)
+                segment_minutes = prefix[high] - prefix[low]
+                if max_minutes is not None and total_minutes + segment_minutes > max_minutes:
+                    # Stop at the first session that pushes the total past the cap.
+                    stop = bisect_right(prefix, max_minutes - total_minutes + prefix[low], low + 1, high + 1)
+                    return total_minutes + prefix[stop] - prefix[low]
+                total_minutes += segment_minutes
+                continue
+
+            cursor = segment_start
+            while cursor <= segment_end:
+                total_minutes += self.session_minutes(target_date=cursor)
+                if max_minutes is not None and total_minutes > max_minutes:
+                    return total_minutes
+                cursor += timedelta(days=1)
         return total_minutes
 
     def align_on_or_before(self, *, target_date: date) -> date:
+        table = self._sessions()
         cursor = target_date
         while True:
+            if table.covers(cursor):
+                index = bisect_right(table.ordinals, cursor.toordinal()) - 1
+                if index >= 0:
+                    return date.fromordinal(table.ordinals[index])
+                cursor = table.first_day - timedelta(days=1)
+                continue
             if self.is_trading_day(target_date=cursor):
                 return cursor
             cursor -= timedelta(days=1)
@@ -163,12 +266,30 @@ class TradingCalendar:
         if trading_days == 0:
             return cursor
 
-        step = 1 if trading_days > 0 else -1
+        table = self._sessions()
+        step = timedelta(days=1 if trading_days > 0 else -1)
         remaining = abs(trading_days)
         while remaining > 0:
-            cursor += timedelta(days=step)
-            if self.is_trading_day(target_date=cursor):
-                remaining -= 1
+            if not table.covers(cursor + step):
+                cursor += step
+                if self.is_trading_day(target_date=cursor):
+                    remaining -= 1
+                continue
+
+            ordinal = cursor.toordinal()
+            if trading_days > 0:
+                index = bisect_right(table.ordinals, ordinal)
+                available = len(table.ordinals) - index
+                if remaining <= available:
+                    return date.fromordinal(table.ordinals[index + remaining - 1])
+                cursor = table.last_day
+            else:
+                index = bisect_left(table.ordinals, ordinal)
+                available = index
+                if remaining <= available:
+                    return date.fromordinal(table.ordinals[index - remaining])
+                cursor = table.first_day
+            remaining -= available
         return cursor
 
     def list_recent_trading_days(self, *, end_date: date, count: int) -> list[date]:
@@ -183,6 +304,100 @@ class TradingCalendar:
         result.reverse()
         return result
 
+    def _sessions(self) -> _SessionTable:
+        overrides = self._holiday_overrides
+        today = self._today_provider()
+        cached = self._session_table
+        if cached is not None and cached[0] is overrides and cached[1] == today:
+            return cached[2]
+
+        with self._cache_state_lock:
+            cached = self._session_table
+            if cached is not None and cached[0] is overrides and cached[1] == today:
+                return cached[2]
+            table = self._build_session_table(overrides=overrides, today=today)
+            self._session_table = (overrides, today, table)
+            return table
+
+    def _build_session_table(self, *, overrides: dict[date, _HolidayOverride], today: date) -> _SessionTable:
+        if self._base_sessions is None:
+            sessions = self._exchange_calendar.sessions
+            self._base_sessions = (
+                [session.date().toordinal() for session in sessions],
+                [_to_market_datetime(value) for value in self._exchange_calendar.opens.dt.to_pydatetime()],
+                [_to_market_datetime(value) for value in self._exchange_calendar.closes.dt.to_pydatetime()],
+            )
+        base_ordinals, base_opens, base_closes = self._base_sessions
+        first_day = self._exchange_calendar.first_session.date()
+        last_day = self._exchange_calendar.last_session.date()
+
+        # Only sessions on or after today can be overridden, so the base table is patched in place.
+        replaced: dict[int, tuple[datetime, datetime] | None] = {}
+        for trade_date in overrides:
+            if trade_date < today or not first_day <= trade_date <= last_day:
+                continue
+            ordinal = trade_date.toordinal()
+            index = bisect_left(base_ordinals, ordinal)
+            if index >= len(base_ordinals) or base_ordinals[index] != ordinal:
+                continue
+            replaced[ordinal] = self._resolve_session_bounds(target_date=trade_date, overrides=overrides, today=today)
+
+        ordinals, opens, closes = base_ordinals, base_opens, base_closes
+        short_sessions: dict[int, tuple[datetime, datetime]] = {}
+        if replaced:
+            ordinals, opens, closes = [], [], []
+            for ordinal, opened_at, closed_at in zip(base_ordinals, base_opens, base_closes):
+                if ordinal in replaced:
+                    bounds = replaced[ordinal]
+                    if bounds is None:
+                        continue
+                    opened_at, closed_at = bounds
+                    if _session_length_minutes(opened_at, closed_at) <= 0:
+                        short_sessions[ordinal] = bounds
+                        continue
+                ordinals.append(ordinal)
+                opens.append(opened_at)
+                closes.append(closed_at)
+
+        minutes = (_session_length_minutes(opened_at, closed_at) for opened_at, closed_at in zip(opens, closes))
+        return _SessionTable(
+            first_day=first_day,
+            last_day=last_day,
+            ordinals=ordinals,
+            opens=opens,
+            closes=closes,
+            minute_prefix=list(accumulate(minutes, initial=0)),
+            short_sessions=short_sessions,
+        )
+
+    def _resolve_session_bounds(
+        self,
+        *,
+        target_date: date,
+        overrides: dict[date, _HolidayOverride],
+        today: date,
+    ) -> tuple[datetime, datetime] | None:
+        base_bounds = self._base_session_bounds(target_date=target_date)
+        if base_bounds is None:
+            return None
+
+        if target_date < today:
+            return base_bounds
+
+        override = overrides.get(target_date)
+        if override is None:
+            return base_bounds
+        if override.closed:
+            return None
+        if override.open_time is None or override.close_time is None:
+            return base_bounds
+
+        opened_at = datetime.combine(target_date, override.open_time, tzinfo=MARKET_TIMEZONE)
+        closed_at = datetime.combine(target_date, override.close_time, tzinfo=MARKET_TIMEZONE)
+        if closed_at <= opened_at:
+            return None
+        return opened_at, closed_at
+
     def _base_session_bounds(self, *, target_date: date) -> tuple[datetime, datetime] | None:
         session = pd.Timestamp(target_date.isoformat())
         try:
@@ -198,18 +413,88 @@ class TradingCalendar:
             closed_at = datetime.combine(target_date, time(hour=16, minute=0), tzinfo=MARKET_TIMEZONE)
             return opened_at, closed_at
 
-    def _holiday_override(self, *, target_date: date) -> _HolidayOverride | None:
-        return self._holiday_overrides.get(target_date)
+    async def _refresh_holiday_cache(self) -> None:
+        if self._holiday_store is None:
+            overrides = await self._fetch_holiday_overrides()
+            self._apply_holiday_overrides(overrides=overrides or {}, version=None, valid_for=_HOLIDAY_CACHE_TTL)
+            return
+
+        if await self._sync_from_holiday_store():
+            return
+        # The shared store is empty or unreachable: keep the current overrides and let one
+        # process refresh from upstream in the background.
+        self._apply_holiday_overrides(overrides=None, version=None, valid_for=_HOLIDAY_SYNC_INTERVAL)
+        self._schedule_upstream_holiday_refresh()
+
+    async def _sync_from_holiday_store(self) -> bool:
+        store = self._holiday_store
+        if store is None:
+            return False
+        version = await store.read_version()
+        if version is None:
+            return False
+        if version == self._holiday_version:
+            self._apply_holiday_overrides(overrides=None, version=version, valid_for=_HOLIDAY_SYNC_INTERVAL)
+            return True
+
+        payload = await store.read()
+        if payload is None:
+            return False
+        overrides = _deserialize_holiday_overrides(payload.get("overrides"))
+        self._apply_holiday_overrides(
+            overrides=overrides,
+            version=str(payload.get("version") or version),
+            valid_for=_HOLIDAY_SYNC_INTERVAL,
+        )
+        return True
+
+    def _schedule_upstream_holiday_refresh(self) -> None:
+        if self._massive_client is None:
+            return
+        now = datetime.now(tz=MARKET_TIMEZONE)
+        loop = asyncio.get_running_loop()
+        with self._cache_state_lock:
+            if self._upstream_attempted_at is not None and now - self._upstream_attempted_at < _HOLIDAY_CACHE_TTL:
+                return
+            task = self._upstream_tasks.get(loop)
+            if task is None or task.done():
+                self._upstream_tasks[loop] = loop.create_task(self._refresh_from_upstream_with_lease())
+
+    async def _refresh_from_upstream_with_lease(self) -> bool:
+        store = self._holiday_store
+        if store is not None:
+            acquired = await store.try_acquire_refresh_lease(ttl_seconds=_HOLIDAY_REFRESH_LEASE_SECONDS)
+            if not acquired:
+                # Another process is refreshing; the next version sync picks up its result.
+                return False
+        return await self.refresh_shared_holiday_overrides()
+
+    def _apply_holiday_overrides(
+        self,
+        *,
+        overrides: dict[date, _HolidayOverride] | None,
+        version: str | None,
+        valid_for: timedelta,
+    ) -> None:
+        with self._cache_state_lock:
+            if overrides is not None and (version is None or version != self._holiday_version):
+                self._holiday_overrides = overrides
+                self._holiday_version = version
+            self._holiday_cache_expire_at = datetime.now(tz=MARKET_TIMEZONE) + valid_for
+
+    def _holiday_sync_interval(self) -> timedelta:
+        return _HOLIDAY_SYNC_INTERVAL if self._holiday_store is not None else _HOLIDAY_CACHE_TTL
 
-    async def _fetch_holiday_overrides(self) -> dict[date, _HolidayOverride]:
+    async def _fetch_holiday_overrides(self) -> dict[date, _HolidayOverride] | None:
         if self._massive_client is None:
-            return {}
+            return None
 
         try:
-            raw_holidays = await self._massive_client.list_market_holidays()
+            with upstream_priority(UPSTREAM_PRIORITY_MAINTENANCE):
+                raw_holidays = await self._massive_client.list_market_holidays()
         except Exception:
             logger.exception("Failed to fetch market holiday overrides from Massive")
-            return {}
+            return None
 
         overrides: dict[date, _HolidayOverride] = {}
         for raw in raw_holidays:
@@ -248,6 +533,40 @@ def _parse_holiday_override(raw: object) -> _HolidayOverride | None:
     )
 
 
+def _serialize_holiday_override(override: _HolidayOverride) -> dict[str, Any]:
+    return {
+        "date": override.trade_date.isoformat(),
+        "closed": override.closed,
+        "open": override.open_time.isoformat() if override.open_time is not None else None,
+        "close": override.close_time.isoformat() if override.close_time is not None else None,
+    }
+
+
+def _deserialize_holiday_overrides(raw: object) -> dict[date, _HolidayOverride]:
+    overrides: dict[date, _HolidayOverride] = {}
+    if not isinstance(raw, list):
+        return overrides
+    for item in raw:
+        if not isinstance(item, dict):
+            continue
+        trade_date = _parse_date(_extract_value(item, "date"))
+        if trade_date is None:
+            continue
+        overrides[trade_date] = _HolidayOverride(
+            trade_date=trade_date,
+            closed=item.get("closed") is True,
+            open_time=_parse_time(_extract_value(item, "open")),
+            close_time=_parse_time(_extract_value(item, "close")),
+        )
+    return overrides
+
+
+def _holiday_overrides_version(overrides: dict[date, _HolidayOverride]) -> str:
+    serialized = [_serialize_holiday_override(overrides[trade_date]) for trade_date in sorted(overrides)]
+    encoded = json.dumps(serialized, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
 def _extract_value(raw: object, key: str) -> str:
     if isinstance(raw, dict):
         value = raw.get(key)
@@ -276,6 +595,10 @@ def _parse_time(raw: str) -> time | None:
         return None
 
 
+def _session_length_minutes(opened_at: datetime, closed_at: datetime) -> int:
+    return max(0, int((closed_at - opened_at).total_seconds() // 60))
+
+
 def _market_today() -> date:
     return datetime.now(tz=MARKET_TIMEZONE).date()
 
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Any
+import weakref
+
+from app.application.market_data.errors import MarketDataRateLimitedError
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_PRIORITY_INTERACTIVE = "interactive"
+UPSTREAM_PRIORITY_PREFETCH = "prefetch"
+UPSTREAM_PRIORITY_MAINTENANCE = "maintenance"
+_PRIORITY_RANKS = {
+    UPSTREAM_PRIORITY_INTERACTIVE: 0,
+    UPSTREAM_PRIORITY_PREFETCH: 1,
+    UPSTREAM_PRIORITY_MAINTENANCE: 2,
+}
+_DEFAULT_MAX_WAIT_SECONDS = {
+    UPSTREAM_PRIORITY_INTERACTIVE: 5.0,
+    UPSTREAM_PRIORITY_PREFETCH: 30.0,
+    UPSTREAM_PRIORITY_MAINTENANCE: 60.0,
+}
+
+_current_priority: ContextVar[str] = ContextVar(
+    "market_data_upstream_priority",
+    default=UPSTREAM_PRIORITY_INTERACTIVE,
+)
+
+
+@contextmanager
+def upstream_priority(priority: str) -> Iterator[None]:
+    # Upstream calls made inside the block (including tasks spawned from it) queue at `priority`.
+    token = _current_priority.set(_normalize_priority(priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_upstream_priority() -> str:
+    return _current_priority.get()
+
+
+@dataclass(slots=True, frozen=True)
+class UpstreamQueueStats:
+    priority: str
+    granted: int
+    timed_out: int
+    waiting: int
+    total_wait_seconds: float
+    max_wait_seconds: float
+
+    @property
+    def average_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.granted if self.granted else 0.0
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        *,
+        rate_per_second: float,
+        burst: int,
+        time_provider: Callable[[], float] | None = None,
+    ) -> None:
+        self._rate = max(0.001, float(rate_per_second))
+        self._burst = max(1, int(burst))
+        self._time_provider = time_provider or time.monotonic
+        self._tokens = float(self._burst)
+        self._updated_at = self._time_provider()
+        self._lock = threading.Lock()
+
+    async def try_acquire(self, *, reserve: float = 0.0) -> float:
+        # Returns 0 when a token was taken, otherwise the seconds until one is available
+        # while keeping `reserve` tokens untouched.
+        with self._lock:
+            now = self._time_provider()
+            self._tokens = min(self._burst, self._tokens + max(0.0, now - self._updated_at) * self._rate)
+            self._updated_at = now
+            needed = 1.0 + max(0.0, reserve)
+            if self._tokens >= needed:
+                self._tokens -= 1.0
+                return 0.0
+            return (needed - self._tokens) / self._rate
+
+
+@dataclass(slots=True)
+class _PriorityCounters:
+    granted: int = 0
+    timed_out: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+@dataclass(slots=True)
+class _LoopQueue:
+    waiters: list[tuple[int, int, asyncio.Future[None]]] = field(default_factory=list)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    dispatcher: asyncio.Task[None] | None = None
+
+
+class UpstreamRateGovernor:
+    def __init__(
+        self,
+        *,
+        budget: Any,
+        interactive_reserve: float = 0.0,
+        max_wait_seconds: dict[str, float] | None = None,
+        time_provider: Callable[[], float] | None = None,
+    ) -> None:
+        self._budget = budget
+        self._interactive_reserve = max(0.0, float(interactive_reserve))
+        self._max_wait_seconds = {**_DEFAULT_MAX_WAIT_SECONDS, **(max_wait_seconds or {})}
+        self._time_provider = time_provider or time.monotonic
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        # Queues and their dispatcher tasks are bound to one loop; counters are shared.
+        self._queues: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopQueue] = weakref.WeakKeyDictionary()
+        self._counters = {priority: _PriorityCounters() for priority in _PRIORITY_RANKS}
+
+    @asynccontextmanager
+    async def slot(self, *, priority: str | None = None, deadline: float | None = None) -> AsyncIterator[None]:
+        await self.acquire(priority=priority, deadline=deadline)
+        yield
+
+    async def acquire(self, *, priority: str | None = None, deadline: float | None = None) -> None:
+        resolved = _normalize_priority(priority) if priority is not None else current_upstream_priority()
+        rank = _PRIORITY_RANKS[resolved]
+        started_at = self._time_provider()
+        if deadline is None:
+            deadline = started_at + self._max_wait_seconds[resolved]
+
+        queue = self._loop_queue()
+        if not queue.waiters and await self._budget.try_acquire(reserve=self._reserve_for(rank)) <= 0:
+            self._record_grant(resolved, waited=0.0)
+            return
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        if queue.waiters and rank < queue.waiters[0][0]:
+            queue.wakeup.set()
+        heapq.heappush(queue.waiters, (rank, next(self._sequence), future))
+        if queue.dispatcher is None or queue.dispatcher.done():
+            queue.dispatcher = loop.create_task(self._dispatch(queue))
+
+        try:
+            await asyncio.wait_for(future, timeout=max(0.0, deadline - self._time_provider()))
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._counters[resolved].timed_out += 1
+            raise MarketDataRateLimitedError() from None
+        self._record_grant(resolved, waited=self._time_provider() - started_at)
+
+    def stats(self) -> dict[str, UpstreamQueueStats]:
+        with self._lock:
+            waiting = {priority: 0 for priority in _PRIORITY_RANKS}
+            ranks = {rank: priority for priority, rank in _PRIORITY_RANKS.items()}
+            for queue in self._queues.values():
+                for rank, _, future in queue.waiters:
+                    if not future.done():
+                        waiting[ranks[rank]] += 1
+            return {
+                priority: UpstreamQueueStats(
+                    priority=priority,
+                    granted=counters.granted,
+                    timed_out=counters.timed_out,
+                    waiting=waiting[priority],
+                    total_wait_seconds=counters.total_wait_seconds,
+                    max_wait_seconds=counters.max_wait_seconds,
+                )
+                for priority, counters in self._counters.items()
+            }
+
+    async def _dispatch(self, queue: _LoopQueue) -> None:
+        try:
+            while True:
+                _drop_abandoned(queue.waiters)
+                if not queue.waiters:
+                    return
+                queue.wakeup.clear()
+                wait_seconds = await self._budget.try_acquire(reserve=self._reserve_for(queue.waiters[0][0]))
+                if wait_seconds > 0:
+                    # Wake early when a higher-priority caller queues behind the reserve.
+                    try:
+                        await asyncio.wait_for(queue.wakeup.wait(), timeout=wait_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                _drop_abandoned(queue.waiters)
+                if queue.waiters:
+                    _, _, future = heapq.heappop(queue.waiters)
+                    future.set_result(None)
+        except Exception as exc:
+            logger.exception("Upstream rate governor dispatcher failed")
+            while queue.waiters:
+                _, _, future = heapq.heappop(queue.waiters)
+                if not future.done():
+                    future.set_exception(exc)
+
+    def _reserve_for(self, rank: int) -> float:
+        return 0.0 if rank == _PRIORITY_RANKS[UPSTREAM_PRIORITY_INTERACTIVE] else self._interactive_reserve
+
+    def _loop_queue(self) -> _LoopQueue:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            queue = self._queues.get(loop)
+            if queue is None:
+                queue = _LoopQueue()
+                self._queues[loop] = queue
+            return queue
+
+    def _record_grant(self, priority: str, *, waited: float) -> None:
+        with self._lock:
+            counters = self._counters[priority]
+            counters.granted += 1
+            counters.total_wait_seconds += waited
+            counters.max_wait_seconds = max(counters.max_wait_seconds, waited)
+
+
+class GovernedMassiveClient:
+    # Massive REST client facade; every call first takes a slot from the rate governor.
+    def __init__(self, *, client: Any, governor: UpstreamRateGovernor) -> None:
+        self._client = client
+        self._governor = governor
+
+    async def list_aggs(self, **kwargs: Any) -> list[Any]:
+        async with self._governor.slot():
+            return await self._client.list_aggs(**kwargs)
+
+    async def list_snapshots(self, *, tickers: list[str]) -> list[dict[str, Any]]:
+        async with self._governor.slot():
+            return await self._client.list_snapshots(tickers=tickers)
+
+    async def list_market_holidays(self) -> list[dict[str, Any]]:
+        async with self._governor.slot():
+            return await self._client.list_market_holidays()
+
+    async def get_market_status(self) -> dict[str, Any]:
+        async with self._governor.slot():
+            return await self._client.get_market_status()
+
+    async def aclose(self) -> None:
+        close = getattr(self._client, "aclose", None)
+        if close is not None:
+            await close()
+
+
+def _drop_abandoned(waiters: list[tuple[int, int, asyncio.Future[None]]]) -> None:
+    while waiters and waiters[0][2].done():
+        heapq.heappop(waiters)
+
+
+def _normalize_priority(priority: str) -> str:
+    normalized = priority.strip().lower()
+    if normalized not in _PRIORITY_RANKS:
+        raise ValueError("priority must be one of: interactive, prefetch, maintenance")
+    return normalized
@@ -21,17 +21,13 @@ celery_app.conf.update(
             "task": "app.tasks.scan.scan_iv",
             "schedule": 15 * 60,
         },
-        "aggregate-minute-bars-5m-every-minute": {
-            "task": "app.tasks.market_data.aggregate_minute_bars_5m",
+        "aggregate-minute-bars-every-minute": {
+            "task": "app.tasks.market_data.aggregate_minute_bars",
             "schedule": 60,
         },
-        "aggregate-minute-bars-15m-every-minute": {
-            "task": "app.tasks.market_data.aggregate_minute_bars_15m",
-            "schedule": 60,
-        },
-        "aggregate-minute-bars-60m-every-minute": {
-            "task": "app.tasks.market_data.aggregate_minute_bars_60m",
-            "schedule": 60,
+        "refresh-market-holidays-every-15-minutes": {
+            "task": "app.tasks.market_data.refresh_market_holidays",
+            "schedule": 15 * 60,
         },
         "prune-minute-bars-retention-hourly": {
             "task": "app.tasks.market_data.prune_minute_bars_retention",
@@ -19,18 +19,71 @@ class Settings(BaseSettings):
         default=None,
         validation_alias=AliasChoices("MASSIVE_API_KEY", "POLYGON_API_KEY"),
     )
+    # "sdk" runs the official SDK on worker threads; "http" uses the pooled async HTTP client.
+    massive_rest_backend: str = "sdk"
+    massive_rest_base_url: str = "https://api.massive.com"
+    massive_http_max_connections: int = 20
+    massive_http_max_keepalive_connections: int = 10
+    massive_http_keepalive_expiry_seconds: float = 30.0
+    massive_http_max_concurrency_per_host: int = 8
+    massive_http_timeout_seconds: float = 10.0
     market_data_daily_lookback_days: int = 730
     market_data_intraday_lookback_days: int = 5
     market_data_minute_finalize_delay_minutes: int = 5
     market_data_day_finalize_trade_days: int = 1
     market_data_enable_direct_fallback: bool = True
     market_data_minute_retention_trade_days: int = 10
+    # In-process cache of finalized bar segments, bounded by packed row bytes; 0 disables it.
+    market_data_final_bar_cache_max_bytes: int = 64 * 1024 * 1024
+    # Other processes' writes reach the cache through per-date generations in Redis, synced at this interval.
+    market_data_final_bar_generations_enabled: bool = True
+    market_data_final_bar_generations_prefix: str = "market:bars:final-generation"
+    market_data_final_bar_generations_sync_seconds: float = 1.0
+    market_data_minute_bucket_cache_max_entries: int = 2048
+    # Encoded /bars responses shared through Redis: finalized ranges live long, the mutable tail briefly.
+    market_data_bars_response_cache_enabled: bool = True
+    market_data_bars_response_cache_prefix: str = "market:bars:response"
+    market_data_bars_response_cache_final_ttl_seconds: int = 6 * 60 * 60
+    market_data_bars_response_cache_tail_ttl_seconds: int = 5
+    # Serve cached bars right away and refresh stale trade dates in the background when the cache
+    # holds at least this share of the expected bars.
+    market_data_bars_stale_while_revalidate: bool = False
+    market_data_bars_swr_min_completeness: float = 0.9
+    market_data_minute_agg_multipliers: list[int] = [5, 15, 60]
+    market_data_fetch_lease_enabled: bool = True
+    market_data_fetch_lease_prefix: str = "market:bars:fetch-lease"
+    market_data_fetch_lease_ttl_seconds: int = 30
+    market_data_fetch_lease_wait_seconds: int = 20
+    market_data_upstream_max_concurrency: int = 8
+    market_data_upstream_max_concurrency_per_request: int = 4
+    market_data_upstream_governor_enabled: bool = True
+    market_data_upstream_rate_per_second: float = 5.0
+    market_data_upstream_burst: int = 10
+    # Tokens that prefetch and maintenance calls must leave for interactive requests.
+    market_data_upstream_interactive_reserve: int = 2
+    market_data_upstream_interactive_max_wait_seconds: float = 5.0
+    market_data_upstream_prefetch_max_wait_seconds: float = 30.0
+    market_data_upstream_maintenance_max_wait_seconds: float = 60.0
+    market_data_upstream_shared_budget_enabled: bool = True
+    market_data_upstream_budget_key: str = "market:massive:rate-budget"
+    # Snapshot demands within the window share one upstream call; results are reused for the TTL.
+    market_data_snapshot_coalesce_enabled: bool = True
+    market_data_snapshot_coalesce_window_ms: int = 25
+    market_data_snapshot_coalesce_ttl_seconds: float = 1.0
+    market_data_snapshot_coalesce_max_batch: int = 250
+    market_data_snapshot_live_state_enabled: bool = True
+    market_data_snapshot_live_state_max_age_seconds: float = 15.0
+    market_calendar_shared_holidays_enabled: bool = True
+    market_calendar_holiday_key_prefix: str = "market:calendar:holidays"
     market_stream_max_symbols_per_connection: int = 100
     market_stream_queue_size: int = 512
+    market_stream_max_updates_per_second_per_symbol: float = 0.0
     market_stream_ping_interval_seconds: int = 20
     market_stream_ping_timeout_seconds: int = 10
     market_stream_ping_max_misses: int = 2
     market_stream_redis_channel: str = "market:stocks:events"
+    market_stream_redis_sharded: bool = True
+    market_stream_publish_batch_size: int = 200
     market_stream_registry_prefix: str = "market:stocks:subs"
     market_stream_registry_ttl_seconds: int = 30
     market_stream_registry_refresh_seconds: int = 10
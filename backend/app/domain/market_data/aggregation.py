@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from collections.abc import Callable
 from datetime import date, datetime, time, timedelta, timezone
 from zoneinfo import ZoneInfo
 
@@ -9,6 +10,8 @@ from app.domain.market_data.schemas import MarketBar
 MARKET_TIMEZONE = ZoneInfo("America/New_York")
 MARKET_OPEN_TIME = time(9, 30)
 MARKET_CLOSE_TIME = time(16, 0)
+# Monday used to align multi-week buckets so they do not shift with the requested range.
+_WEEK_ANCHOR = date(1970, 1, 5)
 
 
 def market_trade_date(*, point: datetime) -> date:
@@ -44,6 +47,58 @@ def is_bucket_final(*, bucket_end: datetime, now: datetime) -> bool:
     return _to_utc(bucket_end) <= _to_utc(now)
 
 
+def resolve_period_bounds(*, trade_date: date, timespan: str, multiplier: int) -> tuple[date, date]:
+    if multiplier < 1:
+        raise ValueError("Multiplier must be >= 1")
+
+    if timespan == "week":
+        week_index = (trade_date - _WEEK_ANCHOR).days // 7
+        period_start = _WEEK_ANCHOR + timedelta(weeks=(week_index // multiplier) * multiplier)
+        return period_start, period_start + timedelta(weeks=multiplier, days=-1)
+    if timespan == "month":
+        month_index = ((trade_date.year * 12 + trade_date.month - 1) // multiplier) * multiplier
+        next_index = month_index + multiplier
+        period_start = date(month_index // 12, month_index % 12 + 1, 1)
+        period_end = date(next_index // 12, next_index % 12 + 1, 1) - timedelta(days=1)
+        return period_start, period_end
+    raise ValueError("Timespan must be week or month")
+
+
+def aggregate_day_bars(
+    *,
+    ticker: str,
+    timespan: str,
+    multiplier: int,
+    bars: list[MarketBar],
+    period_bounds: Callable[[date], tuple[date, date]],
+    today: date,
+    source: str,
+) -> list[MarketBar]:
+    grouped: dict[tuple[date, date], list[MarketBar]] = defaultdict(list)
+    for bar in bars:
+        grouped[period_bounds(_to_utc(bar.start_at).date())].append(bar)
+
+    aggregated: list[MarketBar] = []
+    for (period_start, period_end), grouped_bars in grouped.items():
+        # A period is final once it is over and every session in it has been confirmed.
+        final = period_end < today and all(bar.is_final is True for bar in grouped_bars)
+        item = aggregate_bucket(
+            ticker=ticker,
+            multiplier=multiplier,
+            bars=grouped_bars,
+            bucket_start=datetime.combine(period_start, time.min, tzinfo=timezone.utc),
+            bucket_end=datetime.combine(period_end + timedelta(days=1), time.min, tzinfo=timezone.utc),
+            source=source,
+            is_final=final,
+            timespan=timespan,
+        )
+        if item is not None:
+            aggregated.append(item)
+
+    aggregated.sort(key=lambda bar: bar.start_at)
+    return aggregated
+
+
 def aggregate_bucket(
     *,
     ticker: str,
@@ -53,6 +108,7 @@ def aggregate_bucket(
     bucket_end: datetime,
     source: str,
     is_final: bool,
+    timespan: str = "minute",
 ) -> MarketBar | None:
     if not bars:
         return None
@@ -74,7 +130,7 @@ def aggregate_bucket(
 
     return MarketBar(
         ticker=ticker,
-        timespan="minute",
+        timespan=timespan,
         multiplier=multiplier,
         start_at=_to_utc(bucket_start),
         end_at=_to_utc(bucket_end),
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+
+import numpy as np
+
+from app.domain.market_data.aggregation import MARKET_CLOSE_TIME, MARKET_OPEN_TIME, MARKET_TIMEZONE
+from app.domain.market_data.schemas import MarketBar
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_MINUTE_US = 60_000_000
+
+
+def aggregate_minute_bars_columnar(
+    *,
+    ticker: str,
+    multiplier: int,
+    bars: list[MarketBar],
+    source: str,
+    now: datetime,
+    include_unfinished: bool,
+) -> list[MarketBar]:
+    # Same output as aggregation.aggregate_minute_bars, computed over columns instead of per bar.
+    if not bars:
+        return []
+    if multiplier < 1:
+        raise ValueError("Multiplier must be >= 1")
+
+    starts = np.fromiter((_epoch_us(bar.start_at) for bar in bars), dtype=np.int64, count=len(bars))
+    order = np.argsort(starts, kind="stable")
+    starts = starts[order]
+
+    session_opens, session_closes = _session_bounds_us(starts)
+    clamped = np.clip(starts, session_opens, session_closes - 1)
+    bucket_index = (clamped - session_opens) // _MINUTE_US // multiplier
+    bucket_starts = session_opens + bucket_index * multiplier * _MINUTE_US
+    bucket_ends = np.minimum(bucket_starts + multiplier * _MINUTE_US, session_closes)
+
+    # Buckets are monotonic in time, so sorted bars form one contiguous run per bucket.
+    group_starts = np.flatnonzero(np.r_[True, bucket_starts[1:] != bucket_starts[:-1]])
+    group_lengths = np.diff(np.r_[group_starts, len(starts)])
+    group_ends = group_starts + group_lengths - 1
+    final = bucket_ends[group_starts] <= _epoch_us(now)
+    if not include_unfinished and not final.any():
+        return []
+
+    ordered_bars = [bars[index] for index in order.tolist()]
+    count = len(ordered_bars)
+    opens = np.fromiter((bar.open for bar in ordered_bars), dtype=np.float64, count=count)
+    highs = np.fromiter((bar.high for bar in ordered_bars), dtype=np.float64, count=count)
+    lows = np.fromiter((bar.low for bar in ordered_bars), dtype=np.float64, count=count)
+    closes = np.fromiter((bar.close for bar in ordered_bars), dtype=np.float64, count=count)
+    volumes = np.fromiter((bar.volume for bar in ordered_bars), dtype=np.float64, count=count)
+    trades = np.fromiter((bar.trades or 0 for bar in ordered_bars), dtype=np.int64, count=count)
+    vwap_prices = np.fromiter(
+        (bar.vwap if bar.vwap is not None else bar.close for bar in ordered_bars),
+        dtype=np.float64,
+        count=count,
+    )
+
+    highs_by_group = np.maximum.reduceat(highs, group_starts)
+    lows_by_group = np.minimum.reduceat(lows, group_starts)
+    trades_by_group = np.add.reduceat(trades, group_starts)
+    total_volume = _sequential_group_sum(volumes, group_starts=group_starts, group_lengths=group_lengths)
+    weighted_base = _sequential_group_sum(
+        vwap_prices * volumes,
+        group_starts=group_starts,
+        group_lengths=group_lengths,
+    )
+
+    aggregated: list[MarketBar] = []
+    for position, (first, last) in enumerate(zip(group_starts.tolist(), group_ends.tolist())):
+        if not include_unfinished and not final[position]:
+            continue
+        volume = float(total_volume[position])
+        aggregated.append(
+            MarketBar(
+                ticker=ticker,
+                timespan="minute",
+                multiplier=multiplier,
+                start_at=_from_epoch_us(int(bucket_starts[first])),
+                end_at=_from_epoch_us(int(bucket_ends[first])),
+                open=float(opens[first]),
+                high=float(highs_by_group[position]),
+                low=float(lows_by_group[position]),
+                close=float(closes[last]),
+                volume=volume,
+                vwap=float(weighted_base[position]) / volume if volume > 0 else None,
+                trades=int(trades_by_group[position]),
+                source=source,
+                is_final=bool(final[position]),
+            )
+        )
+    return aggregated
+
+
+def _session_bounds_us(starts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # America/New_York is always behind UTC, so a bar's local date is its UTC date or the day before.
+    first_day = _from_epoch_us(int(starts[0])).date() - timedelta(days=1)
+    last_day = _from_epoch_us(int(starts[-1])).date()
+    local_dates = [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+
+    midnights = np.array([_local_epoch_us(day, time.min) for day in local_dates], dtype=np.int64)
+    opens = np.array([_local_epoch_us(day, MARKET_OPEN_TIME) for day in local_dates], dtype=np.int64)
+    closes = np.array([_local_epoch_us(day, MARKET_CLOSE_TIME) for day in local_dates], dtype=np.int64)
+
+    day_index = np.searchsorted(midnights, starts, side="right") - 1
+    return opens[day_index], closes[day_index]
+
+
+def _sequential_group_sum(
+    values: np.ndarray,
+    *,
+    group_starts: np.ndarray,
+    group_lengths: np.ndarray,
+) -> np.ndarray:
+    # Add element by element in bar order so float results match Python's sum() exactly;
+    # pairwise summation in np.add.reduceat rounds differently for longer groups.
+    totals = np.zeros(group_starts.size, dtype=values.dtype)
+    for offset in range(int(group_lengths.max())):
+        active = group_lengths > offset
+        totals[active] += values[group_starts[active] + offset]
+    return totals
+
+
+def _local_epoch_us(day: date, at: time) -> int:
+    return _epoch_us(datetime.combine(day, at, tzinfo=MARKET_TIMEZONE))
+
+
+def _epoch_us(point: datetime) -> int:
+    if point.tzinfo is None:
+        point = point.replace(tzinfo=timezone.utc)
+    return (point - _EPOCH) // _MICROSECOND
+
+
+def _from_epoch_us(value: int) -> datetime:
+    return _EPOCH + value * _MICROSECOND
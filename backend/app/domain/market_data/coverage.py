@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+
+from app.domain.market_data.aggregation import MARKET_TIMEZONE, market_trade_date
+from app.domain.market_data.schemas import MarketBar
+
+# Bit i marks the minute starting i minutes after local midnight; DST fall-back days run 25 hours.
+COVERAGE_DAY_MINUTES = 25 * 60
+_ONE_MINUTE = timedelta(minutes=1)
+
+
+@dataclass(slots=True)
+class MinuteCoverage:
+    ticker: str
+    trade_date: date
+    present: int = 0
+    final: int = 0
+    # Set by the store on every write to the row; None for coverage built in memory.
+    updated_at: datetime | None = None
+
+
+def coverage_day_start(*, trade_date: date) -> datetime:
+    return datetime.combine(trade_date, time.min, tzinfo=MARKET_TIMEZONE).astimezone(timezone.utc)
+
+
+def coverage_day_minutes(*, trade_date: date) -> int:
+    day_start = coverage_day_start(trade_date=trade_date)
+    next_day_start = coverage_day_start(trade_date=trade_date + timedelta(days=1))
+    return (next_day_start - day_start) // _ONE_MINUTE
+
+
+def minute_range_mask(*, trade_date: date, start_at: datetime, end_at: datetime) -> int:
+    # Minutes whose start falls in [start_at, end_at).
+    day_start = coverage_day_start(trade_date=trade_date)
+    low = max(0, _ceil_minutes(start_at - day_start))
+    high = min(coverage_day_minutes(trade_date=trade_date), _ceil_minutes(end_at - day_start))
+    if high <= low:
+        return 0
+    return ((1 << (high - low)) - 1) << low
+
+
+def mask_minute_ranges(*, trade_date: date, mask: int) -> list[tuple[datetime, datetime]]:
+    # Contiguous runs of set bits as (first minute start, last minute start).
+    day_start = coverage_day_start(trade_date=trade_date)
+    ranges: list[tuple[datetime, datetime]] = []
+    offset = 0
+    remaining = mask
+    while remaining > 0:
+        skip = (remaining & -remaining).bit_length() - 1
+        remaining >>= skip
+        offset += skip
+        run = (remaining ^ (remaining + 1)).bit_length() - 1
+        ranges.append(
+            (
+                day_start + offset * _ONE_MINUTE,
+                day_start + (offset + run - 1) * _ONE_MINUTE,
+            )
+        )
+        remaining >>= run
+        offset += run
+    return ranges
+
+
+def build_minute_coverage(bars: list[MarketBar]) -> list[MinuteCoverage]:
+    by_key: dict[tuple[str, date], MinuteCoverage] = {}
+    for bar in bars:
+        trade_date = market_trade_date(point=bar.start_at)
+        index = (bar.start_at - coverage_day_start(trade_date=trade_date)) // _ONE_MINUTE
+        if index < 0 or index >= COVERAGE_DAY_MINUTES:
+            continue
+        item = by_key.get((bar.ticker, trade_date))
+        if item is None:
+            item = MinuteCoverage(ticker=bar.ticker, trade_date=trade_date)
+            by_key[(bar.ticker, trade_date)] = item
+        bit = 1 << index
+        item.present |= bit
+        if bar.is_final is not False:
+            item.final |= bit
+    return sorted(by_key.values(), key=lambda item: (item.ticker, item.trade_date))
+
+
+def _ceil_minutes(delta: timedelta) -> int:
+    return -((-delta) // _ONE_MINUTE)
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+import json
+import threading
+from typing import Any
+from urllib.parse import urlsplit
+import weakref
+
+import httpx
+
+
+@dataclass(slots=True)
+class _LoopState:
+    client: httpx.AsyncClient
+    host_slots: dict[str, asyncio.Semaphore] = field(default_factory=dict)
+
+
+class MassiveHttpClient:
+    # Same interface as MassiveClient, served by a pooled keep-alive HTTP client instead of
+    # running the synchronous SDK on executor threads.
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.massive.com",
+        *,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry_seconds: float = 30.0,
+        max_concurrency_per_host: int = 8,
+        timeout_seconds: float = 10.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        if not api_key:
+            raise ValueError("Massive API key is not configured")
+
+        self.api_key = api_key
+        self._base_url = base_url.rstrip("/")
+        self._base_host = urlsplit(self._base_url).netloc
+        self._limits = httpx.Limits(
+            max_connections=max(1, int(max_connections)),
+            max_keepalive_connections=max(0, int(max_keepalive_connections)),
+            keepalive_expiry=max(0.0, float(keepalive_expiry_seconds)),
+        )
+        self._timeout = httpx.Timeout(max(0.1, float(timeout_seconds)))
+        self._max_concurrency_per_host = max(1, int(max_concurrency_per_host))
+        self._transport = transport
+        # httpx pools are bound to the loop that opened them.
+        self._states: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    async def list_aggs(
+        self,
+        *,
+        ticker: str,
+        multiplier: int,
+        timespan: str,
+        from_date: str,
+        to_date: str,
+        adjusted: bool = True,
+        sort: str = "asc",
+        limit: int = 50000,
+    ) -> list[Any]:
+        path = f"/v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/{from_date}/{to_date}"
+        params = {"adjusted": "true" if adjusted else "false", "sort": sort, "limit": str(limit)}
+        results: list[Any] = []
+        async for page in self._paginate(path, params=params):
+            results.extend(page.get("results") or [])
+        return results
+
+    async def list_snapshots(self, *, tickers: list[str]) -> list[dict[str, Any]]:
+        payload = await self._get_json(
+            "/v2/snapshot/locale/us/markets/stocks/tickers",
+            params={"tickers": ",".join(tickers)},
+        )
+        raw_items = payload.get("tickers") if isinstance(payload, dict) else None
+        return [_snapshot_from_payload(item) for item in raw_items or [] if isinstance(item, dict)]
+
+    async def list_market_holidays(self) -> list[dict[str, Any]]:
+        payload = await self._get_json("/v1/marketstatus/upcoming")
+        if isinstance(payload, list):
+            return [item for item in payload if isinstance(item, dict)]
+        return []
+
+    async def get_market_status(self) -> dict[str, Any]:
+        payload = await self._get_json("/v1/marketstatus/now")
+        return payload if isinstance(payload, dict) else {}
+
+    async def aclose(self) -> None:
+        with self._lock:
+            states = list(self._states.items())
+            self._states.clear()
+        current_loop = asyncio.get_running_loop()
+        for loop, state in states:
+            if loop is current_loop:
+                await state.client.aclose()
+
+    async def _paginate(self, path: str, *, params: dict[str, str]) -> AsyncIterator[dict[str, Any]]:
+        url: str | None = path
+        page_params: dict[str, str] | None = params
+        while url:
+            payload = await self._get_json(url, params=page_params)
+            if not isinstance(payload, dict):
+                return
+            yield payload
+            url = self._resolve_next_url(payload.get("next_url"))
+            # next_url already carries the cursor and the original query.
+            page_params = None
+
+    async def _get_json(self, url: str, *, params: dict[str, str] | None = None) -> Any:
+        state = self._loop_state()
+        host = urlsplit(url).netloc or self._base_host
+        async with self._host_slot(state, host=host):
+            # Streamed so error statuses are rejected before their body is read.
+            async with state.client.stream("GET", url, params=params) as response:
+                if response.status_code == 429:
+                    raise RuntimeError("MARKET_DATA_RATE_LIMITED")
+                if response.status_code >= 400:
+                    raise RuntimeError(f"Massive request failed with status {response.status_code}")
+                body = await response.aread()
+        return _decode_json(body)
+
+    def _resolve_next_url(self, next_url: object) -> str | None:
+        if not isinstance(next_url, str) or not next_url:
+            return None
+        # Never send the API key to a host other than the configured one.
+        if urlsplit(next_url).netloc not in {"", self._base_host}:
+            return None
+        return next_url
+
+    def _loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._states.get(loop)
+            if state is None:
+                state = _LoopState(
+                    client=httpx.AsyncClient(
+                        base_url=self._base_url,
+                        headers={"Authorization": f"Bearer {self.api_key}", "Accept-Encoding": "gzip"},
+                        limits=self._limits,
+                        timeout=self._timeout,
+                        transport=self._transport,
+                    )
+                )
+                self._states[loop] = state
+            return state
+
+    @asynccontextmanager
+    async def _host_slot(self, state: _LoopState, *, host: str) -> AsyncIterator[None]:
+        semaphore = state.host_slots.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._max_concurrency_per_host)
+            state.host_slots[host] = semaphore
+        async with semaphore:
+            yield
+
+
+def _decode_json(body: bytes) -> Any:
+    if not body:
+        return None
+    return json.loads(body)
+
+
+def _snapshot_from_payload(raw: dict[str, Any]) -> dict[str, Any]:
+    # Field names follow the SDK's TickerSnapshot so snapshot mapping is backend-agnostic.
+    last_trade = raw.get("lastTrade") if isinstance(raw.get("lastTrade"), dict) else None
+    return {
+        "ticker": raw.get("ticker"),
+        "day": _agg_from_payload(raw.get("day")),
+        "prev_day": _agg_from_payload(raw.get("prevDay")),
+        "min": _agg_from_payload(raw.get("min")),
+        "last_trade": (
+            None
+            if last_trade is None
+            else {
+                "price": last_trade.get("p"),
+                "size": last_trade.get("s"),
+                "sip_timestamp": last_trade.get("t"),
+            }
+        ),
+        "todays_change": raw.get("todaysChange"),
+        "todays_change_percent": raw.get("todaysChangePerc"),
+        "updated": raw.get("updated"),
+    }
+
+
+def _agg_from_payload(raw: object) -> dict[str, Any] | None:
+    if not isinstance(raw, dict):
+        return None
+    return {
+        "open": raw.get("o"),
+        "high": raw.get("h"),
+        "low": raw.get("l"),
+        "close": raw.get("c"),
+        "volume": raw.get("v"),
+        "vwap": raw.get("vw"),
+        "timestamp": raw.get("t"),
+        "transactions": raw.get("n"),
+    }
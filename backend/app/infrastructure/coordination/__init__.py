@@ -0,0 +1,13 @@
+from .redis_bars_response_cache import RedisBarsResponseCache
+from .redis_fetch_lease import RedisFetchLeaseCoordinator
+from .redis_final_bar_generations import RedisFinalBarGenerations
+from .redis_holiday_store import RedisHolidayOverrideStore
+from .redis_rate_budget import RedisRateBudget
+
+__all__ = [
+    "RedisBarsResponseCache",
+    "RedisFetchLeaseCoordinator",
+    "RedisFinalBarGenerations",
+    "RedisHolidayOverrideStore",
+    "RedisRateBudget",
+]
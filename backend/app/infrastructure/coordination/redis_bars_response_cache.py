@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from datetime import date
+import logging
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+
+class RedisBarsResponseCache:
+    # Encoded /bars bodies shared by every API worker. A per-ticker index maps each entry to the
+    # trade dates it covers so writes only drop the entries they touch.
+    def __init__(
+        self,
+        *,
+        redis_url: str,
+        key_prefix: str = "market:bars:response",
+        client: redis.Redis | None = None,
+    ) -> None:
+        self._redis_url = redis_url
+        self._key_prefix = key_prefix.strip() or "market:bars:response"
+        self._client = client
+        self._owns_client = client is None
+        self._lock = asyncio.Lock()
+
+    async def get(self, *, key: str) -> dict[str, str] | None:
+        try:
+            client = await self._get_client()
+            fields = await client.hgetall(self._entry_key(key))
+        except redis.RedisError:
+            logger.warning("Bars response cache unavailable: key=%s", key)
+            return None
+        if not fields:
+            return None
+        decoded = {_decode(name): _decode(value) for name, value in fields.items()}
+        if any(name is None or value is None for name, value in decoded.items()):
+            return None
+        return decoded  # type: ignore[return-value]
+
+    async def get_fields(self, *, key: str, fields: list[str]) -> dict[str, str] | None:
+        # Small fields only, so validators can be checked without pulling the body.
+        try:
+            client = await self._get_client()
+            values = await client.hmget(self._entry_key(key), fields)
+        except redis.RedisError:
+            logger.warning("Bars response cache unavailable: key=%s", key)
+            return None
+        found = {name: _decode(value) for name, value in zip(fields, values)}
+        if all(value is None for value in found.values()):
+            return None
+        return {name: value for name, value in found.items() if value is not None}
+
+    async def put(
+        self,
+        *,
+        key: str,
+        ticker: str,
+        start_date: date,
+        end_date: date,
+        fields: dict[str, str],
+        ttl_seconds: int,
+        index_ttl_seconds: int,
+    ) -> None:
+        entry_key = self._entry_key(key)
+        index_key = self._index_key(ticker)
+        try:
+            client = await self._get_client()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.delete(entry_key)
+                pipe.hset(entry_key, mapping=fields)
+                pipe.expire(entry_key, max(1, int(ttl_seconds)))
+                pipe.hset(index_key, entry_key, f"{start_date.isoformat()}:{end_date.isoformat()}")
+                pipe.expire(index_key, max(1, int(index_ttl_seconds)))
+                await pipe.execute()
+        except redis.RedisError:
+            logger.warning("Failed to store bars response: key=%s", key)
+
+    async def invalidate(self, *, ticker: str, trade_dates: Iterable[date]) -> int:
+        touched = sorted(set(trade_dates))
+        if not touched:
+            return 0
+        index_key = self._index_key(ticker)
+        try:
+            client = await self._get_client()
+            index = await client.hgetall(index_key)
+            stale = [
+                entry_key
+                for entry_key, covered in ((_decode(name), _decode(value)) for name, value in index.items())
+                if entry_key is not None and _covers_any(covered, touched)
+            ]
+            if stale:
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.delete(*stale)
+                    pipe.hdel(index_key, *stale)
+                    await pipe.execute()
+        except redis.RedisError:
+            logger.warning("Failed to invalidate bars responses: ticker=%s", ticker)
+            return 0
+        return len(stale)
+
+    async def close(self) -> None:
+        if not self._owns_client:
+            return
+        client = self._client
+        self._client = None
+        if client is not None:
+            await client.aclose()
+
+    async def _get_client(self) -> redis.Redis:
+        if self._client is not None:
+            return self._client
+        async with self._lock:
+            if self._client is None:
+                self._client = redis.Redis.from_url(self._redis_url, decode_responses=True)
+            return self._client
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self._key_prefix}:{key}"
+
+    def _index_key(self, ticker: str) -> str:
+        return f"{self._key_prefix}:index:{ticker}"
+
+
+def _covers_any(covered: str | None, trade_dates: list[date]) -> bool:
+    # Unparseable index values are treated as covering everything.
+    if covered is None:
+        return True
+    start_raw, _, end_raw = covered.partition(":")
+    try:
+        start_date = date.fromisoformat(start_raw)
+        end_date = date.fromisoformat(end_raw)
+    except ValueError:
+        return True
+    return any(start_date <= trade_date <= end_date for trade_date in trade_dates)
+
+
+def _decode(raw: object) -> str | None:
+    if raw is None:
+        return None
+    if isinstance(raw, bytes):
+        try:
+            return raw.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+    if isinstance(raw, str):
+        return raw
+    return None
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+import logging
+import time
+from typing import TypeVar
+from uuid import uuid4
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+_STATUS_OK = "ok"
+_STATUS_ERROR = "error"
+# Delete the lease only when it is still owned by the caller's token.
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+# Extend the lease only while it is still owned by the caller's token.
+_RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisFetchLeaseCoordinator:
+    def __init__(
+        self,
+        *,
+        redis_url: str,
+        key_prefix: str = "market:bars:fetch-lease",
+        lease_ttl_seconds: int = 30,
+        wait_timeout_seconds: int = 20,
+        poll_interval_seconds: float = 0.5,
+        result_ttl_seconds: int = 60,
+        renew_interval_seconds: float | None = None,
+        client: redis.Redis | None = None,
+        time_provider: Callable[[], float] | None = None,
+    ) -> None:
+        self._redis_url = redis_url
+        self._key_prefix = key_prefix.strip() or "market:bars:fetch-lease"
+        self._lease_ttl_ms = max(1, int(lease_ttl_seconds)) * 1000
+        self._wait_timeout_seconds = max(1, int(wait_timeout_seconds))
+        self._poll_interval_seconds = max(0.01, float(poll_interval_seconds))
+        self._result_ttl_seconds = max(1, int(result_ttl_seconds))
+        default_renew_interval = self._lease_ttl_ms / 3000
+        self._renew_interval_seconds = max(0.01, float(renew_interval_seconds or default_renew_interval))
+        self._client = client
+        self._owns_client = client is None
+        self._lock = asyncio.Lock()
+        self._time_provider = time_provider or time.monotonic
+
+    async def run_or_wait(
+        self,
+        *,
+        key: str,
+        leader: Callable[[], Awaitable[_T]],
+        follower: Callable[[], Awaitable[_T]],
+    ) -> _T:
+        # One process per key runs `leader` and keeps its lease alive while it runs; the others wait
+        # for its result notification and run `follower`. Failed or expired leases are contended
+        # again, and only an unreachable Redis makes a caller run `leader` without a lease.
+        deadline = self._time_provider() + self._wait_timeout_seconds
+        while True:
+            try:
+                token, owner = await self._try_acquire(key=key)
+            except redis.RedisError:
+                logger.warning("Fetch lease unavailable, running upstream fetch without coordination: key=%s", key)
+                return await leader()
+
+            if token is not None:
+                return await self._run_as_leader(key=key, token=token, leader=leader)
+
+            if owner is not None:
+                try:
+                    status = await self._wait_for_owner(key=key, owner=owner, deadline=deadline)
+                except redis.RedisError:
+                    logger.warning("Fetch lease wait failed, running upstream fetch locally: key=%s", key)
+                    return await leader()
+                if status == _STATUS_OK:
+                    return await follower()
+
+            if self._time_provider() >= deadline:
+                return await self._after_wait_timeout(key=key, leader=leader, follower=follower)
+
+    async def _after_wait_timeout(
+        self,
+        *,
+        key: str,
+        leader: Callable[[], Awaitable[_T]],
+        follower: Callable[[], Awaitable[_T]],
+    ) -> _T:
+        # A leader that is still renewing its lease is alive, just slow; going upstream as well would
+        # duplicate its fetch, so serve what is stored instead.
+        try:
+            token, owner = await self._try_acquire(key=key)
+        except redis.RedisError:
+            logger.warning("Fetch lease unavailable, running upstream fetch without coordination: key=%s", key)
+            return await leader()
+        if token is not None:
+            return await self._run_as_leader(key=key, token=token, leader=leader)
+        logger.warning("Fetch lease wait timed out, reusing stored bars: key=%s owner=%s", key, owner)
+        return await follower()
+
+    async def _run_as_leader(
+        self,
+        *,
+        key: str,
+        token: str,
+        leader: Callable[[], Awaitable[_T]],
+    ) -> _T:
+        status = _STATUS_ERROR
+        renewal = asyncio.create_task(self._keep_lease(key=key, token=token))
+        try:
+            result = await leader()
+            status = _STATUS_OK
+            return result
+        finally:
+            renewal.cancel()
+            with suppress(asyncio.CancelledError):
+                await renewal
+            try:
+                await self._release(key=key, token=token, status=status)
+            except redis.RedisError:
+                logger.warning("Failed to release fetch lease: key=%s", key)
+
+    async def _keep_lease(self, *, key: str, token: str) -> None:
+        while True:
+            await asyncio.sleep(self._renew_interval_seconds)
+            try:
+                client = await self._get_client()
+                renewed = await client.eval(_RENEW_SCRIPT, 1, self._lease_key(key), token, self._lease_ttl_ms)
+            except redis.RedisError:
+                logger.warning("Failed to renew fetch lease: key=%s", key)
+                continue
+            if not renewed:
+                logger.warning("Fetch lease lost while fetching: key=%s", key)
+                return
+
+    async def _try_acquire(self, *, key: str) -> tuple[str | None, str | None]:
+        token = uuid4().hex
+        client = await self._get_client()
+        acquired = await client.set(self._lease_key(key), token, nx=True, px=self._lease_ttl_ms)
+        if acquired:
+            return token, None
+        owner = await client.get(self._lease_key(key))
+        return None, _decode(owner)
+
+    async def _release(self, *, key: str, token: str, status: str) -> None:
+        client = await self._get_client()
+        await client.set(self._result_key(key), f"{token}:{status}", ex=self._result_ttl_seconds)
+        await client.eval(_RELEASE_SCRIPT, 1, self._lease_key(key), token)
+        await client.publish(self._channel(key), f"{token}:{status}")
+
+    async def _wait_for_owner(self, *, key: str, owner: str, deadline: float) -> str | None:
+        client = await self._get_client()
+        pubsub = client.pubsub()
+        await pubsub.subscribe(self._channel(key))
+        try:
+            while True:
+                # Check shared state after subscribing so a release that raced the
+                # subscription is still observed.
+                status = _owner_status(await client.get(self._result_key(key)), owner=owner)
+                if status is not None:
+                    return status
+                if _decode(await client.get(self._lease_key(key))) != owner:
+                    # Lease expired or was released without a result; let the caller retry.
+                    return None
+
+                remaining = deadline - self._time_provider()
+                if remaining <= 0:
+                    return None
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=min(self._poll_interval_seconds, remaining),
+                )
+                if message:
+                    status = _owner_status(message.get("data"), owner=owner)
+                    if status is not None:
+                        return status
+        finally:
+            try:
+                await pubsub.unsubscribe(self._channel(key))
+            finally:
+                await pubsub.aclose()
+
+    async def close(self) -> None:
+        if not self._owns_client:
+            return
+        client = self._client
+        self._client = None
+        if client is not None:
+            await client.aclose()
+
+    async def _get_client(self) -> redis.Redis:
+        if self._client is not None:
+            return self._client
+        async with self._lock:
+            if self._client is None:
+                self._client = redis.Redis.from_url(self._redis_url, decode_responses=True)
+            return self._client
+
+    def _lease_key(self, key: str) -> str:
+        return f"{self._key_prefix}:lease:{key}"
+
+    def _result_key(self, key: str) -> str:
+        return f"{self._key_prefix}:result:{key}"
+
+    def _channel(self, key: str) -> str:
+        return f"{self._key_prefix}:done:{key}"
+
+
+def _owner_status(raw: object, *, owner: str) -> str | None:
+    value = _decode(raw)
+    if value is None:
+        return None
+    token, _, status = value.partition(":")
+    if token != owner or status not in {_STATUS_OK, _STATUS_ERROR}:
+        return None
+    return status
+
+
+def _decode(raw: object) -> str | None:
+    if raw is None:
+        return None
+    if isinstance(raw, bytes):
+        try:
+            return raw.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+    if isinstance(raw, str):
+        return raw
+    return None
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import date
+import logging
+import time
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+_GenerationKey = tuple[str, str]
+
+
+class RedisFinalBarGenerations:
+    # Write counters of stored bars per (ticker, timespan, trade date), shared through one Redis hash per
+    # (ticker, timespan). Writers bump the dates they committed; readers refresh their copy at most once per
+    # `sync_interval_seconds`, so a process-local bar cache sees other processes' writes within that bound.
+    def __init__(
+        self,
+        *,
+        redis_url: str,
+        key_prefix: str = "market:bars:final-generation",
+        sync_interval_seconds: float = 1.0,
+        ttl_seconds: int = 30 * 24 * 60 * 60,
+        client: redis.Redis | None = None,
+        time_provider: Callable[[], float] | None = None,
+    ) -> None:
+        self._redis_url = redis_url
+        self._key_prefix = key_prefix.strip() or "market:bars:final-generation"
+        self._sync_interval = max(0.0, float(sync_interval_seconds))
+        self._ttl_seconds = max(1, int(ttl_seconds))
+        self._client = client
+        self._owns_client = client is None
+        self._time_provider = time_provider or time.monotonic
+        self._lock = asyncio.Lock()
+        # Snapshots are replaced, never mutated, so callers can hold one across a read.
+        self._snapshots: dict[_GenerationKey, tuple[float, dict[date, int]]] = {}
+
+    async def current(self, *, ticker: str, timespan: str) -> dict[date, int] | None:
+        # None when Redis cannot be reached: without it, cached segments may miss other processes' writes.
+        key = (ticker, timespan)
+        now = self._time_provider()
+        synced = self._snapshots.get(key)
+        if synced is not None and now - synced[0] < self._sync_interval:
+            return synced[1]
+        try:
+            client = await self._get_client()
+            raw = await client.hgetall(self._hash_key(ticker=ticker, timespan=timespan))
+        except redis.RedisError:
+            logger.warning("Final bar generations unavailable: ticker=%s timespan=%s", ticker, timespan)
+            return None
+        generations = _parse_generations(raw)
+        self._snapshots[key] = (now, generations)
+        return generations
+
+    async def bump(self, *, touched: dict[_GenerationKey, set[date]]) -> None:
+        items = [(key, sorted(trade_dates)) for key, trade_dates in touched.items() if trade_dates]
+        if not items:
+            return
+        try:
+            client = await self._get_client()
+            async with client.pipeline(transaction=False) as pipe:
+                for (ticker, timespan), trade_dates in items:
+                    hash_key = self._hash_key(ticker=ticker, timespan=timespan)
+                    for trade_date in trade_dates:
+                        pipe.hincrby(hash_key, trade_date.isoformat(), 1)
+                    pipe.expire(hash_key, self._ttl_seconds)
+                results = await pipe.execute()
+        except redis.RedisError:
+            logger.warning("Failed to publish final bar generations: keys=%s", [key for key, _ in items])
+            return
+
+        # Our own writes are visible locally right away; keys never synced pick them up on first read.
+        offset = 0
+        for key, trade_dates in items:
+            bumped = dict(zip(trade_dates, (int(value) for value in results[offset : offset + len(trade_dates)])))
+            offset += len(trade_dates) + 1
+            synced = self._snapshots.get(key)
+            if synced is not None:
+                self._snapshots[key] = (synced[0], {**synced[1], **bumped})
+
+    async def close(self) -> None:
+        if not self._owns_client:
+            return
+        client = self._client
+        self._client = None
+        if client is not None:
+            await client.aclose()
+
+    async def _get_client(self) -> redis.Redis:
+        if self._client is not None:
+            return self._client
+        async with self._lock:
+            if self._client is None:
+                self._client = redis.Redis.from_url(self._redis_url, decode_responses=True)
+            return self._client
+
+    def _hash_key(self, *, ticker: str, timespan: str) -> str:
+        return f"{self._key_prefix}:{timespan}:{ticker}"
+
+
+def _parse_generations(raw: dict[object, object]) -> dict[date, int]:
+    generations: dict[date, int] = {}
+    for field, value in raw.items():
+        try:
+            name = field.decode("utf-8") if isinstance(field, bytes) else str(field)
+            generations[date.fromisoformat(name)] = int(value)  # type: ignore[call-overload]
+        except (UnicodeDecodeError, ValueError, TypeError):
+            continue
+    return generations
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import json
+import logging
+from typing import Any
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+
+class RedisHolidayOverrideStore:
+    # Parsed holiday overrides shared by every process. The version key is read on each sync;
+    # the payload is only read when the version changes.
+    def __init__(
+        self,
+        *,
+        redis_url: str,
+        key_prefix: str = "market:calendar:holidays",
+        client: redis.Redis | None = None,
+    ) -> None:
+        self._redis_url = redis_url
+        self._key_prefix = key_prefix.strip() or "market:calendar:holidays"
+        self._client = client
+
+    async def read_version(self) -> str | None:
+        try:
+            async with self._client_scope() as client:
+                return _decode(await client.get(self._version_key()))
+        except redis.RedisError:
+            logger.warning("Shared holiday overrides unavailable: key=%s", self._version_key())
+            return None
+
+    async def read(self) -> dict[str, Any] | None:
+        try:
+            async with self._client_scope() as client:
+                raw = _decode(await client.get(self._payload_key()))
+        except redis.RedisError:
+            logger.warning("Shared holiday overrides unavailable: key=%s", self._payload_key())
+            return None
+        if raw is None:
+            return None
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    async def write(
+        self,
+        *,
+        version: str,
+        refreshed_at: float,
+        overrides: list[dict[str, Any]],
+        ttl_seconds: int,
+    ) -> bool:
+        payload = json.dumps(
+            {"version": version, "refreshed_at": refreshed_at, "overrides": overrides},
+            separators=(",", ":"),
+        )
+        try:
+            async with self._client_scope() as client:
+                # Payload first, so a reader that sees the new version always finds its payload.
+                await client.set(self._payload_key(), payload, ex=max(1, int(ttl_seconds)))
+                await client.set(self._version_key(), version, ex=max(1, int(ttl_seconds)))
+        except redis.RedisError:
+            logger.warning("Failed to publish shared holiday overrides: key=%s", self._payload_key())
+            return False
+        return True
+
+    async def try_acquire_refresh_lease(self, *, ttl_seconds: int) -> bool:
+        try:
+            async with self._client_scope() as client:
+                acquired = await client.set(self._lease_key(), "1", nx=True, ex=max(1, int(ttl_seconds)))
+        except redis.RedisError:
+            return True
+        return bool(acquired)
+
+    @asynccontextmanager
+    async def _client_scope(self) -> AsyncIterator[redis.Redis]:
+        if self._client is not None:
+            yield self._client
+            return
+
+        client = redis.Redis.from_url(self._redis_url, decode_responses=True)
+        try:
+            yield client
+        finally:
+            await client.aclose()
+
+    def _payload_key(self) -> str:
+        return f"{self._key_prefix}:payload"
+
+    def _version_key(self) -> str:
+        return f"{self._key_prefix}:version"
+
+    def _lease_key(self) -> str:
+        return f"{self._key_prefix}:refresh-lease"
+
+
+def _decode(raw: object) -> str | None:
+    if raw is None:
+        return None
+    if isinstance(raw, bytes):
+        try:
+            return raw.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+    if isinstance(raw, str):
+        return raw
+    return None
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+# Token bucket shared by every process; the Redis clock keeps refills consistent across hosts.
+# Returns 0 when a token was taken, otherwise the milliseconds until one frees up above `reserve`.
+_TAKE_TOKEN_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local reserve = tonumber(ARGV[3])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local state = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = tonumber(state[1]) or burst
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate / 1000)
+local wait_ms = 0
+if tokens >= 1 + reserve then
+    tokens = tokens - 1
+else
+    wait_ms = math.ceil((1 + reserve - tokens) * 1000 / rate)
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated_at", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return wait_ms
+"""
+
+
+class RedisRateBudget:
+    def __init__(
+        self,
+        *,
+        redis_url: str,
+        rate_per_second: float,
+        burst: int,
+        key: str = "market:massive:rate-budget",
+        fallback: Any | None = None,
+        client: redis.Redis | None = None,
+    ) -> None:
+        self._redis_url = redis_url
+        self._rate = max(0.001, float(rate_per_second))
+        self._burst = max(1, int(burst))
+        self._key = key.strip() or "market:massive:rate-budget"
+        self._fallback = fallback
+        self._client = client
+        self._owns_client = client is None
+        self._take_token: Any = None
+        self._lock = asyncio.Lock()
+
+    async def try_acquire(self, *, reserve: float = 0.0) -> float:
+        try:
+            take_token = await self._get_take_token()
+            wait_ms = await take_token(
+                keys=[self._key],
+                args=[str(self._rate), str(self._burst), str(max(0.0, reserve))],
+            )
+        except redis.RedisError:
+            if self._fallback is None:
+                return 0.0
+            logger.warning("Shared upstream rate budget unavailable, using the local budget: key=%s", self._key)
+            return await self._fallback.try_acquire(reserve=reserve)
+        return max(0, int(wait_ms)) / 1000
+
+    async def close(self) -> None:
+        client = self._client
+        self._take_token = None
+        if not self._owns_client:
+            return
+        self._client = None
+        if client is not None:
+            await client.aclose()
+
+    async def _get_take_token(self) -> Any:
+        # One connection pool and one registered script for the life of the budget; the script
+        # object runs EVALSHA and reloads itself after a Redis restart.
+        if self._take_token is not None:
+            return self._take_token
+        async with self._lock:
+            if self._take_token is None:
+                if self._client is None:
+                    self._client = redis.Redis.from_url(self._redis_url, decode_responses=True)
+                self._take_token = self._client.register_script(_TAKE_TOKEN_SCRIPT)
+            return self._take_token
@@ -3,11 +3,13 @@ from __future__ import annotations
 from datetime import date
 
 from app.domain.auth.schemas import User, UserCredentials
+from app.domain.market_data.coverage import COVERAGE_DAY_MINUTES, MinuteCoverage
 from app.domain.market_data.schemas import MarketBar
 from app.domain.watchlist.schemas import WatchlistItem
 from app.infrastructure.db.models.market_data import (
     MarketBarDayModel,
     MarketBarMinuteAggModel,
+    MarketBarMinuteCoverageModel,
     MarketBarMinuteModel,
 )
 from app.infrastructure.db.models.user import UserModel
@@ -154,3 +156,31 @@ def market_bar_to_minute_agg_row(bar: MarketBar, *, trade_date: date) -> dict:
         "trades": bar.trades,
         "source": bar.source,
     }
+
+
+def minute_coverage_to_domain(model: MarketBarMinuteCoverageModel) -> MinuteCoverage:
+    return MinuteCoverage(
+        ticker=model.ticker,
+        trade_date=model.trade_date,
+        present=_bit_string_to_mask(model.present_mask),
+        final=_bit_string_to_mask(model.final_mask),
+        updated_at=model.updated_at,
+    )
+
+
+def minute_coverage_to_row(coverage: MinuteCoverage) -> dict:
+    return {
+        "ticker": coverage.ticker,
+        "trade_date": coverage.trade_date,
+        "present_mask": _mask_to_bit_string(coverage.present),
+        "final_mask": _mask_to_bit_string(coverage.final),
+    }
+
+
+def _mask_to_bit_string(mask: int) -> str:
+    # Postgres bit strings are written left to right, so bit 0 is the first character.
+    return format(mask, f"0{COVERAGE_DAY_MINUTES}b")[::-1]
+
+
+def _bit_string_to_mask(value: str) -> int:
+    return int(value[::-1], 2) if value else 0
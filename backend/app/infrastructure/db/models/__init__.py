@@ -1,6 +1,7 @@
 from app.infrastructure.db.models.market_data import (
     MarketBarDayModel,
     MarketBarMinuteAggModel,
+    MarketBarMinuteCoverageModel,
     MarketBarMinuteModel,
 )
 from app.infrastructure.db.models.user import UserModel
@@ -9,6 +10,7 @@ from app.infrastructure.db.models.watchlist import WatchlistItemModel
 __all__ = [
     "MarketBarDayModel",
     "MarketBarMinuteAggModel",
+    "MarketBarMinuteCoverageModel",
     "MarketBarMinuteModel",
     "UserModel",
     "WatchlistItemModel",
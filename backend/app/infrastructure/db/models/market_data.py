@@ -3,8 +3,10 @@ from __future__ import annotations
 from datetime import date, datetime
 
 from sqlalchemy import Boolean, Date, DateTime, Float, Index, Integer, String, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import BIT
 from sqlalchemy.orm import Mapped, mapped_column
 
+from app.domain.market_data.coverage import COVERAGE_DAY_MINUTES
 from app.infrastructure.db.base import Base
 
 
@@ -97,3 +99,24 @@ class MarketBarMinuteAggModel(Base):
             "bucket_start_at",
         ),
     )
+
+
+class MarketBarMinuteCoverageModel(Base):
+    __tablename__ = "market_bars_minute_coverage"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    ticker: Mapped[str] = mapped_column(String(16), nullable=False)
+    trade_date: Mapped[date] = mapped_column(Date, index=True, nullable=False)
+    # Bit i covers the minute starting i minutes after local midnight of trade_date.
+    present_mask: Mapped[str] = mapped_column(BIT(COVERAGE_DAY_MINUTES), nullable=False)
+    final_mask: Mapped[str] = mapped_column(BIT(COVERAGE_DAY_MINUTES), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        UniqueConstraint("ticker", "trade_date", name="uq_market_bars_minute_coverage_ticker_trade_date"),
+    )
@@ -4,14 +4,24 @@ from typing import Callable
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.infrastructure.coordination.redis_final_bar_generations import RedisFinalBarGenerations
+from app.infrastructure.repositories.final_bar_cache import FinalBarSegmentCache
 from app.infrastructure.repositories.auth_repository import SqlAlchemyAuthRepository
 from app.infrastructure.repositories.market_data_repository import SqlAlchemyMarketDataRepository
 from app.infrastructure.repositories.watchlist_repository import SqlAlchemyWatchlistRepository
 
 
 class SqlAlchemyUnitOfWork:
-    def __init__(self, *, session_factory: Callable[[], AsyncSession]) -> None:
+    def __init__(
+        self,
+        *,
+        session_factory: Callable[[], AsyncSession],
+        final_bar_cache: FinalBarSegmentCache | None = None,
+        final_bar_generations: RedisFinalBarGenerations | None = None,
+    ) -> None:
         self._session_factory = session_factory
+        self._final_bar_cache = final_bar_cache
+        self._final_bar_generations = final_bar_generations
         self.session: AsyncSession | None = None
         self.auth_repo: SqlAlchemyAuthRepository | None = None
         self.market_data_repo: SqlAlchemyMarketDataRepository | None = None
@@ -20,7 +30,11 @@ class SqlAlchemyUnitOfWork:
     async def __aenter__(self) -> "SqlAlchemyUnitOfWork":
         self.session = self._session_factory()
         self.auth_repo = SqlAlchemyAuthRepository(session=self.session)
-        self.market_data_repo = SqlAlchemyMarketDataRepository(session=self.session)
+        self.market_data_repo = SqlAlchemyMarketDataRepository(
+            session=self.session,
+            final_bar_cache=self._final_bar_cache,
+            final_bar_generations=self._final_bar_generations,
+        )
         self.watchlist_repo = SqlAlchemyWatchlistRepository(session=self.session)
         return self
 
@@ -39,8 +53,12 @@ class SqlAlchemyUnitOfWork:
         if self.session is None:
             raise RuntimeError("Unit of work has no active session")
         await self.session.commit()
+        if self.market_data_repo is not None:
+            await self.market_data_repo.publish_committed_writes()
 
     async def rollback(self) -> None:
         if self.session is None:
             raise RuntimeError("Unit of work has no active session")
         await self.session.rollback()
+        if self.market_data_repo is not None:
+            self.market_data_repo.discard_uncommitted_writes()
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+import math
+import threading
+
+import numpy as np
+
+from app.domain.market_data.schemas import MarketBar
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_MISSING_TRADES = -1
+# Rough per-entry cost on top of the row buffer: key tuple, LRU slot and segment object.
+_SEGMENT_OVERHEAD_BYTES = 256
+_SEGMENT_DTYPE = np.dtype(
+    [
+        ("start_us", np.int64),
+        ("open", np.float64),
+        ("high", np.float64),
+        ("low", np.float64),
+        ("close", np.float64),
+        ("volume", np.float64),
+        ("vwap", np.float64),
+        ("trades", np.int64),
+        ("source", np.int16),
+    ]
+)
+
+_SegmentKey = tuple[str, str, date]
+
+
+@dataclass(slots=True, frozen=True)
+class FinalBarCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    resident_bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(slots=True, frozen=True)
+class FinalBarSegment:
+    # All finalized bars of one (ticker, timespan, trade_date), one packed row per bar sorted by start.
+    # A segment without rows records a trade date that has no stored bars.
+    ticker: str
+    timespan: str
+    multiplier: int
+    trade_date: date
+    rows: np.ndarray
+    sources: tuple[str, ...]
+    # Write generation of the trade date observed before the rows were read.
+    generation: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.rows.nbytes) + _SEGMENT_OVERHEAD_BYTES
+
+    def to_bars(self, *, start_at: datetime, end_at: datetime) -> list[MarketBar]:
+        starts = self.rows["start_us"]
+        low = int(np.searchsorted(starts, _epoch_us(start_at), side="left"))
+        high = int(np.searchsorted(starts, _epoch_us(end_at), side="right"))
+        bars: list[MarketBar] = []
+        for start_us, open_, high_, low_, close, volume, vwap, trades, source in self.rows[low:high].tolist():
+            bars.append(
+                MarketBar(
+                    ticker=self.ticker,
+                    timespan=self.timespan,
+                    multiplier=self.multiplier,
+                    start_at=_EPOCH + start_us * _MICROSECOND,
+                    open=open_,
+                    high=high_,
+                    low=low_,
+                    close=close,
+                    volume=volume,
+                    vwap=None if math.isnan(vwap) else vwap,
+                    trades=None if trades == _MISSING_TRADES else trades,
+                    source=self.sources[source],
+                    is_final=True,
+                )
+            )
+        return bars
+
+
+def build_final_bar_segment(
+    *,
+    trade_date: date,
+    bars: list[MarketBar],
+    generation: int = 0,
+) -> FinalBarSegment | None:
+    if not bars or any(bar.is_final is not True for bar in bars):
+        return None
+
+    ordered = sorted(bars, key=lambda bar: bar.start_at)
+    sources: dict[str, int] = {}
+    rows = np.empty(len(ordered), dtype=_SEGMENT_DTYPE)
+    for index, bar in enumerate(ordered):
+        rows[index] = (
+            _epoch_us(bar.start_at),
+            bar.open,
+            bar.high,
+            bar.low,
+            bar.close,
+            bar.volume,
+            bar.vwap if bar.vwap is not None else math.nan,
+            bar.trades if bar.trades is not None else _MISSING_TRADES,
+            sources.setdefault(bar.source, len(sources)),
+        )
+    first = ordered[0]
+    return FinalBarSegment(
+        ticker=first.ticker,
+        timespan=first.timespan,
+        multiplier=first.multiplier,
+        trade_date=trade_date,
+        rows=rows,
+        sources=tuple(sources),
+        generation=generation,
+    )
+
+
+def build_empty_bar_segment(*, ticker: str, timespan: str, trade_date: date, generation: int = 0) -> FinalBarSegment:
+    return FinalBarSegment(
+        ticker=ticker,
+        timespan=timespan,
+        multiplier=1,
+        trade_date=trade_date,
+        rows=np.empty(0, dtype=_SEGMENT_DTYPE),
+        sources=(),
+        generation=generation,
+    )
+
+
+class FinalBarSegmentCache:
+    # Process-wide LRU of finalized bar segments bounded by the bytes of their packed rows.
+    def __init__(self, *, max_bytes: int) -> None:
+        self._max_bytes = max(0, int(max_bytes))
+        self._segments: OrderedDict[_SegmentKey, FinalBarSegment] = OrderedDict()
+        self._resident_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def lookup(
+        self,
+        *,
+        ticker: str,
+        timespan: str,
+        trade_dates: Iterable[date],
+        generations: dict[date, int] | None = None,
+    ) -> dict[date, FinalBarSegment]:
+        # With `generations`, a segment only counts while its trade date has not been written since it was read.
+        found: dict[date, FinalBarSegment] = {}
+        with self._lock:
+            for trade_date in trade_dates:
+                key = (ticker, timespan, trade_date)
+                segment = self._segments.get(key)
+                if segment is None:
+                    continue
+                if generations is not None and generations.get(trade_date, 0) != segment.generation:
+                    self._drop(key)
+                    continue
+                self._segments.move_to_end(key)
+                found[trade_date] = segment
+            self._hits += len(found)
+        return found
+
+    def record_misses(self, count: int) -> None:
+        if count <= 0:
+            return
+        with self._lock:
+            self._misses += count
+
+    def put(self, segment: FinalBarSegment) -> None:
+        size = segment.nbytes
+        if size > self._max_bytes:
+            return
+        key = (segment.ticker, segment.timespan, segment.trade_date)
+        with self._lock:
+            self._drop(key)
+            self._segments[key] = segment
+            self._resident_bytes += size
+            while self._resident_bytes > self._max_bytes and self._segments:
+                _, evicted = self._segments.popitem(last=False)
+                self._resident_bytes -= evicted.nbytes
+                self._evictions += 1
+
+    def invalidate(self, *, ticker: str, timespan: str, trade_dates: Iterable[date]) -> None:
+        with self._lock:
+            for trade_date in trade_dates:
+                self._drop((ticker, timespan, trade_date))
+
+    def discard_before(self, *, timespan: str, trade_date: date) -> None:
+        with self._lock:
+            for key in [key for key in self._segments if key[1] == timespan and key[2] < trade_date]:
+                self._drop(key)
+
+    def stats(self) -> FinalBarCacheStats:
+        with self._lock:
+            return FinalBarCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._segments),
+                resident_bytes=self._resident_bytes,
+                max_bytes=self._max_bytes,
+            )
+
+    def _drop(self, key: _SegmentKey) -> None:
+        segment = self._segments.pop(key, None)
+        if segment is not None:
+            self._resident_bytes -= segment.nbytes
+
+
+def _epoch_us(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from datetime import date, datetime, time, timezone
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta, timezone
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import Time, and_, cast, delete, func, or_, select
+from sqlalchemy import Time, and_, cast, delete, func, or_, select, true
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.domain.market_data.coverage import MinuteCoverage, build_minute_coverage
 from app.domain.market_data.schemas import MarketBar
 from app.infrastructure.db.mappers import (
     market_bar_day_to_domain,
@@ -15,19 +19,42 @@ from app.infrastructure.db.mappers import (
     market_bar_to_day_row,
     market_bar_to_minute_agg_row,
     market_bar_to_minute_row,
+    minute_coverage_to_domain,
+    minute_coverage_to_row,
+)
+from app.infrastructure.coordination.redis_final_bar_generations import RedisFinalBarGenerations
+from app.infrastructure.repositories.final_bar_cache import (
+    FinalBarSegment,
+    FinalBarSegmentCache,
+    build_empty_bar_segment,
+    build_final_bar_segment,
 )
 from app.infrastructure.db.models.market_data import (
     MarketBarDayModel,
     MarketBarMinuteAggModel,
+    MarketBarMinuteCoverageModel,
     MarketBarMinuteModel,
 )
 
 _MARKET_TZ = ZoneInfo("America/New_York")
+_ONE_MICROSECOND = timedelta(microseconds=1)
 
 
 class SqlAlchemyMarketDataRepository:
-    def __init__(self, *, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        *,
+        session: AsyncSession,
+        final_bar_cache: FinalBarSegmentCache | None = None,
+        final_bar_generations: RedisFinalBarGenerations | None = None,
+    ) -> None:
         self._session = session
+        self._final_bar_cache = final_bar_cache
+        # Without generations the cache only sees this process's writes.
+        self._final_bar_generations = final_bar_generations
+        # Segments are only cached from sessions that have not written, so uncommitted rows never leak in.
+        self._has_writes = False
+        self._written: dict[tuple[str, str], set[date]] = {}
 
     async def list_day_bars(
         self,
@@ -37,6 +64,16 @@ class SqlAlchemyMarketDataRepository:
         end_at: datetime,
         limit: int | None = None,
     ) -> list[MarketBar]:
+        generations = await self._final_bar_cache_generations(ticker=ticker, timespan="day")
+        if self._final_bar_cache is not None and generations is not None:
+            return await self._list_day_bars_cached(
+                cache=self._final_bar_cache,
+                generations=generations,
+                ticker=ticker,
+                start_at=start_at,
+                end_at=end_at,
+                limit=limit,
+            )
         stmt = (
             select(MarketBarDayModel)
             .where(
@@ -73,6 +110,37 @@ class SqlAlchemyMarketDataRepository:
         bars.sort(key=lambda bar: bar.start_at)
         return bars
 
+    async def list_recent_day_bars_for_tickers(
+        self,
+        *,
+        tickers: list[str],
+        limit: int = 2,
+    ) -> dict[str, list[MarketBar]]:
+        if limit < 1 or not tickers:
+            return {}
+
+        # One LATERAL probe per ticker walks the (ticker, trade_date) unique index backwards.
+        symbols = func.unnest(postgresql.array(tickers)).table_valued("ticker").render_derived(name="symbols")
+        latest = (
+            select(MarketBarDayModel)
+            .where(MarketBarDayModel.ticker == symbols.c.ticker)
+            .order_by(MarketBarDayModel.trade_date.desc())
+            .limit(limit)
+            .lateral("latest")
+        )
+        latest_day = aliased(MarketBarDayModel, latest)
+        stmt = (
+            select(latest_day)
+            .select_from(symbols)
+            .join(latest, true())
+            .order_by(latest_day.ticker.asc(), latest_day.start_at.asc())
+        )
+        rows = (await self._session.execute(stmt)).scalars().all()
+        bars_by_ticker: dict[str, list[MarketBar]] = {}
+        for row in rows:
+            bars_by_ticker.setdefault(row.ticker, []).append(market_bar_day_to_domain(row))
+        return bars_by_ticker
+
     async def list_minute_bars(
         self,
         *,
@@ -82,6 +150,17 @@ class SqlAlchemyMarketDataRepository:
         limit: int | None = None,
         session: str | None = None,
     ) -> list[MarketBar]:
+        generations = await self._final_bar_cache_generations(ticker=ticker, timespan="minute")
+        if self._final_bar_cache is not None and generations is not None:
+            return await self._list_minute_bars_cached(
+                cache=self._final_bar_cache,
+                generations=generations,
+                ticker=ticker,
+                start_at=start_at,
+                end_at=end_at,
+                limit=limit,
+                session=session,
+            )
         conditions = [
             MarketBarMinuteModel.ticker == ticker,
             MarketBarMinuteModel.start_at >= start_at,
@@ -96,6 +175,191 @@ class SqlAlchemyMarketDataRepository:
         rows = (await self._session.execute(stmt)).scalars().all()
         return [market_bar_minute_to_domain(row) for row in rows]
 
+    async def _final_bar_cache_generations(self, *, ticker: str, timespan: str) -> dict[date, int] | None:
+        # None means the cache must be bypassed for this read.
+        if self._final_bar_cache is None:
+            return None
+        if self._final_bar_generations is None:
+            return {}
+        return await self._final_bar_generations.current(ticker=ticker, timespan=timespan)
+
+    async def _list_day_bars_cached(
+        self,
+        *,
+        cache: FinalBarSegmentCache,
+        generations: dict[date, int],
+        ticker: str,
+        start_at: datetime,
+        end_at: datetime,
+        limit: int | None,
+    ) -> list[MarketBar]:
+        # Day segments are keyed by the UTC date of the bar start, the way the service keys day bars.
+        trade_dates = _day_bar_dates_between(start_at=start_at, end_at=end_at)
+        cached = cache.lookup(ticker=ticker, timespan="day", trade_dates=trade_dates, generations=generations)
+        uncached = [trade_date for trade_date in trade_dates if trade_date not in cached]
+
+        bars: list[MarketBar] = []
+        if uncached:
+            conditions = [
+                MarketBarDayModel.ticker == ticker,
+                MarketBarDayModel.start_at >= start_at,
+                MarketBarDayModel.start_at <= end_at,
+            ]
+            if cached:
+                conditions.append(_day_bar_date_runs_condition(MarketBarDayModel.start_at, uncached))
+            stmt = select(MarketBarDayModel).where(and_(*conditions)).order_by(MarketBarDayModel.start_at.asc())
+            limited = bool(limit) and not cached
+            if limited:
+                stmt = stmt.limit(limit)
+            rows = (await self._session.execute(stmt)).scalars().all()
+            loaded: dict[date, list[MarketBar]] = {}
+            for row in rows:
+                bar = market_bar_day_to_domain(row)
+                bars.append(bar)
+                loaded.setdefault(_day_bar_date(bar.start_at), []).append(bar)
+            cache.record_misses(len(uncached))
+            if not self._has_writes:
+                for trade_date, items in loaded.items():
+                    segment = build_final_bar_segment(
+                        trade_date=trade_date,
+                        bars=items,
+                        generation=generations.get(trade_date, 0),
+                    )
+                    if segment is not None:
+                        cache.put(segment)
+                if not limited:
+                    # Weekends, holidays and other past dates without a bar are cached as empty, so ranges
+                    # across them stay in memory; a later write bumps the date's generation. Only dates the
+                    # read covered end to end are known to be empty.
+                    today = _day_bar_date(datetime.now(tz=timezone.utc))
+                    for trade_date in uncached:
+                        if (
+                            trade_date < today
+                            and trade_date not in loaded
+                            and _day_bar_date_start(trade_date) >= start_at
+                            and _day_bar_date_start(trade_date + timedelta(days=1)) - _ONE_MICROSECOND <= end_at
+                        ):
+                            cache.put(
+                                build_empty_bar_segment(
+                                    ticker=ticker,
+                                    timespan="day",
+                                    trade_date=trade_date,
+                                    generation=generations.get(trade_date, 0),
+                                )
+                            )
+
+        if not cached:
+            return bars
+        bars.extend(_segment_bars(cached.values(), start_at=start_at, end_at=end_at, session=None))
+        bars.sort(key=lambda bar: bar.start_at)
+        return bars[:limit] if limit else bars
+
+    async def _list_minute_bars_cached(
+        self,
+        *,
+        cache: FinalBarSegmentCache,
+        generations: dict[date, int],
+        ticker: str,
+        start_at: datetime,
+        end_at: datetime,
+        limit: int | None,
+        session: str | None,
+    ) -> list[MarketBar]:
+        trade_dates = _trade_dates_between(start_at=start_at, end_at=end_at)
+        if not trade_dates:
+            return []
+        cached = cache.lookup(ticker=ticker, timespan="minute", trade_dates=trade_dates, generations=generations)
+        # Coverage is only consulted for past dates that missed the cache; the current trade date is
+        # still being written, so it keeps the plain narrow read.
+        today = _to_market_trade_date(datetime.now(tz=timezone.utc))
+        past = [trade_date for trade_date in trade_dates if trade_date not in cached and trade_date < today]
+        coverage = (
+            {
+                item.trade_date: item
+                for item in await self.list_minute_coverage(ticker=ticker, start_date=past[0], end_date=past[-1])
+            }
+            if past
+            else {}
+        )
+        empty: set[date] = set()
+        sealed: dict[date, int] = {}
+        for trade_date in past:
+            item = coverage.get(trade_date)
+            if item is None or not item.present:
+                empty.add(trade_date)
+            elif not item.present & ~item.final:
+                # Every stored minute is final, so the whole day is read once and cached.
+                sealed[trade_date] = item.present.bit_count()
+        mutable = [
+            trade_date
+            for trade_date in trade_dates
+            if trade_date not in cached and trade_date not in empty and trade_date not in sealed
+        ]
+
+        reads = []
+        if sealed:
+            reads.append(_trade_date_runs_condition(MarketBarMinuteModel.trade_date, sorted(sealed)))
+        if mutable:
+            conditions = [
+                MarketBarMinuteModel.start_at >= start_at,
+                MarketBarMinuteModel.start_at <= end_at,
+            ]
+            if cached or empty or sealed:
+                conditions.append(_trade_date_runs_condition(MarketBarMinuteModel.trade_date, mutable))
+            if session:
+                conditions.extend(_minute_session_conditions(session=session))
+            reads.append(and_(*conditions))
+
+        bars: list[MarketBar] = []
+        sealed_bars: dict[date, list[MarketBar]] = {}
+        if reads:
+            stmt = (
+                select(MarketBarMinuteModel)
+                .where(and_(MarketBarMinuteModel.ticker == ticker, or_(*reads)))
+                .order_by(MarketBarMinuteModel.start_at.asc())
+            )
+            if limit and not cached and not sealed:
+                stmt = stmt.limit(limit)
+            rows = (await self._session.execute(stmt)).scalars().all()
+            for row in rows:
+                bar = market_bar_minute_to_domain(row)
+                if row.trade_date in sealed:
+                    sealed_bars.setdefault(row.trade_date, []).append(bar)
+                else:
+                    bars.append(bar)
+        cache.record_misses(len(sealed) + len(mutable) + len(empty))
+
+        if not self._has_writes:
+            for trade_date in empty:
+                cache.put(
+                    build_empty_bar_segment(
+                        ticker=ticker,
+                        timespan="minute",
+                        trade_date=trade_date,
+                        generation=generations.get(trade_date, 0),
+                    )
+                )
+        for trade_date, items in sealed_bars.items():
+            if not self._has_writes and len(items) == sealed[trade_date]:
+                segment = build_final_bar_segment(
+                    trade_date=trade_date,
+                    bars=items,
+                    generation=generations.get(trade_date, 0),
+                )
+                if segment is not None:
+                    cache.put(segment)
+            bars.extend(
+                bar
+                for bar in items
+                if start_at <= bar.start_at <= end_at and _matches_minute_session(bar.start_at, session=session)
+            )
+
+        if not cached and not sealed_bars:
+            return bars
+        bars.extend(_segment_bars(cached.values(), start_at=start_at, end_at=end_at, session=session))
+        bars.sort(key=lambda bar: bar.start_at)
+        return bars[:limit] if limit else bars
+
     async def list_minute_agg_bars(
         self,
         *,
@@ -182,6 +446,53 @@ class SqlAlchemyMarketDataRepository:
             return None
         return result[0], result[1]
 
+    async def list_minute_coverage(
+        self,
+        *,
+        ticker: str,
+        start_date: date,
+        end_date: date,
+    ) -> list[MinuteCoverage]:
+        stmt = (
+            select(MarketBarMinuteCoverageModel)
+            .where(
+                and_(
+                    MarketBarMinuteCoverageModel.ticker == ticker,
+                    MarketBarMinuteCoverageModel.trade_date >= start_date,
+                    MarketBarMinuteCoverageModel.trade_date <= end_date,
+                )
+            )
+            .order_by(MarketBarMinuteCoverageModel.trade_date.asc())
+        )
+        rows = (await self._session.execute(stmt)).scalars().all()
+        return [minute_coverage_to_domain(row) for row in rows]
+
+    async def list_minute_agg_watermarks(
+        self,
+        *,
+        multipliers: list[int],
+        tickers: list[str],
+    ) -> dict[tuple[str, int], datetime]:
+        if not multipliers or not tickers:
+            return {}
+        stmt = (
+            select(
+                MarketBarMinuteAggModel.ticker,
+                MarketBarMinuteAggModel.multiplier,
+                func.max(MarketBarMinuteAggModel.bucket_end_at),
+            )
+            .where(
+                and_(
+                    MarketBarMinuteAggModel.multiplier.in_(multipliers),
+                    MarketBarMinuteAggModel.is_final.is_(True),
+                    MarketBarMinuteAggModel.ticker.in_(tickers),
+                )
+            )
+            .group_by(MarketBarMinuteAggModel.ticker, MarketBarMinuteAggModel.multiplier)
+        )
+        rows = (await self._session.execute(stmt)).all()
+        return {(row[0], row[1]): row[2] for row in rows if row[2] is not None}
+
     async def list_minute_tickers(
         self,
         *,
@@ -229,6 +540,7 @@ class SqlAlchemyMarketDataRepository:
     async def upsert_day_bars(self, bars: list[MarketBar]) -> None:
         if not bars:
             return
+        self._invalidate_final_segments(timespan="day", bars=bars)
 
         payload = [
             market_bar_to_day_row(
@@ -263,6 +575,7 @@ class SqlAlchemyMarketDataRepository:
     async def upsert_minute_bars(self, bars: list[MarketBar]) -> None:
         if not bars:
             return
+        self._invalidate_final_segments(timespan="minute", bars=bars)
 
         payload = [
             market_bar_to_minute_row(
@@ -293,6 +606,27 @@ class SqlAlchemyMarketDataRepository:
                 ),
             )
             await self._session.execute(stmt)
+        await self.upsert_minute_coverage(build_minute_coverage(bars))
+
+    async def upsert_minute_coverage(self, coverage: list[MinuteCoverage]) -> None:
+        if not coverage:
+            return
+        self._has_writes = True
+
+        payload = [minute_coverage_to_row(item) for item in coverage]
+        for chunk in _chunk_insert_payload(payload):
+            stmt = insert(MarketBarMinuteCoverageModel).values(chunk)
+            table = stmt.table.c
+            # Coverage only grows: a minute stays present/final once any writer has seen it so.
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["ticker", "trade_date"],
+                set_={
+                    "present_mask": table.present_mask.op("|")(stmt.excluded.present_mask),
+                    "final_mask": table.final_mask.op("|")(stmt.excluded.final_mask),
+                    "updated_at": func.now(),
+                },
+            )
+            await self._session.execute(stmt)
 
     async def upsert_minute_agg_bars(self, bars: list[MarketBar]) -> None:
         if not bars:
@@ -329,6 +663,14 @@ class SqlAlchemyMarketDataRepository:
             await self._session.execute(stmt)
 
     async def delete_minute_bars_before_trade_date(self, *, keep_from_trade_date: date) -> int:
+        self._has_writes = True
+        if self._final_bar_cache is not None:
+            self._final_bar_cache.discard_before(timespan="minute", trade_date=keep_from_trade_date)
+        await self._session.execute(
+            delete(MarketBarMinuteCoverageModel).where(
+                MarketBarMinuteCoverageModel.trade_date < keep_from_trade_date
+            )
+        )
         stmt = delete(MarketBarMinuteModel).where(MarketBarMinuteModel.trade_date < keep_from_trade_date)
         result = await self._session.execute(stmt)
         return int(result.rowcount or 0)
@@ -399,6 +741,27 @@ class SqlAlchemyMarketDataRepository:
             await self.upsert_minute_agg_bars(bars)
             return
 
+    async def publish_committed_writes(self) -> None:
+        # Called once the session has committed, so other processes drop the trade dates it wrote.
+        written, self._written = self._written, {}
+        if written and self._final_bar_generations is not None:
+            await self._final_bar_generations.bump(touched=written)
+
+    def discard_uncommitted_writes(self) -> None:
+        self._written = {}
+
+    def _invalidate_final_segments(self, *, timespan: str, bars: list[MarketBar]) -> None:
+        self._has_writes = True
+        if self._final_bar_cache is None:
+            return
+        segment_date = _day_bar_date if timespan == "day" else _to_market_trade_date
+        trade_dates_by_ticker: dict[str, set[date]] = {}
+        for bar in bars:
+            trade_dates_by_ticker.setdefault(bar.ticker, set()).add(segment_date(bar.start_at))
+        for ticker, trade_dates in trade_dates_by_ticker.items():
+            self._final_bar_cache.invalidate(ticker=ticker, timespan=timespan, trade_dates=trade_dates)
+            self._written.setdefault((ticker, timespan), set()).update(trade_dates)
+
 
 def _update_columns(
     stmt,
@@ -440,6 +803,90 @@ def _to_market_trade_date(start_at: datetime) -> date:
     return start_at.astimezone(_MARKET_TZ).date()
 
 
+def _trade_dates_between(*, start_at: datetime, end_at: datetime) -> list[date]:
+    first = _to_market_trade_date(start_at)
+    last = _to_market_trade_date(end_at)
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+def _day_bar_date(start_at: datetime) -> date:
+    if start_at.tzinfo is None:
+        return start_at.date()
+    return start_at.astimezone(timezone.utc).date()
+
+
+def _day_bar_date_start(trade_date: date) -> datetime:
+    return datetime.combine(trade_date, time.min, tzinfo=timezone.utc)
+
+
+def _day_bar_dates_between(*, start_at: datetime, end_at: datetime) -> list[date]:
+    first = _day_bar_date(start_at)
+    last = _day_bar_date(end_at)
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+def _date_runs(trade_dates: list[date]) -> list[tuple[date, date]]:
+    runs: list[tuple[date, date]] = []
+    run_start = run_end = trade_dates[0]
+    for trade_date in trade_dates[1:]:
+        if trade_date == run_end + timedelta(days=1):
+            run_end = trade_date
+            continue
+        runs.append((run_start, run_end))
+        run_start = run_end = trade_date
+    runs.append((run_start, run_end))
+    return runs
+
+
+def _trade_date_runs_condition(column, trade_dates: list[date]):
+    # Consecutive dates collapse into one BETWEEN so the condition stays short for long ranges.
+    return or_(
+        *(
+            column == run_start if run_start == run_end else column.between(run_start, run_end)
+            for run_start, run_end in _date_runs(trade_dates)
+        )
+    )
+
+
+def _day_bar_date_runs_condition(column, trade_dates: list[date]):
+    return or_(
+        *(
+            and_(column >= _day_bar_date_start(run_start), column < _day_bar_date_start(run_end + timedelta(days=1)))
+            for run_start, run_end in _date_runs(trade_dates)
+        )
+    )
+
+
+def _segment_bars(
+    segments: Iterable[FinalBarSegment],
+    *,
+    start_at: datetime,
+    end_at: datetime,
+    session: str | None,
+) -> list[MarketBar]:
+    bars: list[MarketBar] = []
+    for segment in segments:
+        segment_bars = segment.to_bars(start_at=start_at, end_at=end_at)
+        if session:
+            segment_bars = [bar for bar in segment_bars if _matches_minute_session(bar.start_at, session=session)]
+        bars.extend(segment_bars)
+    return bars
+
+
+def _matches_minute_session(start_at: datetime, *, session: str | None) -> bool:
+    # Python twin of _minute_session_conditions for bars served from memory.
+    if not session:
+        return True
+    local_time = start_at.astimezone(_MARKET_TZ).time()
+    if session == "regular":
+        return time(9, 30) <= local_time < time(16, 0)
+    if session == "pre":
+        return time(4, 0) <= local_time < time(9, 30)
+    if session == "night":
+        return local_time >= time(16, 0) or local_time < time(4, 0)
+    return True
+
+
 def _minute_session_conditions(*, session: str) -> list[object]:
     local_time = cast(func.timezone(str(_MARKET_TZ), MarketBarMinuteModel.start_at), Time)
     if session == "regular":
@@ -10,18 +10,44 @@ import redis.asyncio as redis
 
 logger = logging.getLogger(__name__)
 
+_TOPIC_PREFIX_BY_TYPE = {
+    "market.quote": "Q",
+    "market.trade": "T",
+}
+
 
 class RedisMarketEventPublisher:
-    def __init__(self, *, redis_url: str, channel: str) -> None:
+    # In sharded mode market events go to one channel per topic (`<channel>:T.AAPL`) and only
+    # system messages use the shared `<channel>` control channel.
+    def __init__(
+        self,
+        *,
+        redis_url: str,
+        channel: str,
+        sharded: bool = False,
+        max_batch_size: int = 200,
+    ) -> None:
         self._redis_url = redis_url
         self._channel = channel
+        self._sharded = sharded
+        self._max_batch_size = max(1, int(max_batch_size))
         self._client: redis.Redis | None = None
         self._lock = asyncio.Lock()
 
     async def publish(self, payload: dict[str, Any]) -> None:
-        message = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
         client = await self._get_client()
-        await client.publish(self._channel, message)
+        await client.publish(self._channel_for(payload), _encode_payload(payload))
+
+    async def publish_many(self, payloads: list[dict[str, Any]]) -> None:
+        # One pipelined round trip per `max_batch_size` messages; order within the batch is kept.
+        if not payloads:
+            return
+        client = await self._get_client()
+        for start in range(0, len(payloads), self._max_batch_size):
+            async with client.pipeline(transaction=False) as pipe:
+                for payload in payloads[start : start + self._max_batch_size]:
+                    pipe.publish(self._channel_for(payload), _encode_payload(payload))
+                await pipe.execute()
 
     async def close(self) -> None:
         client = self._client
@@ -29,6 +55,12 @@ class RedisMarketEventPublisher:
         if client is not None:
             await client.aclose()
 
+    def _channel_for(self, payload: dict[str, Any]) -> str:
+        if not self._sharded:
+            return self._channel
+        topic = market_event_topic(payload)
+        return topic_channel(self._channel, topic) if topic is not None else self._channel
+
     async def _get_client(self) -> redis.Redis:
         if self._client is not None:
             return self._client
@@ -39,9 +71,21 @@ class RedisMarketEventPublisher:
 
 
 class RedisMarketEventSubscriber:
-    def __init__(self, *, redis_url: str, channel: str) -> None:
+    def __init__(self, *, redis_url: str, channel: str, sharded: bool = False) -> None:
         self._redis_url = redis_url
         self._channel = channel
+        self._sharded = sharded
+        self._topics: set[str] = set()
+        self._subscribed_topics: set[str] = set()
+        self._pubsub: Any = None
+        self._subscription_lock = asyncio.Lock()
+
+    async def set_topics(self, topics: set[str]) -> None:
+        # Only the difference against the live subscription is sent to Redis.
+        self._topics = set(topics)
+        pubsub = self._pubsub
+        if pubsub is not None:
+            await self._apply_topics(pubsub)
 
     async def listen(
         self,
@@ -52,7 +96,10 @@ class RedisMarketEventSubscriber:
         client = redis.from_url(self._redis_url, decode_responses=False)
         pubsub = client.pubsub()
         await pubsub.subscribe(self._channel)
+        self._subscribed_topics = set()
+        self._pubsub = pubsub
         try:
+            await self._apply_topics(pubsub)
             while not stop_event.is_set():
                 message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
                 if not message:
@@ -65,12 +112,51 @@ class RedisMarketEventSubscriber:
                 except Exception:
                     logger.exception("Failed to handle redis market event payload")
         finally:
+            self._pubsub = None
             try:
-                await pubsub.unsubscribe(self._channel)
+                await pubsub.unsubscribe()
             finally:
                 await pubsub.close()
                 await client.aclose()
 
+    async def _apply_topics(self, pubsub: Any) -> None:
+        if not self._sharded:
+            return
+        async with self._subscription_lock:
+            desired = set(self._topics)
+            added = desired.difference(self._subscribed_topics)
+            removed = self._subscribed_topics.difference(desired)
+            if added:
+                await pubsub.subscribe(*(topic_channel(self._channel, topic) for topic in sorted(added)))
+            if removed:
+                await pubsub.unsubscribe(*(topic_channel(self._channel, topic) for topic in sorted(removed)))
+            self._subscribed_topics = desired
+
+
+def topic_channel(channel: str, topic: str) -> str:
+    return f"{channel}:{topic}"
+
+
+def market_event_topic(payload: dict[str, Any]) -> str | None:
+    message_type = str(payload.get("type", "")).strip().lower()
+    data = payload.get("data")
+    if not isinstance(data, dict):
+        return None
+    symbol = str(data.get("symbol", "")).strip().upper()
+    if not symbol:
+        return None
+    if message_type == "market.aggregate":
+        prefix = "AM" if str(data.get("timespan", "")).strip().lower() == "minute" else "A"
+    else:
+        prefix = _TOPIC_PREFIX_BY_TYPE.get(message_type)
+    if prefix is None:
+        return None
+    return f"{prefix}.{symbol}"
+
+
+def _encode_payload(payload: dict[str, Any]) -> str:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
 
 def _decode_message_payload(raw: object) -> dict[str, Any] | None:
     if raw is None:
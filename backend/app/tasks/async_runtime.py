@@ -38,6 +38,11 @@ async def _shutdown_async_runtime() -> None:
     await container.shutdown_auth_login_throttle()
     await container.shutdown_market_stream_hub()
     await container.shutdown_stock_market_realtime_publisher()
+    await container.shutdown_massive_client()
+    await container.shutdown_upstream_rate_budget()
+    await container.shutdown_bars_response_cache()
+    await container.shutdown_final_bar_generations()
+    await container.shutdown_market_data_fetch_lease()
     await container.shutdown_db_runtime()
 
 
@@ -11,6 +11,8 @@ from fastapi.testclient import TestClient
 from app.api.deps import get_current_user, get_market_data_service
 from app.api.errors import install_api_error_handlers
 from app.api.v1.router import api_router
+from app.application.market_data.entity_tags import entity_tag_for, entity_tag_matches
+from app.application.market_data.service import MarketBarsEncodedResult
 from app.domain.auth.schemas import User
 from app.domain.market_data.schemas import MarketBar
 
@@ -136,6 +138,18 @@ class FakeMarketDataService:
             partial_range=self.bars_partial_range,
         )
 
+    async def list_bars_encoded(self, *, encode, if_none_match=None, **kwargs) -> MarketBarsEncodedResult:
+        result = await self.list_bars_with_meta(**kwargs)
+        body = encode(result.bars)
+        etag = entity_tag_for(body=body, latest_at=result.bars[-1].start_at if result.bars else None)
+        return MarketBarsEncodedResult(
+            body="" if entity_tag_matches(if_none_match, etag) else body,
+            data_source=result.data_source,
+            partial_range=result.partial_range,
+            etag=etag,
+            not_modified=entity_tag_matches(if_none_match, etag),
+        )
+
     async def list_trading_days(
         self,
         *,
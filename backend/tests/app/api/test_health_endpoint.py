@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.router import api_router
+from app.application import container
+
+
+def test_market_data_health_reports_only_components_already_built() -> None:
+    container._minute_bucket_cache.cache_clear()
+    container._snapshot_coalescer.cache_clear()
+    app = FastAPI()
+    app.include_router(api_router)
+    client = TestClient(app)
+
+    assert client.get("/health/market-data").json()["components"].get("minute_bucket_cache") is None
+
+    cache = container._minute_bucket_cache()
+    assert cache is not None
+    try:
+        body = client.get("/health/market-data").json()
+        assert body["status"] == "ok"
+        assert body["components"]["minute_bucket_cache"] == {"hits": 0, "misses": 0, "evictions": 0, "entries": 0}
+        assert "snapshot_coalescer" not in body["components"]
+    finally:
+        container._minute_bucket_cache.cache_clear()
@@ -112,6 +112,40 @@ def test_bars_success_sets_contract_headers(api_client, market_data_service) ->
     assert market_data_service.list_bars_calls[0]["session"] == "regular"
 
 
+def test_bars_answers_matching_if_none_match_with_304(api_client) -> None:
+    params = {"ticker": "AAPL", "timespan": "day", "from": "2026-02-09", "to": "2026-02-10"}
+    first = api_client.get("/api/v1/market-data/bars", params=params)
+
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert first.json()[0]["close"] == 100.5
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    second = api_client.get("/api/v1/market-data/bars", params=params, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+
+    changed = api_client.get("/api/v1/market-data/bars", params=params, headers={"If-None-Match": '"stale"'})
+    assert changed.status_code == 200
+
+
+def test_snapshots_answers_matching_if_none_match_with_304(api_client) -> None:
+    first = api_client.get("/api/v1/market-data/snapshots", params={"tickers": "AAPL"})
+    etag = first.headers["ETag"]
+
+    second = api_client.get(
+        "/api/v1/market-data/snapshots",
+        params={"tickers": "AAPL"},
+        headers={"If-None-Match": f"W/{etag}"},
+    )
+
+    assert first.status_code == 200
+    assert first.json()["items"][0]["ticker"] == "AAPL"
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+
+
 def test_bars_rejects_invalid_session(api_client) -> None:
     response = api_client.get(
         "/api/v1/market-data/bars",
@@ -14,6 +14,7 @@ from app.api.deps import get_auth_service, get_market_data_service, get_market_s
 from app.api.errors import install_api_error_handlers
 from app.api.v1.endpoints import market_data_stream as stream_endpoint
 from app.api.v1.router import api_router
+from app.application.market_data.stream_frames import StreamFrame, encode_stream_frame
 from app.core.config import settings
 from app.domain.auth.schemas import User
 from app.domain.watchlist.schemas import WatchlistItem
@@ -57,7 +58,7 @@ class FakeStreamHub:
         self.subscription_calls: list[dict[str, Any]] = []
         self.registered_connections: set[str] = set()
         self.unregistered_connections: set[str] = set()
-        self._queues: dict[str, asyncio.Queue[dict[str, Any]]] = {}
+        self._queues: dict[str, asyncio.Queue[StreamFrame]] = {}
         self._status_message: str | None = None
         self._subscription_call_queue: queue.Queue[dict[str, Any]] = queue.Queue()
 
@@ -67,9 +68,9 @@ class FakeStreamHub:
     def current_status_message(self) -> str | None:
         return self._status_message
 
-    async def register_connection(self, *, connection_id: str, user_id: int) -> asyncio.Queue[dict[str, Any]]:
+    async def register_connection(self, *, connection_id: str, user_id: int) -> asyncio.Queue[StreamFrame]:
         _ = user_id
-        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        queue: asyncio.Queue[StreamFrame] = asyncio.Queue()
         self._queues[connection_id] = queue
         self.registered_connections.add(connection_id)
         return queue
@@ -96,8 +97,9 @@ class FakeStreamHub:
         self._subscription_call_queue.put_nowait(call)
 
     def push(self, payload: dict[str, Any]) -> None:
+        frame = encode_stream_frame(payload)
         for queue in self._queues.values():
-            queue.put_nowait(payload)
+            queue.put_nowait(frame)
 
     def next_subscription_call(self, *, timeout_seconds: float = 2.0) -> dict[str, Any]:
         return self._subscription_call_queue.get(timeout=timeout_seconds)
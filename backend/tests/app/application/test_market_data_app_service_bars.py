@@ -6,6 +6,7 @@ from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects.postgresql import insert
 
 from app.application.market_data.service import MarketDataApplicationService
+from app.domain.market_data.coverage import MinuteCoverage, build_minute_coverage
 from app.domain.market_data.schemas import MarketBar
 from app.infrastructure.db.models.market_data import MarketBarMinuteModel
 from app.infrastructure.repositories.market_data_repository import _update_columns
@@ -77,6 +78,13 @@ class FakeBarsRepo:
         self.list_minute_bars_calls += 1
         return [bar for bar in self._minute_bars if start_at <= bar.start_at <= end_at]
 
+    async def list_minute_coverage(self, *, ticker: str, start_date: date, end_date: date) -> list[MinuteCoverage]:
+        return [
+            item
+            for item in build_minute_coverage([bar for bar in self._minute_bars if bar.ticker == ticker])
+            if start_date <= item.trade_date <= end_date
+        ]
+
     async def upsert_minute_agg_bars(self, bars: list[MarketBar]) -> None:
         self.upserted_agg_bars = list(bars)
         self._minute_agg_bars = list(bars)
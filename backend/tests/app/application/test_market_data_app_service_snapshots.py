@@ -7,6 +7,7 @@ import pytest
 
 import app.application.market_data.service as market_data_service_module
 from app.application.market_data.service import MarketDataApplicationService
+from app.application.market_data.snapshot_state import SnapshotStateStore
 from app.application.market_data.trading_calendar import TradingCalendar
 from app.domain.market_data.schemas import MarketBar
 from app.domain.market_data.schemas import MarketSnapshot
@@ -33,6 +34,7 @@ class FakeUoW:
 class FakeSnapshotRepo:
     def __init__(self, bars_by_ticker: dict[str, list[MarketBar]]) -> None:
         self._bars_by_ticker = bars_by_ticker
+        self.batch_calls: list[list[str]] = []
 
     async def list_recent_day_bars(self, *, ticker: str, limit: int = 2) -> list[MarketBar]:
         items = list(self._bars_by_ticker.get(ticker, []))
@@ -41,6 +43,19 @@ class FakeSnapshotRepo:
             return []
         return items[-limit:]
 
+    async def list_recent_day_bars_for_tickers(
+        self,
+        *,
+        tickers: list[str],
+        limit: int = 2,
+    ) -> dict[str, list[MarketBar]]:
+        self.batch_calls.append(list(tickers))
+        return {
+            ticker: await self.list_recent_day_bars(ticker=ticker, limit=limit)
+            for ticker in tickers
+            if ticker in self._bars_by_ticker
+        }
+
 
 class FakeUoWWithRepo(FakeUoW):
     def __init__(self, repo: FakeSnapshotRepo) -> None:
@@ -374,3 +389,113 @@ async def test_list_snapshots_uses_db_baseline_for_non_trading_day() -> None:
     assert snapshot.change == pytest.approx(2.0)
     assert snapshot.change_pct == pytest.approx(1.0)
     assert snapshot.source == "DB"
+
+
+async def test_list_snapshots_loads_db_baselines_in_one_batch() -> None:
+    def _day_bar(ticker: str, day: int, close: float) -> MarketBar:
+        return MarketBar(
+            ticker=ticker,
+            timespan="day",
+            multiplier=1,
+            start_at=datetime(2026, 2, day, 0, 0, tzinfo=timezone.utc),
+            open=close - 1,
+            high=close + 1,
+            low=close - 2,
+            close=close,
+            volume=1000,
+        )
+
+    repo = FakeSnapshotRepo(
+        {
+            "AAPL": [_day_bar("AAPL", 19, 200.0), _day_bar("AAPL", 20, 202.0)],
+            "MSFT": [_day_bar("MSFT", 18, 390.0), _day_bar("MSFT", 19, 400.0), _day_bar("MSFT", 20, 396.0)],
+        }
+    )
+
+    class ShouldNotCallMassiveClient:
+        async def list_snapshots(self, *, tickers: list[str]) -> list[dict]:
+            raise AssertionError(f"Massive should not be called on non-trading day: {tickers}")
+
+        async def list_market_holidays(self) -> list[dict]:
+            return []
+
+    service = MarketDataApplicationService(
+        uow=FakeUoWWithRepo(repo),
+        massive_client=ShouldNotCallMassiveClient(),
+        trading_calendar=TradingCalendar(
+            massive_client=None,
+            today_provider=lambda: date(2026, 2, 22),  # Sunday
+        ),
+    )
+
+    result = await service.list_snapshots(tickers=["AAPL", "MSFT"])
+
+    assert repo.batch_calls == [["AAPL", "MSFT"]]
+    assert [(item.ticker, item.last) for item in result] == [("AAPL", 202.0), ("MSFT", 396.0)]
+    assert result[1].change == pytest.approx(-4.0)
+
+
+async def test_list_snapshots_serves_streamed_symbols_from_live_state(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class FrozenUtcDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):  # type: ignore[override]
+            if tz is None:
+                return cls(2026, 2, 24, 15, 0, 0)
+            return cls(2026, 2, 24, 15, 0, 0, tzinfo=tz)
+
+    def _day_bar(day: int, close: float) -> MarketBar:
+        return MarketBar(
+            ticker="AAPL",
+            timespan="day",
+            multiplier=1,
+            start_at=datetime(2026, 2, day, 0, 0, tzinfo=timezone.utc),
+            open=close,
+            high=close,
+            low=close,
+            close=close,
+            volume=1000,
+        )
+
+    monkeypatch.setattr(market_data_service_module, "datetime", FrozenUtcDateTime)
+    store = SnapshotStateStore(max_age_seconds=15.0)
+    store.apply_event(
+        {
+            "type": "market.aggregate",
+            "data": {
+                "symbol": "AAPL",
+                "event_ts": "2026-02-24T14:31:00Z",
+                "start_at": "2026-02-24T14:30:00Z",
+                "end_at": "2026-02-24T14:31:00Z",
+                "timespan": "minute",
+                "open": 201.0,
+                "high": 204.0,
+                "low": 200.5,
+                "close": 203.0,
+                "volume": 5000,
+            },
+        }
+    )
+    store.apply_event(
+        {"type": "market.trade", "data": {"symbol": "AAPL", "event_ts": "2026-02-24T14:59:58Z", "price": 205.0}}
+    )
+    client = FakeMassiveSnapshotClient()
+    client.payload = [dict(client.payload[0], ticker="NVDA")]
+    service = MarketDataApplicationService(
+        uow=FakeUoWWithRepo(FakeSnapshotRepo({"AAPL": [_day_bar(20, 196.0), _day_bar(23, 200.0)]})),
+        massive_client=client,
+        trading_calendar=FakeTradingDayCalendar(trading_day=True, market_open=True),  # type: ignore[arg-type]
+        snapshot_state=store,
+    )
+
+    result = await service.list_snapshots(tickers=["AAPL", "NVDA"])
+
+    # Only the symbol the stream does not cover goes upstream; AAPL changes against the stored 02-23 close.
+    assert client.calls == [["NVDA"]]
+    live = result[0]
+    assert (live.ticker, live.source, live.market_status) == ("AAPL", "WS", "open")
+    assert (live.last, live.open, live.high, live.low, live.volume) == (205.0, 201.0, 204.0, 200.5, 5000)
+    assert live.change == pytest.approx(5.0)
+    assert live.change_pct == pytest.approx(2.5)
+    assert result[1].ticker == "NVDA"
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.application.market_data.single_flight import SingleFlightRegistry
+
+
+async def test_single_flight_registry_coalesces_concurrent_work_for_same_key() -> None:
+    registry: SingleFlightRegistry[int] = SingleFlightRegistry()
+    calls = 0
+
+    async def work() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(registry.run(key=("AAPL", "minute"), work=work) for _ in range(3)))
+
+    assert results == [42, 42, 42]
+    assert calls == 1
+    stats = registry.stats()
+    assert (stats.hits, stats.misses, stats.in_flight) == (2, 1, 0)
+
+
+async def test_single_flight_registry_runs_distinct_keys_independently() -> None:
+    registry: SingleFlightRegistry[str] = SingleFlightRegistry()
+
+    async def work_for(symbol: str) -> str:
+        await asyncio.sleep(0)
+        return symbol
+
+    first, second = await asyncio.gather(
+        registry.run(key="AAPL", work=lambda: work_for("AAPL")),
+        registry.run(key="MSFT", work=lambda: work_for("MSFT")),
+    )
+
+    assert (first, second) == ("AAPL", "MSFT")
+    assert registry.stats().misses == 2
+
+
+async def test_single_flight_registry_propagates_errors_and_allows_retry() -> None:
+    registry: SingleFlightRegistry[int] = SingleFlightRegistry()
+    attempts = 0
+
+    async def flaky() -> int:
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0)
+        if attempts == 1:
+            raise RuntimeError("upstream failed")
+        return attempts
+
+    with pytest.raises(RuntimeError):
+        await registry.run(key="AAPL", work=flaky)
+    await asyncio.sleep(0)
+
+    assert await registry.run(key="AAPL", work=flaky) == 2
+    assert registry.stats().in_flight == 0
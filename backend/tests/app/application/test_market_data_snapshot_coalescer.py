@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.application.market_data.snapshot_coalescer import SnapshotRequestCoalescer
+
+
+class RecordingSnapshotClient:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+        self.error: Exception | None = None
+        self.release: asyncio.Event | None = None
+
+    async def list_snapshots(self, *, tickers: list[str]) -> list[dict]:
+        self.calls.append(tickers)
+        if self.release is not None:
+            await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return [{"ticker": ticker, "last_trade": {"price": 100.0}} for ticker in tickers if ticker != "GONE"]
+
+
+async def test_coalescer_merges_concurrent_demands_into_one_upstream_call() -> None:
+    current = 0.0
+    client = RecordingSnapshotClient()
+    coalescer = SnapshotRequestCoalescer(
+        client=client,
+        window_seconds=0.01,
+        ttl_seconds=1.0,
+        time_provider=lambda: current,
+    )
+
+    first, second, third = await asyncio.gather(
+        coalescer.list_snapshots(tickers=["AAPL", "NVDA"]),
+        coalescer.list_snapshots(tickers=["nvda", "SPY"]),
+        coalescer.list_snapshots(tickers=["GONE", "AAPL"]),
+    )
+
+    assert client.calls == [["AAPL", "GONE", "NVDA", "SPY"]]
+    assert [item["ticker"] for item in first] == ["AAPL", "NVDA"]
+    assert [item["ticker"] for item in second] == ["NVDA", "SPY"]
+    assert [item["ticker"] for item in third] == ["AAPL"]
+
+    # Inside the TTL every symbol, including the one upstream had nothing for, is served locally.
+    repeat = await coalescer.list_snapshots(tickers=["SPY", "GONE"])
+    assert [item["ticker"] for item in repeat] == ["SPY"]
+    assert len(client.calls) == 1
+
+    current = 1.5
+    await coalescer.list_snapshots(tickers=["SPY"])
+    assert client.calls[-1] == ["SPY"]
+    stats = coalescer.stats()
+    assert (stats.requests, stats.upstream_calls, stats.upstream_tickers, stats.fresh_hits) == (5, 2, 5, 2)
+
+
+async def test_coalescer_shares_failures_and_survives_cancelled_callers() -> None:
+    client = RecordingSnapshotClient()
+    client.release = asyncio.Event()
+    client.error = RuntimeError("MARKET_DATA_UPSTREAM_UNAVAILABLE")
+    coalescer = SnapshotRequestCoalescer(client=client, window_seconds=0.0, ttl_seconds=1.0)
+
+    cancelled = asyncio.create_task(coalescer.list_snapshots(tickers=["AAPL"]))
+    waiting = asyncio.create_task(coalescer.list_snapshots(tickers=["AAPL"]))
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+    client.release.set()
+
+    with pytest.raises(RuntimeError, match="MARKET_DATA_UPSTREAM_UNAVAILABLE"):
+        await waiting
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert client.calls == [["AAPL"]]
+
+    client.error = None
+    assert [item["ticker"] for item in await coalescer.list_snapshots(tickers=["AAPL"])] == ["AAPL"]
+    assert len(client.calls) == 2
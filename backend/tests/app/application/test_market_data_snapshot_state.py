@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+from app.application.market_data.snapshot_state import SnapshotStateStore
+from app.domain.market_data.schemas import MarketSnapshot
+
+
+def _minute_bar(symbol: str, start: str, end: str, *, high: float, low: float, close: float, volume: int) -> dict:
+    return {
+        "type": "market.aggregate",
+        "data": {
+            "symbol": symbol,
+            "event_ts": end,
+            "start_at": start,
+            "end_at": end,
+            "timespan": "minute",
+            "open": close - 0.5,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+        },
+    }
+
+
+def test_snapshot_state_requires_a_complete_session_and_a_recent_event() -> None:
+    store = SnapshotStateStore(max_age_seconds=10.0)
+    trade_date = date(2026, 2, 24)
+    as_of = datetime(2026, 2, 24, 15, 2, 5, tzinfo=timezone.utc)
+
+    # Joined mid-session: last price is tracked but the session totals cannot be trusted yet.
+    store.apply_event(
+        _minute_bar("NVDA", "2026-02-24T15:00:00Z", "2026-02-24T15:01:00Z", high=9, low=8, close=8.5, volume=10)
+    )
+    assert store.get(symbol="NVDA", trade_date=trade_date, as_of=as_of) is None
+
+    store.seed(
+        MarketSnapshot(
+            ticker="NVDA",
+            last=8.4,
+            change=0.0,
+            change_pct=0.0,
+            open=7.5,
+            high=9.2,
+            low=7.1,
+            volume=1000,
+            updated_at=datetime(2026, 2, 24, 15, 1, 30, tzinfo=timezone.utc),
+            market_status="open",
+        )
+    )
+    store.apply_event(
+        _minute_bar("NVDA", "2026-02-24T15:01:00Z", "2026-02-24T15:02:00Z", high=9.5, low=8, close=9.4, volume=25)
+    )
+    live = store.get(symbol="NVDA", trade_date=trade_date, as_of=as_of)
+    assert live is not None
+    assert (live.open, live.high, live.low, live.volume, live.last) == (7.5, 9.5, 7.1, 1025, 9.4)
+
+    # A trade stamped before the latest known price does not move it back.
+    store.apply_event(
+        {"type": "market.trade", "data": {"symbol": "NVDA", "event_ts": "2026-02-24T15:00:30Z", "price": 8.0}}
+    )
+    assert store.get(symbol="NVDA", trade_date=trade_date, as_of=as_of).last == 9.4  # type: ignore[union-attr]
+
+    # Age is measured from event time, so the late trade does not keep the symbol fresh.
+    later = datetime(2026, 2, 24, 15, 2, 11, tzinfo=timezone.utc)
+    assert store.get(symbol="NVDA", trade_date=trade_date, as_of=later) is None
+    assert store.get(symbol="NVDA", trade_date=date(2026, 2, 25), as_of=later) is None
+
+    stats = store.stats()
+    assert (stats.events, stats.symbols, stats.hits, stats.misses) == (3, 1, 2, 3)
+
+
+def test_snapshot_state_starts_a_fresh_session_on_a_new_trade_date() -> None:
+    store = SnapshotStateStore(max_age_seconds=10.0)
+    as_of = datetime(2026, 2, 24, 14, 31, 5, tzinfo=timezone.utc)
+
+    store.apply_event(
+        _minute_bar("SPY", "2026-02-23T14:30:00Z", "2026-02-23T14:31:00Z", high=501, low=499, close=500, volume=7)
+    )
+    store.apply_event(
+        _minute_bar("SPY", "2026-02-24T14:30:00Z", "2026-02-24T14:31:00Z", high=511, low=509, close=510, volume=3)
+    )
+    # Late events from the previous session are dropped.
+    store.apply_event(
+        _minute_bar("SPY", "2026-02-23T20:59:00Z", "2026-02-23T21:00:00Z", high=520, low=490, close=505, volume=9)
+    )
+
+    assert store.get(symbol="SPY", trade_date=date(2026, 2, 23), as_of=as_of) is None
+    live = store.get(symbol="SPY", trade_date=date(2026, 2, 24), as_of=as_of)
+    assert live is not None
+    assert (live.open, live.high, live.low, live.volume, live.last) == (509.5, 511, 509, 3, 510)
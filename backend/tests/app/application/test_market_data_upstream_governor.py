@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+import redis
+
+from app.application.market_data.errors import MarketDataRateLimitedError
+from app.application.market_data.upstream_governor import (
+    UPSTREAM_PRIORITY_INTERACTIVE,
+    UPSTREAM_PRIORITY_MAINTENANCE,
+    UPSTREAM_PRIORITY_PREFETCH,
+    GovernedMassiveClient,
+    TokenBucket,
+    UpstreamRateGovernor,
+    current_upstream_priority,
+    upstream_priority,
+)
+from app.infrastructure.coordination import redis_rate_budget
+from app.infrastructure.coordination.redis_rate_budget import RedisRateBudget
+
+
+class ManualBudget:
+    def __init__(self, tokens: int) -> None:
+        self.tokens = tokens
+        self.reserves: list[float] = []
+
+    async def try_acquire(self, *, reserve: float = 0.0) -> float:
+        self.reserves.append(reserve)
+        if self.tokens >= 1 + reserve:
+            self.tokens -= 1
+            return 0.0
+        return 0.01
+
+
+def test_token_bucket_refills_and_keeps_reserve() -> None:
+    current = 0.0
+    bucket = TokenBucket(rate_per_second=2, burst=2, time_provider=lambda: current)
+
+    assert asyncio.run(bucket.try_acquire()) == 0.0
+    assert asyncio.run(bucket.try_acquire(reserve=1)) == pytest.approx(0.5)
+    assert asyncio.run(bucket.try_acquire()) == 0.0
+    assert asyncio.run(bucket.try_acquire()) == pytest.approx(0.5)
+
+    current = 0.5
+    assert asyncio.run(bucket.try_acquire()) == 0.0
+
+
+async def test_governor_grants_interactive_before_queued_background_calls() -> None:
+    budget = ManualBudget(tokens=0)
+    governor = UpstreamRateGovernor(budget=budget)
+    granted: list[str] = []
+
+    async def _call(priority: str) -> None:
+        await governor.acquire(priority=priority)
+        granted.append(priority)
+
+    maintenance = asyncio.create_task(_call(UPSTREAM_PRIORITY_MAINTENANCE))
+    prefetch = asyncio.create_task(_call(UPSTREAM_PRIORITY_PREFETCH))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(_call(UPSTREAM_PRIORITY_INTERACTIVE))
+    await asyncio.sleep(0.02)
+    assert granted == []
+
+    budget.tokens = 3
+    await asyncio.gather(maintenance, prefetch, interactive)
+
+    assert granted == [UPSTREAM_PRIORITY_INTERACTIVE, UPSTREAM_PRIORITY_PREFETCH, UPSTREAM_PRIORITY_MAINTENANCE]
+    stats = governor.stats()
+    assert stats[UPSTREAM_PRIORITY_INTERACTIVE].granted == 1
+    assert stats[UPSTREAM_PRIORITY_MAINTENANCE].max_wait_seconds > 0
+    assert all(item.waiting == 0 for item in stats.values())
+
+
+async def test_governor_keeps_reserve_for_interactive_calls() -> None:
+    budget = ManualBudget(tokens=2)
+    governor = UpstreamRateGovernor(budget=budget, interactive_reserve=2)
+
+    with pytest.raises(MarketDataRateLimitedError):
+        await governor.acquire(priority=UPSTREAM_PRIORITY_PREFETCH, deadline=asyncio.get_running_loop().time() + 0.03)
+    await governor.acquire(priority=UPSTREAM_PRIORITY_INTERACTIVE)
+
+    assert budget.tokens == 1
+    assert 2 in budget.reserves
+    assert governor.stats()[UPSTREAM_PRIORITY_PREFETCH].timed_out == 1
+
+
+async def test_governed_client_uses_priority_from_context() -> None:
+    seen: list[str] = []
+
+    class StubMassiveClient:
+        async def list_market_holidays(self) -> list[dict]:
+            seen.append(current_upstream_priority())
+            return []
+
+    governor = UpstreamRateGovernor(budget=ManualBudget(tokens=5))
+    client = GovernedMassiveClient(client=StubMassiveClient(), governor=governor)
+
+    await client.list_market_holidays()
+    with upstream_priority(UPSTREAM_PRIORITY_MAINTENANCE):
+        await client.list_market_holidays()
+
+    stats = governor.stats()
+    assert seen == [UPSTREAM_PRIORITY_INTERACTIVE, UPSTREAM_PRIORITY_MAINTENANCE]
+    assert stats[UPSTREAM_PRIORITY_INTERACTIVE].granted == 1
+    assert stats[UPSTREAM_PRIORITY_MAINTENANCE].granted == 1
+
+
+async def test_redis_rate_budget_falls_back_to_local_bucket() -> None:
+    class BrokenRedisClient:
+        def register_script(self, script: str):
+            async def _run(*, keys: list[str], args: list[str]) -> int:
+                raise redis.ConnectionError("redis unavailable")
+
+            return _run
+
+    fallback = ManualBudget(tokens=1)
+    budget = RedisRateBudget(
+        redis_url="redis://unused",
+        rate_per_second=1,
+        burst=1,
+        fallback=fallback,
+        client=BrokenRedisClient(),  # type: ignore[arg-type]
+    )
+
+    assert await budget.try_acquire() == 0.0
+    assert await budget.try_acquire() > 0
+
+
+async def test_redis_rate_budget_reuses_one_client_and_registered_script(monkeypatch) -> None:
+    class CountingRedisClient:
+        def __init__(self) -> None:
+            self.registered: list[str] = []
+            self.calls: list[tuple[list[str], list[str]]] = []
+            self.closed = False
+
+        def register_script(self, script: str):
+            self.registered.append(script)
+
+            async def _run(*, keys: list[str], args: list[str]) -> int:
+                self.calls.append((keys, args))
+                return 0
+
+            return _run
+
+        async def aclose(self) -> None:
+            self.closed = True
+
+    clients: list[CountingRedisClient] = []
+
+    def _from_url(*args: object, **kwargs: object) -> CountingRedisClient:
+        clients.append(CountingRedisClient())
+        return clients[-1]
+
+    monkeypatch.setattr(redis_rate_budget.redis.Redis, "from_url", _from_url)
+    budget = RedisRateBudget(redis_url="redis://test", rate_per_second=10, burst=5, key="budget")
+
+    await asyncio.gather(*(budget.try_acquire() for _ in range(3)))
+    await budget.try_acquire(reserve=2)
+    await budget.close()
+
+    assert len(clients) == 1
+    assert len(clients[0].registered) == 1
+    assert clients[0].calls[-1] == (["budget"], ["10.0", "5", "2"])
+    assert len(clients[0].calls) == 4
+    assert clients[0].closed
@@ -32,6 +32,7 @@ class FakeUpstreamClient:
 class FakeEventPublisher:
     def __init__(self) -> None:
         self.published: list[dict[str, Any]] = []
+        self.batches: list[list[dict[str, Any]]] = []
         self.closed = False
         self.unavailable_error_published = asyncio.Event()
 
@@ -43,6 +44,10 @@ class FakeEventPublisher:
         ):
             self.unavailable_error_published.set()
 
+    async def publish_many(self, payloads: list[dict[str, Any]]) -> None:
+        self.batches.append(list(payloads))
+        self.published.extend(payloads)
+
     async def close(self) -> None:
         self.closed = True
 
@@ -221,6 +226,31 @@ def test_realtime_publisher_publishes_market_events_and_status() -> None:
     asyncio.run(scenario())
 
 
+def test_realtime_publisher_flushes_each_upstream_frame_as_one_batch() -> None:
+    async def scenario() -> None:
+        publisher = FakeEventPublisher()
+        service = StockMarketRealtimePublisher(
+            upstream_client=FakeUpstreamClient(),
+            event_publisher=publisher,
+            topic_registry=FakeTopicRegistry(),
+            reconcile_interval_seconds=1,
+        )
+
+        await service._handle_upstream_events(
+            [
+                {"ev": "T", "sym": "AAPL", "t": 1_739_969_401_000, "p": 201.2},
+                {"ev": "status", "message": "ignored"},
+                {"ev": "T", "sym": "MSFT", "t": 1_739_969_401_500, "p": 410.0},
+            ]
+        )
+        await service._handle_upstream_events([{"ev": "status", "message": "ignored"}])
+
+        assert [[item["data"]["symbol"] for item in batch] for batch in publisher.batches] == [["AAPL", "MSFT"]]
+        assert (service._events_in_total, service._events_published_total, service._events_dropped_total) == (4, 2, 2)
+
+    asyncio.run(scenario())
+
+
 def test_realtime_publisher_entitlement_error_degrades_without_unavailable_error() -> None:
     async def scenario() -> None:
         upstream = FakeUpstreamClient()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.application.market_data.stream_buffer import ConflatingStreamBuffer
+from app.application.market_data.stream_frames import encode_stream_frame
+
+
+def _quote(symbol: str, bid: float):
+    return encode_stream_frame({"type": "market.quote", "data": {"symbol": symbol, "bid": bid}})
+
+
+def _trade(symbol: str, price: float):
+    return encode_stream_frame({"type": "market.trade", "data": {"symbol": symbol, "price": price}})
+
+
+def _second_bar(symbol: str, close: float):
+    return encode_stream_frame(
+        {"type": "market.aggregate", "data": {"symbol": symbol, "timespan": "second", "close": close}}
+    )
+
+
+def _drain(buffer: ConflatingStreamBuffer) -> list[tuple[str, str, float]]:
+    drained = []
+    while not buffer.empty():
+        payload = buffer.get_nowait().payload
+        data = payload["data"]
+        drained.append((payload["type"], data["symbol"], data.get("bid", data.get("price", data.get("close")))))
+    return drained
+
+
+def test_buffer_conflates_quotes_and_second_bars_but_keeps_trades_ordered() -> None:
+    buffer = ConflatingStreamBuffer(max_ordered=64)
+    for index in range(100):
+        buffer.put_nowait(_quote("AAPL", float(index)))
+        buffer.put_nowait(_trade("AAPL", float(index)))
+        buffer.put_nowait(_second_bar("AAPL", float(index)))
+        if index >= 97:
+            buffer.put_nowait(_quote("MSFT", float(index)))
+
+    drained = _drain(buffer)
+
+    # One slot per conflated topic at its first position, carrying the newest value.
+    assert drained[0] == ("market.quote", "AAPL", 99.0)
+    assert ("market.aggregate", "AAPL", 99.0) in drained
+    assert [item for item in drained if item[1] == "MSFT"] == [("market.quote", "MSFT", 99.0)]
+    trades = [item[2] for item in drained if item[0] == "market.trade"]
+    assert trades == [float(index) for index in range(36, 100)]
+    assert (buffer.conflated, buffer.dropped) == (99 + 99 + 2, 36)
+    with pytest.raises(asyncio.QueueEmpty):
+        buffer.get_nowait()
+
+
+async def test_buffer_caps_updates_per_second_per_symbol() -> None:
+    current = 10.0
+    buffer = ConflatingStreamBuffer(max_ordered=64, max_updates_per_second=20.0, time_provider=lambda: current)
+
+    buffer.put_nowait(_quote("AAPL", 1.0))
+    assert (await buffer.get()).payload["data"]["bid"] == 1.0
+
+    buffer.put_nowait(_quote("AAPL", 2.0))
+    buffer.put_nowait(_trade("AAPL", 3.0))
+    # The quote is inside its 50ms window, so the trade goes first and the quote waits.
+    assert (await buffer.get()).payload["type"] == "market.trade"
+    buffer.put_nowait(_quote("AAPL", 4.0))
+
+    current = 10.05
+    frame = await asyncio.wait_for(buffer.get(), timeout=1.0)
+    assert frame.payload["data"]["bid"] == 4.0
+    assert buffer.empty()
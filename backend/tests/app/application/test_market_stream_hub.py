@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 
 import pytest
 
@@ -34,8 +35,21 @@ class SlowSingleTopicRegistry(FakeTopicRegistry):
         await super().update_topics(instance_id=instance_id, topics=topics)
 
 
-class FlakySubscriber:
+class PassiveSubscriber:
     def __init__(self) -> None:
+        self.topic_updates: list[set[str]] = []
+
+    async def listen(self, *, stop_event: asyncio.Event, on_message: object) -> None:
+        _ = on_message
+        await stop_event.wait()
+
+    async def set_topics(self, topics: set[str]) -> None:
+        self.topic_updates.append(set(topics))
+
+
+class FlakySubscriber(PassiveSubscriber):
+    def __init__(self) -> None:
+        super().__init__()
         self.listen_calls = 0
         self.second_listen_seen = asyncio.Event()
 
@@ -48,12 +62,6 @@ class FlakySubscriber:
         await stop_event.wait()
 
 
-class PassiveSubscriber:
-    async def listen(self, *, stop_event: asyncio.Event, on_message: object) -> None:
-        _ = on_message
-        await stop_event.wait()
-
-
 def test_stream_hub_fanout_respects_symbol_and_channel_from_bus() -> None:
     async def scenario() -> None:
         hub = StockMarketStreamHub(
@@ -133,8 +141,8 @@ def test_stream_hub_fanout_respects_symbol_and_channel_from_bus() -> None:
             }
         )
 
-        queue_1_messages = [queue_1.get_nowait(), queue_1.get_nowait()]
-        queue_2_messages = [queue_2.get_nowait()]
+        queue_1_messages = [queue_1.get_nowait().payload, queue_1.get_nowait().payload]
+        queue_2_messages = [queue_2.get_nowait().payload]
 
         assert [message["type"] for message in queue_1_messages] == [
             "market.quote",
@@ -150,6 +158,56 @@ def test_stream_hub_fanout_respects_symbol_and_channel_from_bus() -> None:
     asyncio.run(scenario())
 
 
+def test_stream_hub_subscriber_index_follows_resubscribe_and_unregister() -> None:
+    async def scenario() -> None:
+        hub = StockMarketStreamHub(
+            event_subscriber=None,
+            topic_registry=None,
+            instance_id="gw-test",
+            queue_size=32,
+        )
+        queue_1 = await hub.register_connection(connection_id="c1", user_id=1)
+        queue_2 = await hub.register_connection(connection_id="c2", user_id=2)
+        await hub.set_connection_subscription(connection_id="c1", symbols={"AAPL", "NVDA"}, channels={"trade"})
+        await hub.set_connection_subscription(connection_id="c2", symbols={"AAPL"}, channels={"trade"})
+        index_before = hub._subscribers
+
+        await hub.set_connection_subscription(connection_id="c1", symbols={"NVDA"}, channels={"trade"})
+        await hub.unregister_connection(connection_id="c2")
+
+        # Earlier snapshots are never mutated in place, so a dispatch holding one stays consistent.
+        assert index_before[("trade", "AAPL")] == (queue_1, queue_2)
+        assert hub._subscribers == {("trade", "NVDA"): (queue_1,)}
+
+        for symbol in ("AAPL", "NVDA"):
+            await hub._handle_bus_message(
+                {"type": "market.trade", "ts": "2026-02-19T13:00:00Z", "data": {"symbol": symbol, "price": 1.0}}
+            )
+        assert queue_1.get_nowait().payload["data"]["symbol"] == "NVDA"
+        assert queue_1.empty() and queue_2.empty()
+        await hub.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_stream_hub_encodes_each_event_once_for_all_subscribers() -> None:
+    async def scenario() -> None:
+        hub = StockMarketStreamHub(event_subscriber=None, topic_registry=None, instance_id="gw-test", queue_size=32)
+        queues = [await hub.register_connection(connection_id=f"c{index}", user_id=index) for index in range(3)]
+        for index in range(3):
+            await hub.set_connection_subscription(connection_id=f"c{index}", symbols={"SPY"}, channels={"trade"})
+
+        payload = {"type": "market.trade", "ts": "2026-02-19T13:00:00Z", "data": {"symbol": "SPY", "price": 1.5}}
+        await hub._handle_bus_message(payload)
+
+        frames = [queue.get_nowait() for queue in queues]
+        assert all(frame is frames[0] for frame in frames)
+        assert json.loads(frames[0].text) == payload
+        await hub.shutdown()
+
+    asyncio.run(scenario())
+
+
 def test_stream_hub_syncs_topics_to_registry() -> None:
     async def scenario() -> None:
         topic_registry = FakeTopicRegistry()
@@ -176,6 +234,33 @@ def test_stream_hub_syncs_topics_to_registry() -> None:
     asyncio.run(scenario())
 
 
+def test_stream_hub_keeps_bus_subscriptions_in_step_with_topic_refcounts() -> None:
+    async def scenario() -> None:
+        subscriber = PassiveSubscriber()
+        hub = StockMarketStreamHub(
+            event_subscriber=subscriber,
+            topic_registry=None,
+            instance_id="gw-bus-topics",
+            max_symbols_per_connection=100,
+            queue_size=32,
+            registry_refresh_seconds=60,
+        )
+        await hub.register_connection(connection_id="c1", user_id=1)
+        await hub.register_connection(connection_id="c2", user_id=2)
+        await hub.set_connection_subscription(connection_id="c1", symbols={"AAPL"}, channels={"trade"})
+        await hub.set_connection_subscription(connection_id="c2", symbols={"AAPL", "MSFT"}, channels={"trade"})
+        assert subscriber.topic_updates[-1] == {"T.AAPL", "T.MSFT"}
+
+        # AAPL is still referenced by c1, so only MSFT leaves the bus subscription.
+        await hub.unregister_connection(connection_id="c2")
+        assert subscriber.topic_updates[-1] == {"T.AAPL"}
+
+        await hub.shutdown()
+        assert subscriber.topic_updates[-1] == set()
+
+    asyncio.run(scenario())
+
+
 def test_stream_hub_registry_sync_uses_latest_topics_under_concurrency() -> None:
     async def scenario() -> None:
         topic_registry = SlowSingleTopicRegistry()
@@ -239,7 +324,7 @@ def test_stream_hub_broadcasts_system_status_and_updates_latency() -> None:
             }
         )
         assert hub.current_latency() == "real-time"
-        queue_2_status = queue_2.get_nowait()
+        queue_2_status = queue_2.get_nowait().payload
         assert queue_2_status["type"] == "system.status"
 
         await hub._handle_bus_message(
@@ -253,7 +338,7 @@ def test_stream_hub_broadcasts_system_status_and_updates_latency() -> None:
                 },
             }
         )
-        queue_2_error = queue_2.get_nowait()
+        queue_2_error = queue_2.get_nowait().payload
         assert queue_2_error["type"] == "system.error"
         await hub.shutdown()
 
@@ -293,7 +378,7 @@ def test_stream_hub_restarts_subscriber_after_crash() -> None:
         )
 
         queue = await hub.register_connection(connection_id="c1", user_id=1)
-        status_payload = await asyncio.wait_for(queue.get(), timeout=1.0)
+        status_payload = (await asyncio.wait_for(queue.get(), timeout=1.0)).payload
         assert status_payload["type"] == "system.status"
         assert status_payload["data"]["latency"] == "delayed"
         assert status_payload["data"]["connection_state"] == "reconnecting"
@@ -346,7 +431,7 @@ def test_stream_hub_delayed_mode_blocks_quote_and_marks_status_as_delayed() -> N
                 },
             }
         )
-        status_payload = queue.get_nowait()
+        status_payload = queue.get_nowait().payload
         assert status_payload["data"]["latency"] == "delayed"
         assert status_payload["data"]["connection_state"] == "connected"
         assert status_payload["data"]["message"] == "delayed 15min"
@@ -362,7 +447,7 @@ def test_stream_hub_delayed_mode_blocks_quote_and_marks_status_as_delayed() -> N
                 },
             }
         )
-        trade_payload = queue.get_nowait()
+        trade_payload = queue.get_nowait().payload
         assert trade_payload["type"] == "market.trade"
 
         await hub._handle_bus_message(
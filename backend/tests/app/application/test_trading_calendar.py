@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 import threading
 
 import app.application.market_data.trading_calendar as trading_calendar_module
@@ -196,3 +196,216 @@ def test_holiday_override_cache_refresh_is_safe_across_event_loops() -> None:
 
     assert errors == []
     assert calendar.session_minutes(target_date=date(2026, 2, 26)) == 210
+
+
+def _reference_is_trading_day(calendar: TradingCalendar, target_date: date) -> bool:
+    bounds = calendar._resolve_session_bounds(
+        target_date=target_date,
+        overrides=calendar._holiday_overrides,
+        today=calendar._today_provider(),
+    )
+    return bounds is not None and int((bounds[1] - bounds[0]).total_seconds() // 60) > 0
+
+
+def _reference_session_minutes(calendar: TradingCalendar, target_date: date) -> int:
+    bounds = calendar._resolve_session_bounds(
+        target_date=target_date,
+        overrides=calendar._holiday_overrides,
+        today=calendar._today_provider(),
+    )
+    if bounds is None:
+        return 0
+    return max(0, int((bounds[1] - bounds[0]).total_seconds() // 60))
+
+
+def _reference_align(calendar: TradingCalendar, target_date: date) -> date:
+    cursor = target_date
+    while not _reference_is_trading_day(calendar, cursor):
+        cursor -= timedelta(days=1)
+    return cursor
+
+
+def _reference_shift(calendar: TradingCalendar, target_date: date, trading_days: int) -> date:
+    cursor = _reference_align(calendar, target_date)
+    step = 1 if trading_days > 0 else -1
+    remaining = abs(trading_days)
+    while remaining > 0:
+        cursor += timedelta(days=step)
+        if _reference_is_trading_day(calendar, cursor):
+            remaining -= 1
+    return cursor
+
+
+def _reference_count_minutes(calendar: TradingCalendar, start_date: date, end_date: date, cap: int | None) -> int:
+    total = 0
+    cursor = start_date
+    while cursor <= end_date:
+        total += _reference_session_minutes(calendar, cursor)
+        if cap is not None and total > cap:
+            return total
+        cursor += timedelta(days=1)
+    return total
+
+
+def _reference_count_days(calendar: TradingCalendar, start_date: date, end_date: date, cap: int | None) -> int:
+    count = 0
+    cursor = start_date
+    while cursor <= end_date:
+        if _reference_is_trading_day(calendar, cursor):
+            count += 1
+            if cap is not None and count > cap:
+                return count
+        cursor += timedelta(days=1)
+    return count
+
+
+async def test_session_table_matches_day_by_day_walk_across_calendar_bounds() -> None:
+    calendar = TradingCalendar(
+        massive_client=HolidayStubMassiveClient(
+            holidays=[
+                {"date": "2026-02-25", "status": "closed"},
+                {"date": "2026-02-26", "status": "early-close", "open": "09:30", "close": "13:00"},
+                {"date": "2026-02-19", "status": "closed"},
+            ]
+        ),
+        today_provider=lambda: date(2026, 2, 24),
+    )
+    await calendar.ensure_holiday_cache()
+    first_day = calendar._exchange_calendar.first_session.date()
+    last_day = calendar._exchange_calendar.last_session.date()
+
+    anchors = [
+        date(2026, 2, 16),
+        date(2026, 2, 28),
+        date(2025, 12, 24),
+        first_day - timedelta(days=4),
+        first_day + timedelta(days=2),
+        last_day - timedelta(days=3),
+        last_day + timedelta(days=5),
+    ]
+    for anchor in anchors:
+        for offset in range(0, 12, 3):
+            target = anchor + timedelta(days=offset)
+            assert calendar.align_on_or_before(target_date=target) == _reference_align(calendar, target)
+            for trading_days in (-25, -6, -1, 1, 4, 25):
+                assert calendar.shift_trading_day(target_date=target, trading_days=trading_days) == (
+                    _reference_shift(calendar, target, trading_days)
+                )
+            for span in (0, 6, 40):
+                end = target + timedelta(days=span)
+                for cap in (None, -1, 0, 3, 500, 4000):
+                    assert calendar.count_trading_days(start_date=target, end_date=end, max_count=cap) == (
+                        _reference_count_days(calendar, target, end, cap)
+                    )
+                    assert calendar.count_session_minutes(start_date=target, end_date=end, max_minutes=cap) == (
+                        _reference_count_minutes(calendar, target, end, cap)
+                    )
+
+    assert calendar.session_minutes(target_date=date(2026, 2, 25)) == 0
+    assert calendar.session_minutes(target_date=date(2026, 2, 26)) == 210
+    assert calendar.session_minutes(target_date=date(2026, 2, 19)) == 390
+
+
+class FakeHolidayStore:
+    def __init__(self) -> None:
+        self.payload: dict | None = None
+        self.version_reads = 0
+        self.payload_reads = 0
+        self.lease_held = False
+
+    async def read_version(self) -> str | None:
+        self.version_reads += 1
+        return None if self.payload is None else self.payload["version"]
+
+    async def read(self) -> dict | None:
+        self.payload_reads += 1
+        return self.payload
+
+    async def write(self, *, version: str, refreshed_at: float, overrides: list[dict], ttl_seconds: int) -> bool:
+        self.payload = {"version": version, "refreshed_at": refreshed_at, "overrides": overrides}
+        return True
+
+    async def try_acquire_refresh_lease(self, *, ttl_seconds: int) -> bool:
+        if self.lease_held:
+            return False
+        self.lease_held = True
+        return True
+
+
+class BlockingHolidayMassiveClient(HolidayStubMassiveClient):
+    def __init__(self, holidays: list[dict]) -> None:
+        super().__init__(holidays)
+        self.release = asyncio.Event()
+
+    async def list_market_holidays(self) -> list[dict]:
+        await self.release.wait()
+        return await super().list_market_holidays()
+
+
+async def test_shared_holiday_store_serves_overrides_without_upstream_calls() -> None:
+    store = FakeHolidayStore()
+    publisher = TradingCalendar(
+        massive_client=HolidayStubMassiveClient(holidays=[{"date": "2026-02-25", "status": "closed"}]),
+        today_provider=lambda: date(2026, 2, 24),
+        holiday_store=store,
+    )
+    assert await publisher.refresh_shared_holiday_overrides() is True
+
+    reader_client = HolidayStubMassiveClient(holidays=[])
+    reader = TradingCalendar(
+        massive_client=reader_client,
+        today_provider=lambda: date(2026, 2, 24),
+        holiday_store=store,
+    )
+    await reader.ensure_holiday_cache()
+
+    assert reader.is_trading_day(target_date=date(2026, 2, 25)) is False
+    assert reader_client.calls == 0
+    assert store.payload_reads == 1
+
+    reader._holiday_cache_expire_at = None
+    await reader.ensure_holiday_cache()
+    # An unchanged version stamp skips the payload read.
+    assert store.payload_reads == 1
+    assert store.version_reads == 2
+
+
+async def test_empty_holiday_store_refreshes_upstream_in_background() -> None:
+    store = FakeHolidayStore()
+    client = BlockingHolidayMassiveClient(holidays=[{"date": "2026-02-25", "status": "closed"}])
+    calendar = TradingCalendar(
+        massive_client=client,
+        today_provider=lambda: date(2026, 2, 24),
+        holiday_store=store,
+    )
+
+    await asyncio.wait_for(calendar.ensure_holiday_cache(), timeout=1)
+    assert calendar.is_trading_day(target_date=date(2026, 2, 25)) is True
+
+    client.release.set()
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert calendar.is_trading_day(target_date=date(2026, 2, 25)) is False
+    assert store.payload is not None
+    assert store.payload["overrides"] == [{"date": "2026-02-25", "closed": True, "open": None, "close": None}]
+
+
+async def test_expired_holiday_cache_refreshes_without_blocking_requests() -> None:
+    client = BlockingHolidayMassiveClient(holidays=[{"date": "2026-02-25", "status": "closed"}])
+    client.release.set()
+    calendar = TradingCalendar(
+        massive_client=client,
+        today_provider=lambda: date(2026, 2, 24),
+    )
+    await calendar.ensure_holiday_cache()
+    assert client.calls == 1
+
+    client.release.clear()
+    calendar._holiday_cache_expire_at = datetime(2000, 1, 1, tzinfo=timezone.utc)
+    await asyncio.wait_for(calendar.ensure_holiday_cache(), timeout=1)
+    assert calendar.is_trading_day(target_date=date(2026, 2, 25)) is False
+
+    client.release.set()
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert client.calls == 2
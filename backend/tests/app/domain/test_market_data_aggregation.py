@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 
 from app.domain.market_data.aggregation import (
+    aggregate_day_bars,
     aggregate_minute_bars,
     resolve_bucket_bounds,
     resolve_current_open_bucket,
+    resolve_period_bounds,
 )
 from app.domain.market_data.schemas import MarketBar
 
@@ -80,3 +82,48 @@ def test_resolve_current_open_bucket_returns_none_after_market_close() -> None:
     )
 
     assert bucket is None
+
+
+def test_resolve_period_bounds_aligns_weeks_and_months_independently_of_the_range() -> None:
+    assert resolve_period_bounds(trade_date=date(2026, 2, 12), timespan="week", multiplier=1) == (
+        date(2026, 2, 9),
+        date(2026, 2, 15),
+    )
+    two_weeks = resolve_period_bounds(trade_date=date(2026, 2, 12), timespan="week", multiplier=2)
+    assert two_weeks[0].weekday() == 0 and two_weeks[1] - two_weeks[0] == timedelta(days=13)
+    assert resolve_period_bounds(trade_date=two_weeks[1], timespan="week", multiplier=2) == two_weeks
+    assert resolve_period_bounds(trade_date=date(2024, 2, 29), timespan="month", multiplier=1) == (
+        date(2024, 2, 1),
+        date(2024, 2, 29),
+    )
+    assert resolve_period_bounds(trade_date=date(2026, 11, 3), timespan="month", multiplier=3) == (
+        date(2026, 10, 1),
+        date(2026, 12, 31),
+    )
+
+
+def test_aggregate_day_bars_marks_only_closed_confirmed_periods_final() -> None:
+    def _day_bar(day: int, close: float, *, is_final: bool = True) -> MarketBar:
+        bar = _minute_bar(start_at=datetime(2026, 2, day, tzinfo=timezone.utc), close=close)
+        bar.timespan = "day"
+        bar.is_final = is_final
+        return bar
+
+    bars = [_day_bar(12, 100.0), _day_bar(13, 102.0), _day_bar(17, 101.0), _day_bar(18, 103.0, is_final=False)]
+
+    weeks = aggregate_day_bars(
+        ticker="AAPL",
+        timespan="week",
+        multiplier=1,
+        bars=bars,
+        period_bounds=lambda trade_date: resolve_period_bounds(trade_date=trade_date, timespan="week", multiplier=1),
+        today=date(2026, 2, 18),
+        source="DB_AGG",
+    )
+
+    assert [(bar.timespan, bar.start_at.date(), bar.end_at.date()) for bar in weeks] == [  # type: ignore[union-attr]
+        ("week", date(2026, 2, 9), date(2026, 2, 16)),
+        ("week", date(2026, 2, 16), date(2026, 2, 23)),
+    ]
+    assert (weeks[0].open, weeks[0].close, weeks[0].high, weeks[0].volume) == (99.5, 102.0, 102.5, 200)
+    assert [bar.is_final for bar in weeks] == [True, False]
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import random
+
+import pytest
+
+from app.domain.market_data.aggregation import aggregate_minute_bars
+from app.domain.market_data.columnar_aggregation import aggregate_minute_bars_columnar
+from app.domain.market_data.schemas import MarketBar
+
+
+def _random_minute_bars(*, seed: int, days: list[datetime]) -> list[MarketBar]:
+    rng = random.Random(seed)
+    bars: list[MarketBar] = []
+    for day_start in days:
+        # Cover overnight, pre-market, regular and post-close minutes with random holes.
+        for offset in range(0, 24 * 60):
+            if rng.random() < 0.35:
+                continue
+            close = round(rng.uniform(50, 150), 4)
+            bars.append(
+                MarketBar(
+                    ticker="AAPL",
+                    timespan="minute",
+                    multiplier=1,
+                    start_at=day_start + timedelta(minutes=offset),
+                    open=round(close + rng.uniform(-1, 1), 4),
+                    high=round(close + rng.uniform(0, 2), 4),
+                    low=round(close - rng.uniform(0, 2), 4),
+                    close=close,
+                    volume=rng.choice([0, rng.randint(1, 5000), rng.uniform(0.5, 900.5)]),
+                    vwap=rng.choice([None, round(close + rng.uniform(-0.3, 0.3), 6)]),
+                    trades=rng.choice([None, rng.randint(1, 40)]),
+                    source="DB",
+                )
+            )
+    rng.shuffle(bars)
+    return bars
+
+
+@pytest.mark.parametrize("multiplier", [1, 5, 15, 30, 60, 390, 400])
+@pytest.mark.parametrize("include_unfinished", [False, True])
+def test_columnar_aggregation_matches_reference(multiplier: int, include_unfinished: bool) -> None:
+    days = [
+        datetime(2026, 3, 6, 5, 0, tzinfo=timezone.utc),  # EST
+        datetime(2026, 3, 9, 4, 0, tzinfo=timezone.utc),  # first EDT session
+        datetime(2026, 11, 2, 5, 0, tzinfo=timezone.utc),  # first EST session after fall-back
+    ]
+    bars = _random_minute_bars(seed=multiplier, days=days)
+    now = datetime(2026, 11, 2, 17, 7, 30, tzinfo=timezone.utc)  # mid-session on the last day
+
+    expected = aggregate_minute_bars(
+        ticker="AAPL",
+        multiplier=multiplier,
+        bars=bars,
+        source="DB_AGG",
+        now=now,
+        include_unfinished=include_unfinished,
+    )
+    actual = aggregate_minute_bars_columnar(
+        ticker="AAPL",
+        multiplier=multiplier,
+        bars=bars,
+        source="DB_AGG",
+        now=now,
+        include_unfinished=include_unfinished,
+    )
+
+    assert actual == expected
+
+
+def test_columnar_aggregation_keeps_input_order_for_duplicate_minutes() -> None:
+    start_at = datetime(2026, 2, 10, 14, 30, tzinfo=timezone.utc)
+    bars = [
+        MarketBar(
+            ticker="AAPL",
+            timespan="minute",
+            multiplier=1,
+            start_at=start_at,
+            open=open_,
+            high=open_ + 1,
+            low=open_ - 1,
+            close=open_ + 0.5,
+            volume=10,
+        )
+        for open_ in (100.0, 200.0)
+    ]
+    now = datetime(2026, 2, 11, tzinfo=timezone.utc)
+
+    kwargs = dict(ticker="AAPL", multiplier=5, bars=bars, source="DB_AGG", now=now, include_unfinished=False)
+
+    assert aggregate_minute_bars_columnar(**kwargs) == aggregate_minute_bars(**kwargs)
+
+
+def test_columnar_aggregation_handles_empty_input_and_validates_multiplier() -> None:
+    now = datetime(2026, 2, 11, tzinfo=timezone.utc)
+
+    assert aggregate_minute_bars_columnar(
+        ticker="AAPL",
+        multiplier=5,
+        bars=[],
+        source="DB_AGG",
+        now=now,
+        include_unfinished=True,
+    ) == []
+    with pytest.raises(ValueError):
+        aggregate_minute_bars_columnar(
+            ticker="AAPL",
+            multiplier=0,
+            bars=_random_minute_bars(seed=1, days=[datetime(2026, 2, 10, 5, 0, tzinfo=timezone.utc)]),
+            source="DB_AGG",
+            now=now,
+            include_unfinished=True,
+        )
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+from app.domain.market_data.coverage import (
+    build_minute_coverage,
+    coverage_day_minutes,
+    mask_minute_ranges,
+    minute_range_mask,
+)
+from app.domain.market_data.schemas import MarketBar
+
+
+def _minute_bar(*, start_at: datetime, is_final: bool | None = True) -> MarketBar:
+    return MarketBar(
+        ticker="AAPL",
+        timespan="minute",
+        multiplier=1,
+        start_at=start_at,
+        open=100.0,
+        high=101.0,
+        low=99.0,
+        close=100.5,
+        volume=1000.0,
+        is_final=is_final,
+    )
+
+
+def test_build_minute_coverage_tracks_present_and_final_minutes() -> None:
+    coverage = build_minute_coverage(
+        [
+            _minute_bar(start_at=datetime(2026, 2, 10, 14, 30, tzinfo=timezone.utc)),
+            _minute_bar(start_at=datetime(2026, 2, 10, 14, 31, tzinfo=timezone.utc)),
+            _minute_bar(start_at=datetime(2026, 2, 10, 14, 33, tzinfo=timezone.utc), is_final=False),
+        ]
+    )
+
+    assert len(coverage) == 1
+    item = coverage[0]
+    assert item.trade_date == date(2026, 2, 10)
+    assert mask_minute_ranges(trade_date=item.trade_date, mask=item.present) == [
+        (
+            datetime(2026, 2, 10, 14, 30, tzinfo=timezone.utc),
+            datetime(2026, 2, 10, 14, 31, tzinfo=timezone.utc),
+        ),
+        (
+            datetime(2026, 2, 10, 14, 33, tzinfo=timezone.utc),
+            datetime(2026, 2, 10, 14, 33, tzinfo=timezone.utc),
+        ),
+    ]
+    assert mask_minute_ranges(trade_date=item.trade_date, mask=item.final) == [
+        (
+            datetime(2026, 2, 10, 14, 30, tzinfo=timezone.utc),
+            datetime(2026, 2, 10, 14, 31, tzinfo=timezone.utc),
+        ),
+    ]
+
+
+def test_minute_range_mask_covers_minute_starts_in_half_open_range() -> None:
+    mask = minute_range_mask(
+        trade_date=date(2026, 2, 10),
+        start_at=datetime(2026, 2, 10, 14, 30, 15, tzinfo=timezone.utc),
+        end_at=datetime(2026, 2, 10, 14, 33, tzinfo=timezone.utc),
+    )
+
+    assert mask_minute_ranges(trade_date=date(2026, 2, 10), mask=mask) == [
+        (
+            datetime(2026, 2, 10, 14, 31, tzinfo=timezone.utc),
+            datetime(2026, 2, 10, 14, 32, tzinfo=timezone.utc),
+        ),
+    ]
+
+
+def test_coverage_day_follows_dst_transitions() -> None:
+    assert coverage_day_minutes(trade_date=date(2025, 11, 3)) == 1440
+    assert coverage_day_minutes(trade_date=date(2025, 11, 2)) == 1500
+    assert coverage_day_minutes(trade_date=date(2025, 3, 9)) == 1380
+
+    # 23:59 local on the fall-back day is the last of its 1500 minutes.
+    coverage = build_minute_coverage([_minute_bar(start_at=datetime(2025, 11, 3, 4, 59, tzinfo=timezone.utc))])
+
+    assert coverage[0].trade_date == date(2025, 11, 2)
+    assert coverage[0].present == 1 << 1499
@@ -9,6 +9,11 @@ import pytest
 from app.application.market_data.errors import MarketDataRangeTooLargeError, MarketDataUpstreamUnavailableError
 from app.application.market_data import service as market_data_service_module
 from app.application.market_data.service import MarketDataApplicationService
+from app.application.market_data.concurrency import ConcurrencyLimiter
+from app.application.market_data.minute_bucket_cache import FinalizedMinuteBucketCache
+from app.application.market_data.single_flight import SingleFlightRegistry
+from app.application.market_data.trading_calendar import TradingCalendar
+from app.domain.market_data.coverage import MinuteCoverage, build_minute_coverage, minute_range_mask
 from app.domain.market_data.schemas import MarketBar
 
 _MARKET_TZ = ZoneInfo("America/New_York")
@@ -57,6 +62,10 @@ def _to_epoch_millis(value: datetime) -> int:
     return int(value.timestamp() * 1000)
 
 
+def _minute_request(start_at: datetime, end_at: datetime) -> tuple[str, int, str, str]:
+    return "minute", 1, str(_to_epoch_millis(start_at)), str(_to_epoch_millis(end_at))
+
+
 class FakeMarketDataRepository:
     def __init__(self) -> None:
         self.day_bars: list[MarketBar] = []
@@ -64,10 +73,13 @@ class FakeMarketDataRepository:
         self.minute_agg_bars: list[MarketBar] = []
         self.minute_trade_dates: list[date] = []
         self.minute_agg_trade_dates: list[date] = []
+        self.minute_bar_requests: list[tuple[datetime, datetime]] = []
 
         self.day_coverage: tuple[datetime, datetime] | None = None
         self.minute_coverage: tuple[datetime, datetime] | None = None
         self.minute_agg_coverage: tuple[datetime, datetime] | None = None
+        # Coverage settled without bars; coverage of stored bars is derived from `minute_bars`.
+        self.settled_coverage: dict[tuple[str, date], MinuteCoverage] = {}
 
         self.upserted_day: list[MarketBar] = []
         self.upserted_minute: list[MarketBar] = []
@@ -97,6 +109,7 @@ class FakeMarketDataRepository:
         limit: int | None = None,
         session: str | None = None,
     ) -> list[MarketBar]:
+        self.minute_bar_requests.append((start_at, end_at))
         return _filter_by_range(
             self.minute_bars,
             ticker=ticker,
@@ -175,6 +188,29 @@ class FakeMarketDataRepository:
             merged[bar.start_at] = bar
         self.minute_bars = sorted(merged.values(), key=lambda bar: bar.start_at)
 
+    async def list_minute_coverage(self, *, ticker: str, start_date: date, end_date: date) -> list[MinuteCoverage]:
+        merged = {
+            item.trade_date: item
+            for item in build_minute_coverage([bar for bar in self.minute_bars if bar.ticker == ticker])
+        }
+        for (item_ticker, trade_date), item in self.settled_coverage.items():
+            if item_ticker != ticker:
+                continue
+            current = merged.setdefault(trade_date, MinuteCoverage(ticker=ticker, trade_date=trade_date))
+            current.present |= item.present
+            current.final |= item.final
+            current.updated_at = item.updated_at
+        return [item for trade_date, item in sorted(merged.items()) if start_date <= trade_date <= end_date]
+
+    async def upsert_minute_coverage(self, coverage: list[MinuteCoverage]) -> None:
+        for item in coverage:
+            current = self.settled_coverage.setdefault(
+                (item.ticker, item.trade_date),
+                MinuteCoverage(ticker=item.ticker, trade_date=item.trade_date),
+            )
+            current.present |= item.present
+            current.final |= item.final
+
     async def upsert_minute_agg_bars(self, bars: list[MarketBar]) -> None:
         self.upserted_minute_agg.extend(bars)
         merged = {(bar.multiplier, bar.start_at): bar for bar in self.minute_agg_bars}
@@ -182,6 +218,21 @@ class FakeMarketDataRepository:
             merged[(bar.multiplier, bar.start_at)] = bar
         self.minute_agg_bars = sorted(merged.values(), key=lambda bar: (bar.multiplier, bar.start_at))
 
+    async def list_minute_agg_watermarks(
+        self,
+        *,
+        multipliers: list[int],
+        tickers: list[str],
+    ) -> dict[tuple[str, int], datetime]:
+        watermarks: dict[tuple[str, int], datetime] = {}
+        for bar in self.minute_agg_bars:
+            if bar.multiplier not in multipliers or bar.ticker not in tickers or bar.is_final is False:
+                continue
+            key = (bar.ticker, bar.multiplier)
+            if bar.end_at is not None and (key not in watermarks or bar.end_at > watermarks[key]):
+                watermarks[key] = bar.end_at
+        return watermarks
+
     async def list_minute_tickers(
         self,
         *,
@@ -215,6 +266,16 @@ class FakeMarketDataRepository:
         return self.minute_agg_delete_return
 
 
+class CoverageMarketDataRepository(FakeMarketDataRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.list_minute_bars_calls = 0
+
+    async def list_minute_bars(self, **kwargs) -> list[MarketBar]:
+        self.list_minute_bars_calls += 1
+        return await super().list_minute_bars(**kwargs)
+
+
 class FakeUoW:
     def __init__(self, *, market_data_repo: FakeMarketDataRepository) -> None:
         self.market_data_repo = market_data_repo
@@ -541,6 +602,365 @@ async def test_list_day_baseline_promotes_day_bar_after_next_trading_day_refresh
     assert repo.day_bars[0].is_final is True
 
 
+async def test_list_day_baseline_serves_stale_cache_and_refreshes_in_background(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fixed_now = datetime(2026, 2, 23, 15, 0, tzinfo=timezone.utc)
+
+    class FixedDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            if tz is None:
+                return fixed_now.replace(tzinfo=None)
+            return fixed_now.astimezone(tz)
+
+    class TwoDayTradingCalendar:
+        async def ensure_holiday_cache(self) -> None:
+            return None
+
+        def is_trading_day(self, *, target_date: date) -> bool:
+            return target_date in {date(2026, 2, 20), date(2026, 2, 23)}
+
+        def shift_trading_day(self, *, target_date: date, trading_days: int) -> date:
+            if target_date == date(2026, 2, 20) and trading_days == 1:
+                return date(2026, 2, 23)
+            return target_date
+
+    release = asyncio.Event()
+
+    class BlockingMassiveClient(FakeMassiveClient):
+        async def list_aggs(self, **kwargs) -> list[dict]:
+            await release.wait()
+            return await super().list_aggs(**kwargs)
+
+    monkeypatch.setattr(market_data_service_module, "datetime", FixedDateTime)
+    monkeypatch.setattr(market_data_service_module.settings, "market_data_bars_stale_while_revalidate", True)
+    monkeypatch.setattr(market_data_service_module.settings, "market_data_bars_swr_min_completeness", 1.0)
+
+    repo = FakeMarketDataRepository()
+    repo.day_bars = [
+        _bar(
+            ticker="AAPL",
+            timespan="day",
+            multiplier=1,
+            start_at=datetime(2026, 2, 20, tzinfo=timezone.utc),
+            close=100.5,
+            is_final=False,
+        )
+    ]
+    massive = BlockingMassiveClient(
+        {
+            ("day", 1): [
+                {
+                    "t": _to_epoch_millis(datetime(2026, 2, 20, tzinfo=timezone.utc)),
+                    "o": 100,
+                    "h": 102,
+                    "l": 99,
+                    "c": 101,
+                    "v": 1000,
+                }
+            ]
+        }
+    )
+    request_uow = FakeUoW(market_data_repo=repo)
+    refresh_uows: list[FakeUoW] = []
+
+    def _build_refresh_uow() -> FakeUoW:
+        refresh_uows.append(FakeUoW(market_data_repo=repo))
+        return refresh_uows[-1]
+
+    service = MarketDataApplicationService(
+        uow=request_uow,
+        massive_client=massive,
+        trading_calendar=TwoDayTradingCalendar(),  # type: ignore[arg-type]
+        uow_factory=_build_refresh_uow,  # type: ignore[arg-type]
+    )
+
+    result = await service.list_bars_with_meta(
+        ticker="AAPL",
+        timespan="day",
+        multiplier=1,
+        start_date=date(2026, 2, 20),
+        end_date=date(2026, 2, 20),
+    )
+
+    assert result.partial_range is True
+    assert result.data_source == "DB"
+    assert [bar.close for bar in result.bars] == [100.5]
+    assert service._baseline_refresh_registry.stats().in_flight == 1
+
+    release.set()
+    for _ in range(10):
+        await asyncio.sleep(0)
+        if service._baseline_refresh_registry.stats().in_flight == 0:
+            break
+
+    assert massive.requests == [("day", 1, "2026-02-20", "2026-02-20")]
+    assert repo.day_bars[0].close == 101.0
+    assert request_uow.commits == 0
+    assert sum(uow.commits for uow in refresh_uows) == 1
+
+
+async def test_list_day_baseline_blocks_on_refresh_when_stale_cache_is_too_sparse(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fixed_now = datetime(2026, 2, 10, 15, 0, tzinfo=timezone.utc)
+
+    class FixedDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            if tz is None:
+                return fixed_now.replace(tzinfo=None)
+            return fixed_now.astimezone(tz)
+
+    monkeypatch.setattr(market_data_service_module, "datetime", FixedDateTime)
+    monkeypatch.setattr(market_data_service_module.settings, "market_data_bars_stale_while_revalidate", True)
+    monkeypatch.setattr(market_data_service_module.settings, "market_data_bars_swr_min_completeness", 0.9)
+
+    repo = FakeMarketDataRepository()
+    repo.day_bars = [
+        _bar(
+            ticker="AAPL",
+            timespan="day",
+            multiplier=1,
+            start_at=datetime(2026, 2, 10, tzinfo=timezone.utc),
+            is_final=True,
+        )
+    ]
+    service = MarketDataApplicationService(
+        uow=FakeUoW(market_data_repo=repo),
+        massive_client=UnavailableMassiveClient(),
+    )
+
+    with pytest.raises(MarketDataUpstreamUnavailableError):
+        await service.list_bars(
+            ticker="AAPL",
+            timespan="day",
+            multiplier=1,
+            start_date=date(2026, 2, 10),
+            end_date=date(2026, 2, 11),
+        )
+
+
+class FakeBarsResponseCache:
+    def __init__(self) -> None:
+        self.entries: dict[str, dict[str, str]] = {}
+        self.ttls: dict[str, int] = {}
+        self.invalidated: list[tuple[str, list[date]]] = []
+
+    async def get(self, *, key: str) -> dict[str, str] | None:
+        return self.entries.get(key)
+
+    async def get_fields(self, *, key: str, fields: list[str]) -> dict[str, str] | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return {name: entry[name] for name in fields if name in entry}
+
+    async def put(self, *, key: str, fields: dict[str, str], ttl_seconds: int, **_: object) -> None:
+        self.entries[key] = fields
+        self.ttls[key] = ttl_seconds
+
+    async def invalidate(self, *, ticker: str, trade_dates) -> int:
+        self.invalidated.append((ticker, sorted(trade_dates)))
+        return 0
+
+
+async def test_list_bars_encoded_reuses_cached_body_for_finalized_range(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fixed_now = datetime(2026, 2, 23, 15, 0, tzinfo=timezone.utc)
+
+    class FixedDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            if tz is None:
+                return fixed_now.replace(tzinfo=None)
+            return fixed_now.astimezone(tz)
+
+    class TwoDayTradingCalendar:
+        async def ensure_holiday_cache(self) -> None:
+            return None
+
+        def is_trading_day(self, *, target_date: date) -> bool:
+            return target_date in {date(2026, 2, 20), date(2026, 2, 23)}
+
+        def shift_trading_day(self, *, target_date: date, trading_days: int) -> date:
+            if target_date == date(2026, 2, 20) and trading_days == 1:
+                return date(2026, 2, 23)
+            return target_date
+
+    monkeypatch.setattr(market_data_service_module, "datetime", FixedDateTime)
+    monkeypatch.setattr(market_data_service_module.settings, "market_data_bars_response_cache_final_ttl_seconds", 3600)
+
+    repo = FakeMarketDataRepository()
+    massive = FakeMassiveClient(
+        {
+            ("day", 1): [
+                {
+                    "t": _to_epoch_millis(datetime(2026, 2, 20, tzinfo=timezone.utc)),
+                    "o": 100,
+                    "h": 102,
+                    "l": 99,
+                    "c": 101,
+                    "v": 1000,
+                }
+            ]
+        }
+    )
+    response_cache = FakeBarsResponseCache()
+    service = MarketDataApplicationService(
+        uow=FakeUoW(market_data_repo=repo),
+        massive_client=massive,
+        trading_calendar=TwoDayTradingCalendar(),  # type: ignore[arg-type]
+        response_cache=response_cache,  # type: ignore[arg-type]
+    )
+    encoded_calls: list[int] = []
+
+    def _encode(bars: list[MarketBar]) -> str:
+        encoded_calls.append(len(bars))
+        return f"[{','.join(str(bar.close) for bar in bars)}]"
+
+    async def _request():
+        return await service.list_bars_encoded(
+            ticker="aapl",
+            timespan="day",
+            multiplier=1,
+            start_date=date(2026, 2, 20),
+            end_date=date(2026, 2, 20),
+            encode=_encode,
+        )
+
+    first = await _request()
+    second = await _request()
+    revalidated = await service.list_bars_encoded(
+        ticker="AAPL",
+        timespan="day",
+        multiplier=1,
+        start_date=date(2026, 2, 20),
+        end_date=date(2026, 2, 20),
+        encode=_encode,
+        if_none_match=first.etag,
+    )
+
+    assert (first.body, first.data_source, first.cache_hit) == ("[101.0]", "REST", False)
+    assert (second.body, second.data_source, second.cache_hit) == ("[101.0]", "REST", True)
+    assert first.etag.startswith('"1771545600000-f-')
+    assert second.etag == first.etag
+    assert (revalidated.not_modified, revalidated.body, revalidated.etag) == (True, "", first.etag)
+    assert encoded_calls == [1]
+    assert len(massive.requests) == 1
+    assert response_cache.ttls == {"AAPL:day:1:regular:2026-02-20:2026-02-20:all": 3600}
+    assert response_cache.invalidated == [("AAPL", [date(2026, 2, 20)])]
+
+
+async def test_list_bars_encoded_revalidates_settled_minutes_against_coverage_watermark() -> None:
+    repo = CoverageMarketDataRepository()
+    session_open = datetime(2024, 1, 3, 14, 30, tzinfo=timezone.utc)
+    repo.minute_bars = [_bar(ticker="MSFT", start_at=session_open + timedelta(minutes=offset)) for offset in range(390)]
+    repo.settled_coverage[("MSFT", date(2024, 1, 3))] = MinuteCoverage(
+        ticker="MSFT",
+        trade_date=date(2024, 1, 3),
+        updated_at=datetime(2024, 1, 4, 1, 0, tzinfo=timezone.utc),
+    )
+    massive = FakeMassiveClient({("minute", 1): []})
+    service = MarketDataApplicationService(uow=FakeUoW(market_data_repo=repo), massive_client=massive)
+
+    async def _request(if_none_match: str | None = None):
+        return await service.list_bars_encoded(
+            ticker="MSFT",
+            timespan="minute",
+            multiplier=1,
+            start_date=date(2024, 1, 3),
+            end_date=date(2024, 1, 3),
+            encode=lambda bars: str(len(bars)),
+            if_none_match=if_none_match,
+        )
+
+    first = await _request()
+    revalidated = await _request(if_none_match=first.etag)
+
+    assert (first.body, first.data_source) == ("390", "DB")
+    assert first.etag.startswith('"w-')
+    assert (revalidated.not_modified, revalidated.body, revalidated.etag) == (True, "", first.etag)
+    # The poll is answered from coverage alone.
+    assert repo.list_minute_bars_calls == 1
+    assert massive.requests == []
+
+    # Any write to the trade date moves the watermark.
+    repo.settled_coverage[("MSFT", date(2024, 1, 3))].updated_at = datetime(2024, 1, 4, 2, 0, tzinfo=timezone.utc)
+    changed = await _request(if_none_match=first.etag)
+
+    assert (changed.not_modified, changed.body) == (False, "390")
+    assert changed.etag != first.etag
+    assert repo.list_minute_bars_calls == 2
+
+
+async def test_list_bars_builds_week_and_multi_day_bars_from_stored_day_bars(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fixed_now = datetime(2026, 2, 25, 15, 0, tzinfo=timezone.utc)
+
+    class FixedDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            if tz is None:
+                return fixed_now.replace(tzinfo=None)
+            return fixed_now.astimezone(tz)
+
+    monkeypatch.setattr(market_data_service_module, "datetime", FixedDateTime)
+    calendar = TradingCalendar(massive_client=None, today_provider=lambda: date(2026, 2, 25))
+    repo = FakeMarketDataRepository()
+    trade_dates = [
+        date(2026, 2, 2) + timedelta(days=offset)
+        for offset in range(22)
+        if calendar.is_trading_day(target_date=date(2026, 2, 2) + timedelta(days=offset))
+    ]
+    repo.day_bars = [
+        _bar(
+            ticker="AAPL",
+            timespan="day",
+            start_at=datetime.combine(trade_date, time.min, tzinfo=timezone.utc),
+            close=100.0 + index,
+            volume=10.0,
+            is_final=trade_date < date(2026, 2, 23),
+        )
+        for index, trade_date in enumerate(trade_dates)
+    ]
+    service = MarketDataApplicationService(
+        uow=FakeUoW(market_data_repo=repo),
+        massive_client=FailMassiveClient(),
+        trading_calendar=calendar,
+    )
+
+    # The range starts mid-week, but the first week still aggregates every stored session of that week.
+    weekly = await service.list_bars_with_meta(
+        ticker="AAPL",
+        timespan="week",
+        start_date=date(2026, 2, 11),
+        end_date=date(2026, 2, 20),
+    )
+    multi_day = await service.list_bars(
+        ticker="AAPL",
+        timespan="day",
+        multiplier=3,
+        start_date=date(2026, 2, 7),
+        end_date=date(2026, 2, 13),
+    )
+
+    assert weekly.data_source == "DB_AGG"
+    assert [(bar.start_at.date(), bar.open, bar.close, bar.volume, bar.is_final) for bar in weekly.bars] == [
+        (date(2026, 2, 9), 100.0, 109.0, 50.0, True),
+        (date(2026, 2, 16), 100.0, 113.0, 40.0, True),
+    ]
+    # Sessions are counted from the first trading day of the range and skip Presidents' Day.
+    assert [(bar.start_at.date(), bar.end_at.date(), bar.close) for bar in multi_day] == [  # type: ignore[union-attr]
+        (date(2026, 2, 9), date(2026, 2, 12), 107.0),
+        (date(2026, 2, 12), date(2026, 2, 18), 110.0),
+    ]
+    assert all(bar.timespan == "day" and bar.multiplier == 3 for bar in multi_day)
+
+
 async def test_list_minute_baseline_fetches_massive_when_missing() -> None:
     repo = FakeMarketDataRepository()
     massive = FakeMassiveClient(
@@ -867,7 +1287,7 @@ async def test_list_minute_baseline_refreshes_only_non_final_trade_date(monkeypa
         end_date=date(2024, 1, 3),
     )
 
-    assert massive.requests == [("minute", 1, "2024-01-03", "2024-01-03")]
+    assert massive.requests == [_minute_request(datetime(2024, 1, 3, 14, 30, tzinfo=timezone.utc), datetime(2024, 1, 3, 15, 4, tzinfo=timezone.utc))]
     assert [bar.start_at for bar in result] == [
         datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc),
         datetime(2024, 1, 3, 15, 0, tzinfo=timezone.utc),
@@ -925,7 +1345,7 @@ async def test_list_minute_baseline_refreshes_closed_trade_date_when_final_cache
         end_date=date(2024, 1, 3),
     )
 
-    assert massive.requests == [("minute", 1, "2024-01-03", "2024-01-03")]
+    assert massive.requests == [_minute_request(datetime(2024, 1, 3, 14, 31, tzinfo=timezone.utc), datetime(2024, 1, 3, 20, 59, tzinfo=timezone.utc))]
     assert [bar.start_at for bar in result] == [
         datetime(2024, 1, 3, 14, 30, tzinfo=timezone.utc),
         datetime(2024, 1, 3, 14, 31, tzinfo=timezone.utc),
@@ -933,21 +1353,166 @@ async def test_list_minute_baseline_refreshes_closed_trade_date_when_final_cache
     assert uow.commits == 1
 
 
-async def test_list_minute_baseline_non_regular_refreshes_when_trade_date_is_not_final() -> None:
-    repo = FakeMarketDataRepository()
-    repo.minute_bars = [
-        _bar(ticker="AAPL", start_at=datetime(2026, 2, 10, 22, 0, tzinfo=timezone.utc), is_final=False),
-    ]
+async def test_list_minute_baseline_fetches_only_coverage_gaps() -> None:
+    repo = CoverageMarketDataRepository()
+    session_open = datetime(2024, 1, 3, 14, 30, tzinfo=timezone.utc)
+    gap = {session_open + timedelta(minutes=offset) for offset in (40, 41, 42)}
+    await repo.upsert_minute_bars(
+        [
+            _bar(ticker="MSFT", start_at=session_open + timedelta(minutes=offset))
+            for offset in range(390)
+            if session_open + timedelta(minutes=offset) not in gap
+        ]
+    )
     massive = FakeMassiveClient(
         {
             ("minute", 1): [
                 {
-                    "t": _to_epoch_millis(datetime(2026, 2, 10, 22, 0, tzinfo=timezone.utc)),
-                    "o": 100,
-                    "h": 101,
-                    "l": 99,
-                    "c": 100.5,
-                    "v": 1000,
+                    "t": _to_epoch_millis(session_open + timedelta(minutes=offset)),
+                    "o": 100.0,
+                    "h": 100.5,
+                    "l": 99.8,
+                    "c": 100.2,
+                    "v": 800,
+                }
+                for offset in (40, 41)
+            ]
+        }
+    )
+    uow = FakeUoW(market_data_repo=repo)
+    service = MarketDataApplicationService(uow=uow, massive_client=massive)
+
+    result = await service.list_bars(
+        ticker="MSFT",
+        timespan="minute",
+        multiplier=1,
+        start_date=date(2024, 1, 3),
+        end_date=date(2024, 1, 3),
+    )
+
+    assert massive.requests == [
+        (
+            "minute",
+            1,
+            str(_to_epoch_millis(session_open + timedelta(minutes=40))),
+            str(_to_epoch_millis(session_open + timedelta(minutes=42))),
+        )
+    ]
+    assert len(result) == 389
+    assert uow.commits == 1
+
+    # The minute upstream never returned is settled, so the next request stays local.
+    await service.list_bars(
+        ticker="MSFT",
+        timespan="minute",
+        multiplier=1,
+        start_date=date(2024, 1, 3),
+        end_date=date(2024, 1, 3),
+    )
+
+    assert len(massive.requests) == 1
+    assert uow.commits == 1
+
+
+async def test_list_minute_baseline_plans_each_trade_date_and_settles_only_its_gaps() -> None:
+    repo = FakeMarketDataRepository()
+    first_open = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+    second_open = datetime(2024, 1, 3, 14, 30, tzinfo=timezone.utc)
+    # The last minutes of one session and the first of the next are missing.
+    repo.minute_bars = [
+        _bar(ticker="MSFT", start_at=first_open + timedelta(minutes=offset)) for offset in range(387)
+    ] + [_bar(ticker="MSFT", start_at=second_open + timedelta(minutes=offset)) for offset in range(3, 390)]
+    massive = FakeMassiveClient({("minute", 1): []})
+    service = MarketDataApplicationService(uow=FakeUoW(market_data_repo=repo), massive_client=massive)
+
+    await service.list_bars(
+        ticker="MSFT",
+        timespan="minute",
+        multiplier=1,
+        start_date=date(2024, 1, 2),
+        end_date=date(2024, 1, 3),
+    )
+
+    assert massive.requests == [
+        _minute_request(first_open + timedelta(minutes=387), first_open + timedelta(minutes=389)),
+        _minute_request(second_open, second_open + timedelta(minutes=2)),
+    ]
+    assert {key: item.final for key, item in repo.settled_coverage.items()} == {
+        ("MSFT", date(2024, 1, 2)): minute_range_mask(
+            trade_date=date(2024, 1, 2),
+            start_at=first_open + timedelta(minutes=387),
+            end_at=first_open + timedelta(minutes=390),
+        ),
+        ("MSFT", date(2024, 1, 3)): minute_range_mask(
+            trade_date=date(2024, 1, 3),
+            start_at=second_open,
+            end_at=second_open + timedelta(minutes=3),
+        ),
+    }
+
+
+async def test_list_minute_baseline_refetches_only_unsettled_minutes_during_session(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fixed_now = datetime(2026, 2, 10, 15, 0, 30, tzinfo=timezone.utc)  # 10:00:30 ET
+
+    class FixedDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            if tz is None:
+                return fixed_now.replace(tzinfo=None)
+            return fixed_now.astimezone(tz)
+
+    monkeypatch.setattr(market_data_service_module, "datetime", FixedDateTime)
+
+    repo = CoverageMarketDataRepository()
+    session_open = datetime(2026, 2, 10, 14, 30, tzinfo=timezone.utc)
+    await repo.upsert_minute_bars(
+        [
+            _bar(
+                ticker="AAPL",
+                start_at=session_open + timedelta(minutes=offset),
+                is_final=offset < 25,
+            )
+            for offset in range(30)
+        ]
+    )
+    massive = FakeMassiveClient({("minute", 1): []})
+    service = MarketDataApplicationService(uow=FakeUoW(market_data_repo=repo), massive_client=massive)
+
+    await service.list_bars(
+        ticker="AAPL",
+        timespan="minute",
+        multiplier=1,
+        start_date=date(2026, 2, 10),
+        end_date=date(2026, 2, 10),
+    )
+
+    assert massive.requests == [
+        (
+            "minute",
+            1,
+            str(_to_epoch_millis(session_open + timedelta(minutes=25))),
+            str(_to_epoch_millis(session_open + timedelta(minutes=29))),
+        )
+    ]
+
+
+async def test_list_minute_baseline_non_regular_refreshes_when_trade_date_is_not_final() -> None:
+    repo = FakeMarketDataRepository()
+    repo.minute_bars = [
+        _bar(ticker="AAPL", start_at=datetime(2026, 2, 10, 22, 0, tzinfo=timezone.utc), is_final=False),
+    ]
+    massive = FakeMassiveClient(
+        {
+            ("minute", 1): [
+                {
+                    "t": _to_epoch_millis(datetime(2026, 2, 10, 22, 0, tzinfo=timezone.utc)),
+                    "o": 100,
+                    "h": 101,
+                    "l": 99,
+                    "c": 100.5,
+                    "v": 1000,
                 },
                 {
                     "t": _to_epoch_millis(datetime(2026, 2, 10, 22, 1, tzinfo=timezone.utc)),
@@ -974,7 +1539,11 @@ async def test_list_minute_baseline_non_regular_refreshes_when_trade_date_is_not
         end_date=date(2026, 2, 10),
     )
 
-    assert massive.calls == [("minute", 1)]
+    # The overnight and after-hours segments are separate upstream ranges.
+    assert massive.requests == [
+        _minute_request(datetime(2026, 2, 10, 5, 0, tzinfo=timezone.utc), datetime(2026, 2, 10, 8, 59, tzinfo=timezone.utc)),
+        _minute_request(datetime(2026, 2, 10, 21, 0, tzinfo=timezone.utc), datetime(2026, 2, 11, 4, 59, tzinfo=timezone.utc)),
+    ]
     assert [bar.start_at for bar in bars] == [
         datetime(2026, 2, 10, 22, 0, tzinfo=timezone.utc),
         datetime(2026, 2, 10, 22, 1, tzinfo=timezone.utc),
@@ -1095,10 +1664,175 @@ async def test_list_minute_baseline_coalesces_concurrent_refreshes(monkeypatch:
 
     assert len(first) == 1
     assert len(second) == 1
-    assert massive.requests == [("minute", 1, "2024-01-03", "2024-01-03")]
+    assert massive.requests == [_minute_request(datetime(2024, 1, 3, 14, 30, tzinfo=timezone.utc), datetime(2024, 1, 3, 15, 4, tzinfo=timezone.utc))]
     assert uow.commits == 1
 
 
+async def test_list_minute_baseline_coalesces_refreshes_across_services_sharing_registry(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fixed_now = datetime(2024, 1, 3, 15, 5, tzinfo=timezone.utc)  # 10:05 ET
+
+    class FixedDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            if tz is None:
+                return fixed_now.replace(tzinfo=None)
+            return fixed_now.astimezone(tz)
+
+    class CurrentDayOnlyTradingCalendar:
+        async def ensure_holiday_cache(self) -> None:
+            return None
+
+        def is_trading_day(self, *, target_date: date) -> bool:
+            return target_date == date(2024, 1, 3)
+
+        def session_bounds(self, *, target_date: date):
+            return (
+                datetime.combine(target_date, time(9, 30), tzinfo=_MARKET_TZ),
+                datetime.combine(target_date, time(16, 0), tzinfo=_MARKET_TZ),
+            )
+
+        def shift_trading_day(self, *, target_date: date, trading_days: int) -> date:
+            _ = trading_days
+            return target_date
+
+    class SlowMassiveClient(FakeMassiveClient):
+        async def list_aggs(self, **kwargs) -> list[dict]:
+            await asyncio.sleep(0.01)
+            return await super().list_aggs(**kwargs)
+
+    monkeypatch.setattr(market_data_service_module, "datetime", FixedDateTime)
+
+    repo = FakeMarketDataRepository()
+    massive = SlowMassiveClient(
+        {
+            ("minute", 1): [
+                {
+                    "t": _to_epoch_millis(datetime(2024, 1, 3, 15, 0, tzinfo=timezone.utc)),
+                    "o": 100,
+                    "h": 101,
+                    "l": 99.8,
+                    "c": 100.8,
+                    "v": 800,
+                }
+            ]
+        }
+    )
+    registry: SingleFlightRegistry[list[MarketBar]] = SingleFlightRegistry()
+    first_uow = FakeUoW(market_data_repo=repo)
+    second_uow = FakeUoW(market_data_repo=repo)
+    first_service = MarketDataApplicationService(
+        uow=first_uow,
+        massive_client=massive,
+        trading_calendar=CurrentDayOnlyTradingCalendar(),  # type: ignore[arg-type]
+        baseline_refresh_registry=registry,
+    )
+    second_service = MarketDataApplicationService(
+        uow=second_uow,
+        massive_client=massive,
+        trading_calendar=CurrentDayOnlyTradingCalendar(),  # type: ignore[arg-type]
+        baseline_refresh_registry=registry,
+    )
+
+    first, second = await asyncio.gather(
+        first_service.list_bars(
+            ticker="MSFT",
+            timespan="minute",
+            multiplier=1,
+            start_date=date(2024, 1, 3),
+            end_date=date(2024, 1, 3),
+        ),
+        second_service.list_bars(
+            ticker="MSFT",
+            timespan="minute",
+            multiplier=1,
+            start_date=date(2024, 1, 3),
+            end_date=date(2024, 1, 3),
+        ),
+    )
+
+    assert len(first) == 1
+    assert len(second) == 1
+    assert massive.requests == [_minute_request(datetime(2024, 1, 3, 14, 30, tzinfo=timezone.utc), datetime(2024, 1, 3, 15, 4, tzinfo=timezone.utc))]
+    assert first_uow.commits + second_uow.commits == 1
+    stats = registry.stats()
+    assert (stats.hits, stats.misses, stats.in_flight) == (1, 1, 0)
+
+
+async def test_list_minute_baseline_rereads_db_when_another_worker_holds_fetch_lease(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fixed_now = datetime(2024, 1, 3, 15, 5, tzinfo=timezone.utc)  # 10:05 ET
+
+    class FixedDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            if tz is None:
+                return fixed_now.replace(tzinfo=None)
+            return fixed_now.astimezone(tz)
+
+    class CurrentDayOnlyTradingCalendar:
+        async def ensure_holiday_cache(self) -> None:
+            return None
+
+        def is_trading_day(self, *, target_date: date) -> bool:
+            return target_date == date(2024, 1, 3)
+
+        def session_bounds(self, *, target_date: date):
+            return (
+                datetime.combine(target_date, time(9, 30), tzinfo=_MARKET_TZ),
+                datetime.combine(target_date, time(16, 0), tzinfo=_MARKET_TZ),
+            )
+
+        def shift_trading_day(self, *, target_date: date, trading_days: int) -> date:
+            _ = trading_days
+            return target_date
+
+    repo = FakeMarketDataRepository()
+
+    class FollowerFetchLease:
+        def __init__(self) -> None:
+            self.keys: list[str] = []
+
+        async def run_or_wait(self, *, key: str, leader, follower):
+            _ = leader
+            self.keys.append(key)
+            # Another worker fetched and stored the bar while this one waited.
+            repo.minute_bars = [
+                _bar(
+                    ticker="MSFT",
+                    start_at=datetime(2024, 1, 3, 15, 0, tzinfo=timezone.utc),
+                    is_final=True,
+                )
+            ]
+            return await follower()
+
+    monkeypatch.setattr(market_data_service_module, "datetime", FixedDateTime)
+
+    massive = FakeMassiveClient({})
+    fetch_lease = FollowerFetchLease()
+    service = MarketDataApplicationService(
+        uow=FakeUoW(market_data_repo=repo),
+        massive_client=massive,
+        trading_calendar=CurrentDayOnlyTradingCalendar(),  # type: ignore[arg-type]
+        fetch_lease=fetch_lease,  # type: ignore[arg-type]
+    )
+
+    bars = await service.list_bars(
+        ticker="MSFT",
+        timespan="minute",
+        multiplier=1,
+        start_date=date(2024, 1, 3),
+        end_date=date(2024, 1, 3),
+    )
+
+    assert [bar.start_at for bar in bars] == [datetime(2024, 1, 3, 15, 0, tzinfo=timezone.utc)]
+    assert massive.requests == []
+    window = _minute_request(datetime(2024, 1, 3, 14, 30, tzinfo=timezone.utc), datetime(2024, 1, 3, 15, 4, tzinfo=timezone.utc))
+    assert fetch_lease.keys == [f"minute:MSFT:{window[2]}..{window[3]}"]
+
+
 async def test_list_minute_baseline_cancellation_does_not_abort_shared_refresh(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -1192,9 +1926,91 @@ async def test_list_minute_baseline_cancellation_does_not_abort_shared_refresh(
     await asyncio.sleep(0)
 
     assert len(second) == 1
-    assert massive.requests == [("minute", 1, "2024-01-03", "2024-01-03")]
+    assert massive.requests == [_minute_request(datetime(2024, 1, 3, 14, 30, tzinfo=timezone.utc), datetime(2024, 1, 3, 15, 4, tzinfo=timezone.utc))]
     assert uow.commits == 1
-    assert service._baseline_refresh_tasks == {}
+    assert service._baseline_refresh_registry.stats().in_flight == 0
+
+
+class ConcurrentWindowMassiveClient:
+    def __init__(self) -> None:
+        self.active = 0
+        self.max_active = 0
+
+    async def list_aggs(
+        self,
+        *,
+        ticker: str,
+        multiplier: int,
+        timespan: str,
+        from_date: str,
+        to_date: str,
+        adjusted: bool = True,
+        sort: str = "asc",
+        limit: int = 50000,
+    ) -> list[dict]:
+        _ = (ticker, multiplier, timespan, to_date, adjusted, sort, limit)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        day = date.fromisoformat(from_date)
+        return [
+            {
+                "t": _to_epoch_millis(datetime.combine(day, time(14, 30 + offset), tzinfo=timezone.utc)),
+                "o": 100.0,
+                "h": 101.0,
+                "l": 99.0,
+                "c": float(day.day),
+                "v": 100,
+            }
+            for offset in (1, 0)
+        ]
+
+
+async def test_fetch_baseline_windows_runs_windows_concurrently_and_merges_in_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(market_data_service_module.settings, "market_data_upstream_max_concurrency_per_request", 3)
+    massive = ConcurrentWindowMassiveClient()
+    service = MarketDataApplicationService(
+        uow=FakeUoW(market_data_repo=FakeMarketDataRepository()),
+        massive_client=massive,
+    )
+    windows = [(date(2024, 1, day), date(2024, 1, day)) for day in (8, 2, 4, 3)]
+
+    bars = await service._fetch_baseline_windows(ticker="AAPL", timespan="minute", refresh_windows=windows)
+
+    assert massive.max_active == 3
+    assert [bar.start_at for bar in bars] == sorted(bar.start_at for bar in bars)
+    assert [bar.close for bar in bars] == [2.0, 2.0, 3.0, 3.0, 4.0, 4.0, 8.0, 8.0]
+
+
+async def test_fetch_baseline_windows_respects_shared_upstream_limit() -> None:
+    massive = ConcurrentWindowMassiveClient()
+    limiter = ConcurrencyLimiter(limit=1)
+    services = [
+        MarketDataApplicationService(
+            uow=FakeUoW(market_data_repo=FakeMarketDataRepository()),
+            massive_client=massive,
+            upstream_limiter=limiter,
+        )
+        for _ in range(2)
+    ]
+
+    await asyncio.gather(
+        *(
+            service._fetch_baseline_windows(
+                ticker="AAPL",
+                timespan="minute",
+                refresh_windows=[(date(2024, 1, 2), date(2024, 1, 2)), (date(2024, 1, 4), date(2024, 1, 4))],
+            )
+            for service in services
+        )
+    )
+
+    assert massive.max_active == 1
 
 
 async def test_list_minute_aggregated_returns_db_agg_mixed_for_open_bucket(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -1278,7 +2094,7 @@ async def test_list_minute_aggregated_returns_db_agg_mixed_for_open_bucket(monke
     assert result.bars[0].start_at == datetime(2026, 2, 10, 15, 0, tzinfo=timezone.utc)
     assert result.bars[1].start_at == datetime(2026, 2, 10, 15, 5, tzinfo=timezone.utc)
     assert result.bars[1].is_final is False
-    assert massive.requests == [("minute", 1, "2026-02-10", "2026-02-10")]
+    assert massive.requests == [_minute_request(datetime(2026, 2, 10, 14, 30, tzinfo=timezone.utc), datetime(2026, 2, 10, 15, 4, tzinfo=timezone.utc))]
 
 
 async def test_list_minute_aggregated_rebuilds_from_baseline_when_preagg_empty(
@@ -1359,10 +2175,63 @@ async def test_list_minute_aggregated_rebuilds_from_baseline_when_preagg_empty(
     assert result.data_source == "DB_AGG"
     assert len(result.bars) == 1
     assert result.bars[0].start_at == datetime(2026, 2, 10, 20, 55, tzinfo=timezone.utc)
-    assert massive.requests == [("minute", 1, "2026-02-10", "2026-02-10")]
+    assert massive.requests == [_minute_request(datetime(2026, 2, 10, 14, 30, tzinfo=timezone.utc), datetime(2026, 2, 10, 20, 59, tzinfo=timezone.utc))]
     assert len(repo.upserted_minute_agg) == 1
 
 
+async def test_list_minute_aggregated_serves_non_precomputed_multiplier_from_baseline(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fixed_now = datetime(2026, 2, 11, 22, 0, tzinfo=timezone.utc)
+
+    class FixedDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            if tz is None:
+                return fixed_now.replace(tzinfo=None)
+            return fixed_now.astimezone(tz)
+
+    monkeypatch.setattr(market_data_service_module, "datetime", FixedDateTime)
+    session_open = datetime(2026, 2, 10, 14, 30, tzinfo=timezone.utc)
+    repo = FakeMarketDataRepository()
+    repo.minute_bars = [
+        _bar(ticker="AAPL", start_at=session_open + timedelta(minutes=offset), close=100.0 + offset, volume=1.0)
+        for offset in range(390)
+    ]
+    bucket_cache = FinalizedMinuteBucketCache(max_entries=8)
+    service = MarketDataApplicationService(
+        uow=FakeUoW(market_data_repo=repo),
+        massive_client=FailMassiveClient(),
+        minute_bucket_cache=bucket_cache,
+    )
+
+    async def _request():
+        return await service.list_bars_with_meta(
+            ticker="AAPL",
+            timespan="minute",
+            multiplier=10,
+            start_date=date(2026, 2, 10),
+            end_date=date(2026, 2, 10),
+        )
+
+    first = await _request()
+    second = await _request()
+
+    assert first.data_source == "DB_AGG"
+    assert len(first.bars) == 39
+    assert (first.bars[1].start_at, first.bars[1].close, first.bars[1].volume) == (
+        session_open + timedelta(minutes=10),
+        119.0,
+        10.0,
+    )
+    assert all(bar.is_final is True and bar.multiplier == 10 for bar in first.bars)
+    assert second.bars == first.bars
+    # Nothing is written for multipliers without a precomputed table.
+    assert repo.upserted_minute_agg == []
+    stats = bucket_cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
 async def test_list_minute_aggregated_night_fallback_clips_out_of_range_bars() -> None:
     repo = FakeMarketDataRepository()
     massive = FakeMassiveClient(
@@ -1434,6 +2303,69 @@ async def test_precompute_minute_aggregates_only_writes_final_buckets() -> None:
     assert repo.upserted_minute_agg[0].end_at == datetime(2026, 2, 10, 15, 5, tzinfo=timezone.utc)
 
 
+async def test_precompute_minute_aggregates_resumes_from_watermark() -> None:
+    repo = FakeMarketDataRepository()
+    session_open = datetime(2026, 2, 10, 14, 30, tzinfo=timezone.utc)
+    repo.minute_bars = [
+        _bar(ticker="AAPL", start_at=session_open + timedelta(minutes=offset), close=100.0 + offset)
+        for offset in range(42)
+    ]
+    repo.minute_agg_bars = [
+        _bar(
+            ticker="AAPL",
+            start_at=datetime(2026, 2, 10, 14, 55, tzinfo=timezone.utc),
+            end_at=datetime(2026, 2, 10, 15, 0, tzinfo=timezone.utc),
+            multiplier=5,
+            source="DB_AGG",
+        )
+    ]
+    service = MarketDataApplicationService(
+        uow=FakeUoW(market_data_repo=repo),
+        massive_client=FailMassiveClient(),
+        trading_calendar=NoRefreshTradingCalendar(),  # type: ignore[arg-type]
+    )
+
+    produced = await service.precompute_minute_aggregates(
+        multiplier=5,
+        lookback_trade_days=1,
+        now=datetime(2026, 2, 10, 15, 12, tzinfo=timezone.utc),
+    )
+
+    # Reads start one settle window before the watermark instead of at the lookback start.
+    assert repo.minute_bar_requests[-1][0] == datetime(2026, 2, 10, 14, 55, tzinfo=timezone.utc)
+    assert produced == 3
+    assert [bar.start_at for bar in repo.upserted_minute_agg] == [
+        datetime(2026, 2, 10, 14, 55, tzinfo=timezone.utc),
+        datetime(2026, 2, 10, 15, 0, tzinfo=timezone.utc),
+        datetime(2026, 2, 10, 15, 5, tzinfo=timezone.utc),
+    ]
+
+
+async def test_precompute_minute_aggregate_resolutions_reads_minute_bars_once() -> None:
+    repo = FakeMarketDataRepository()
+    session_open = datetime(2026, 2, 10, 14, 30, tzinfo=timezone.utc)
+    repo.minute_bars = [
+        _bar(ticker="AAPL", start_at=session_open + timedelta(minutes=offset), close=100.0 + offset)
+        for offset in range(60)
+    ]
+    service = MarketDataApplicationService(
+        uow=FakeUoW(market_data_repo=repo),
+        massive_client=FailMassiveClient(),
+        trading_calendar=NoRefreshTradingCalendar(),  # type: ignore[arg-type]
+    )
+
+    produced = await service.precompute_minute_aggregate_resolutions(
+        multipliers=[60, 5, 15],
+        lookback_trade_days=1,
+        now=datetime(2026, 2, 10, 15, 31, tzinfo=timezone.utc),
+    )
+
+    assert produced == {5: 12, 15: 4, 60: 1}
+    assert len(repo.minute_bar_requests) == 1
+    assert sorted({bar.multiplier for bar in repo.upserted_minute_agg}) == [5, 15, 60]
+    assert len(repo.upserted_minute_agg) == 17
+
+
 async def test_enforce_minute_retention_uses_trade_day_cutoff() -> None:
     repo = FakeMarketDataRepository()
     repo.minute_trade_dates = [
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+from unittest.mock import MagicMock
+
+from app.domain.market_data.coverage import MinuteCoverage, build_minute_coverage
+from app.domain.market_data.schemas import MarketBar
+from app.infrastructure.db.models.market_data import MarketBarDayModel, MarketBarMinuteModel
+from app.infrastructure.repositories.final_bar_cache import FinalBarSegmentCache, build_final_bar_segment
+from app.infrastructure.repositories.market_data_repository import SqlAlchemyMarketDataRepository
+
+
+def _minute_bar(start_at: datetime, *, close: float = 100.0, is_final: bool = True) -> MarketBar:
+    return MarketBar(
+        ticker="AAPL",
+        timespan="minute",
+        multiplier=1,
+        start_at=start_at,
+        open=close,
+        high=close + 1,
+        low=close - 1,
+        close=close,
+        volume=1000,
+        is_final=is_final,
+    )
+
+
+class QueuedResultSession:
+    def __init__(self, *batches: list[object]) -> None:
+        self._batches = list(batches)
+        self.statements: list[object] = []
+
+    async def execute(self, stmt: object) -> MagicMock:
+        self.statements.append(stmt)
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = self._batches.pop(0)
+        return result
+
+
+def test_segment_round_trips_bars_and_clips_to_range() -> None:
+    opened_at = datetime(2026, 2, 10, 14, 30, tzinfo=timezone.utc)
+    bars = [_minute_bar(opened_at + timedelta(minutes=offset), close=100 + offset) for offset in range(3)]
+    bars[1].vwap = 101.5
+    bars[1].trades = 12
+    bars[2].source = "backfill"
+
+    segment = build_final_bar_segment(trade_date=date(2026, 2, 10), bars=list(reversed(bars)))
+
+    assert segment is not None
+    assert segment.to_bars(start_at=opened_at, end_at=opened_at + timedelta(minutes=5)) == bars
+    assert segment.to_bars(start_at=opened_at + timedelta(minutes=1), end_at=opened_at + timedelta(minutes=1)) == [
+        bars[1]
+    ]
+    assert build_final_bar_segment(trade_date=date(2026, 2, 10), bars=[_minute_bar(opened_at, is_final=False)]) is None
+
+
+def test_cache_evicts_least_recent_segments_past_byte_ceiling() -> None:
+    opened_at = datetime(2026, 2, 10, 14, 30, tzinfo=timezone.utc)
+    segments = [
+        build_final_bar_segment(
+            trade_date=date(2026, 2, 10) + timedelta(days=offset),
+            bars=[_minute_bar(opened_at + timedelta(days=offset, minutes=minute)) for minute in range(10)],
+        )
+        for offset in range(3)
+    ]
+    cache = FinalBarSegmentCache(max_bytes=segments[0].nbytes * 2)
+
+    cache.put(segments[0])
+    cache.put(segments[1])
+    assert list(cache.lookup(ticker="AAPL", timespan="minute", trade_dates=[date(2026, 2, 10)])) == [
+        date(2026, 2, 10)
+    ]
+    cache.put(segments[2])
+    cache.record_misses(1)
+
+    found = cache.lookup(
+        ticker="AAPL",
+        timespan="minute",
+        trade_dates=[date(2026, 2, 10), date(2026, 2, 11), date(2026, 2, 12)],
+    )
+    stats = cache.stats()
+    assert sorted(found) == [date(2026, 2, 10), date(2026, 2, 12)]
+    assert stats.entries == 2
+    assert stats.evictions == 1
+    assert stats.resident_bytes == segments[0].nbytes * 2
+    assert stats.hit_rate == 0.75
+
+
+def _day_row(trade_date: date, *, close: float = 101.0) -> MarketBarDayModel:
+    return MarketBarDayModel(
+        ticker="AAPL",
+        trade_date=trade_date,
+        start_at=datetime.combine(trade_date, time.min, tzinfo=timezone.utc),
+        open=100,
+        high=102,
+        low=99,
+        close=close,
+        volume=1000,
+        vwap=None,
+        trades=None,
+        is_final=True,
+        source="massive",
+    )
+
+
+async def test_repository_serves_finalized_day_bars_from_cache() -> None:
+    cache = FinalBarSegmentCache(max_bytes=1 << 20)
+    start_at = datetime(2026, 2, 20, tzinfo=timezone.utc)
+    end_at = datetime(2026, 2, 20, 23, 59, 59, tzinfo=timezone.utc)
+
+    first_session = QueuedResultSession([_day_row(date(2026, 2, 20))])
+    first = await SqlAlchemyMarketDataRepository(session=first_session, final_bar_cache=cache).list_day_bars(
+        ticker="AAPL",
+        start_at=start_at,
+        end_at=end_at,
+    )
+    second_session = QueuedResultSession([])
+    second = await SqlAlchemyMarketDataRepository(session=second_session, final_bar_cache=cache).list_day_bars(
+        ticker="AAPL",
+        start_at=start_at,
+        end_at=end_at,
+    )
+
+    assert second == first
+    assert second[0].close == 101
+    assert second_session.statements == []
+    assert cache.stats().hits == 1
+
+
+async def test_repository_caches_only_day_dates_the_read_covered() -> None:
+    cache = FinalBarSegmentCache(max_bytes=1 << 20)
+
+    # Reading from 02-20 must not mark the previous date empty.
+    await SqlAlchemyMarketDataRepository(
+        session=QueuedResultSession([_day_row(date(2026, 2, 20))]),
+        final_bar_cache=cache,
+    ).list_day_bars(
+        ticker="AAPL",
+        start_at=datetime(2026, 2, 20, tzinfo=timezone.utc),
+        end_at=datetime(2026, 2, 20, 12, tzinfo=timezone.utc),
+    )
+    assert list(cache.lookup(ticker="AAPL", timespan="day", trade_dates=[date(2026, 2, 19), date(2026, 2, 20)])) == [
+        date(2026, 2, 20)
+    ]
+    wider_session = QueuedResultSession([_day_row(date(2026, 2, 19), close=99.0)])
+    wider = await SqlAlchemyMarketDataRepository(session=wider_session, final_bar_cache=cache).list_day_bars(
+        ticker="AAPL",
+        start_at=datetime(2026, 2, 19, tzinfo=timezone.utc),
+        end_at=datetime(2026, 2, 20, 12, tzinfo=timezone.utc),
+    )
+
+    assert [(bar.start_at.date(), bar.close) for bar in wider] == [
+        (date(2026, 2, 19), 99.0),
+        (date(2026, 2, 20), 101.0),
+    ]
+    assert len(wider_session.statements) == 1
+
+    # A weekend read through the end of its last day caches both dates as empty.
+    weekend = {
+        "ticker": "AAPL",
+        "start_at": datetime(2026, 2, 21, tzinfo=timezone.utc),
+        "end_at": datetime.combine(date(2026, 2, 22), time.max, tzinfo=timezone.utc),
+    }
+    assert await SqlAlchemyMarketDataRepository(
+        session=QueuedResultSession([]),
+        final_bar_cache=cache,
+    ).list_day_bars(**weekend) == []
+    repeat_session = QueuedResultSession()
+    assert await SqlAlchemyMarketDataRepository(session=repeat_session, final_bar_cache=cache).list_day_bars(
+        **weekend
+    ) == []
+    assert repeat_session.statements == []
+
+
+class FakeGenerations:
+    def __init__(self) -> None:
+        self.generations: dict[date, int] | None = {}
+
+    async def current(self, *, ticker: str, timespan: str) -> dict[date, int] | None:
+        return self.generations
+
+
+async def test_repository_reuses_minute_segment_until_another_process_writes() -> None:
+    opened_at = datetime(2026, 2, 10, 14, 30, tzinfo=timezone.utc)
+    bars = [_minute_bar(opened_at + timedelta(minutes=offset)) for offset in range(2)]
+    rows = [
+        MarketBarMinuteModel(
+            ticker=bar.ticker,
+            trade_date=date(2026, 2, 10),
+            start_at=bar.start_at,
+            open=bar.open,
+            high=bar.high,
+            low=bar.low,
+            close=bar.close,
+            volume=bar.volume,
+            vwap=None,
+            trades=None,
+            is_final=True,
+            source="massive",
+        )
+        for bar in bars
+    ]
+    cache = FinalBarSegmentCache(max_bytes=1 << 20)
+    generations = FakeGenerations()
+    coverage_reads: list[tuple[date, date]] = []
+
+    async def _list_coverage(*, ticker: str, start_date: date, end_date: date) -> list[MinuteCoverage]:
+        coverage_reads.append((start_date, end_date))
+        return build_minute_coverage(bars)
+
+    async def _read(session: QueuedResultSession) -> list[MarketBar]:
+        repo = SqlAlchemyMarketDataRepository(
+            session=session,
+            final_bar_cache=cache,
+            final_bar_generations=generations,  # type: ignore[arg-type]
+        )
+        repo.list_minute_coverage = _list_coverage  # type: ignore[method-assign]
+        return await repo.list_minute_bars(
+            ticker="AAPL",
+            start_at=opened_at,
+            end_at=opened_at + timedelta(hours=6, minutes=29),
+            session="regular",
+        )
+
+    assert await _read(QueuedResultSession(rows)) == bars
+    cached_session = QueuedResultSession()
+    assert await _read(cached_session) == bars
+    # A cached read needs neither the coverage query nor a bar query.
+    assert cached_session.statements == []
+    assert coverage_reads == [(date(2026, 2, 10), date(2026, 2, 10))]
+
+    # Another process wrote the trade date, so the segment is dropped and read again.
+    generations.generations = {date(2026, 2, 10): 1}
+    stale_session = QueuedResultSession(rows)
+    assert await _read(stale_session) == bars
+    assert len(stale_session.statements) == 1
+    assert len(coverage_reads) == 2
+    assert cache.stats().entries == 1
+
+    # Without shared generations the cache is bypassed rather than trusted.
+    generations.generations = None
+    bypass_session = QueuedResultSession(rows)
+    assert await _read(bypass_session) == bars
+    assert len(bypass_session.statements) == 1
+    assert len(coverage_reads) == 2
+
+
+async def test_repository_publishes_written_trade_dates_after_commit() -> None:
+    class RecordingGenerations(FakeGenerations):
+        def __init__(self) -> None:
+            super().__init__()
+            self.bumps: list[dict[tuple[str, str], set[date]]] = []
+
+        async def bump(self, *, touched: dict[tuple[str, str], set[date]]) -> None:
+            self.bumps.append(touched)
+
+    generations = RecordingGenerations()
+    repo = SqlAlchemyMarketDataRepository(
+        session=QueuedResultSession([], [], [], []),
+        final_bar_cache=FinalBarSegmentCache(max_bytes=1 << 20),
+        final_bar_generations=generations,  # type: ignore[arg-type]
+    )
+    # Rolled-back writes are never announced.
+    await repo.upsert_minute_bars([_minute_bar(datetime(2026, 2, 10, 15, tzinfo=timezone.utc))])
+    repo.discard_uncommitted_writes()
+    await repo.publish_committed_writes()
+    await repo.upsert_minute_bars([_minute_bar(datetime(2026, 2, 11, 15, tzinfo=timezone.utc))])
+    await repo.publish_committed_writes()
+
+    assert generations.bumps == [{("AAPL", "minute"): {date(2026, 2, 11)}}]
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from app.infrastructure.clients.massive_http import MassiveHttpClient
+
+
+class StandInMassiveServer:
+    # Minimal HTTP/1.1 keep-alive server answering a fixed route table.
+    def __init__(self, routes: dict[str, object]) -> None:
+        self.routes = routes
+        self.requests: list[tuple[str, dict[str, list[str]], str]] = []
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay_seconds = 0.0
+        self._server: asyncio.base_events.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def __aenter__(self) -> "StandInMassiveServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in {b"\r\n", b""}:
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                _, target, _ = request_line.decode().split(" ", 2)
+                parsed = urlsplit(target)
+                self.requests.append((parsed.path, parse_qs(parsed.query), headers.get("authorization", "")))
+
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                await asyncio.sleep(self.delay_seconds)
+                self.in_flight -= 1
+
+                route = self.routes.get(parsed.path)
+                status, payload = route(parsed.query) if callable(route) else (200, route)
+                body = json.dumps(payload).encode() if payload is not None else b""
+                writer.write(
+                    f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+async def test_http_client_paginates_aggs_over_one_keepalive_connection() -> None:
+    aggs_path = "/v2/aggs/ticker/AAPL/range/1/minute/2026-02-10/2026-02-10"
+    server = StandInMassiveServer(routes={})
+
+    def aggs(query: str) -> tuple[int, object]:
+        if "cursor=page2" in query:
+            return 200, {"results": [{"t": 1770733860000, "o": 2, "h": 2, "l": 2, "c": 2, "v": 20}]}
+        return 200, {
+            "results": [{"t": 1770733800000, "o": 1, "h": 1, "l": 1, "c": 1, "v": 10}],
+            "next_url": f"{server.base_url}{aggs_path}?cursor=page2",
+        }
+
+    server.routes[aggs_path] = aggs
+    async with server:
+        client = MassiveHttpClient("secret", server.base_url)
+        try:
+            first = await client.list_aggs(
+                ticker="AAPL",
+                multiplier=1,
+                timespan="minute",
+                from_date="2026-02-10",
+                to_date="2026-02-10",
+            )
+            second = await client.list_aggs(
+                ticker="AAPL",
+                multiplier=1,
+                timespan="minute",
+                from_date="2026-02-10",
+                to_date="2026-02-10",
+            )
+        finally:
+            await client.aclose()
+
+    assert [item["t"] for item in first] == [1770733800000, 1770733860000]
+    assert second == first
+    assert server.connections == 1
+    assert server.requests[0][1] == {"adjusted": ["true"], "sort": ["asc"], "limit": ["50000"]}
+    assert server.requests[1][1] == {"cursor": ["page2"]}
+    assert {request[2] for request in server.requests} == {"Bearer secret"}
+
+
+async def test_http_client_maps_snapshots_to_sdk_field_names() -> None:
+    routes = {
+        "/v2/snapshot/locale/us/markets/stocks/tickers": {
+            "status": "OK",
+            "tickers": [
+                {
+                    "ticker": "AAPL",
+                    "todaysChange": 1.5,
+                    "todaysChangePerc": 0.75,
+                    "updated": 1770733800000000000,
+                    "day": {"o": 200.0, "h": 203.0, "l": 199.0, "c": 201.5, "v": 1000},
+                    "lastTrade": {"p": 201.6, "s": 10, "t": 1770733800000000000},
+                }
+            ],
+        },
+        "/v1/marketstatus/upcoming": [{"date": "2026-07-03", "status": "closed", "exchange": "NYSE"}],
+        "/v1/marketstatus/now": {"market": "open"},
+    }
+    async with StandInMassiveServer(routes=routes) as server:
+        client = MassiveHttpClient("secret", server.base_url)
+        try:
+            snapshots = await client.list_snapshots(tickers=["AAPL", "NVDA"])
+            holidays = await client.list_market_holidays()
+            status = await client.get_market_status()
+        finally:
+            await client.aclose()
+
+    assert server.requests[0][1] == {"tickers": ["AAPL,NVDA"]}
+    assert snapshots[0]["ticker"] == "AAPL"
+    assert snapshots[0]["last_trade"]["price"] == 201.6
+    assert snapshots[0]["day"]["open"] == 200.0
+    assert snapshots[0]["todays_change_percent"] == 0.75
+    assert holidays == [{"date": "2026-07-03", "status": "closed", "exchange": "NYSE"}]
+    assert status == {"market": "open"}
+
+
+async def test_http_client_caps_concurrent_requests_per_host() -> None:
+    async with StandInMassiveServer(routes={"/v1/marketstatus/now": {"market": "open"}}) as server:
+        server.delay_seconds = 0.02
+        client = MassiveHttpClient("secret", server.base_url, max_concurrency_per_host=2)
+        try:
+            results = await asyncio.gather(*(client.get_market_status() for _ in range(6)))
+        finally:
+            await client.aclose()
+
+    assert results == [{"market": "open"}] * 6
+    assert server.max_in_flight == 2
+    assert server.connections <= 2
+
+
+async def test_http_client_surfaces_rate_limit_status() -> None:
+    routes = {"/v1/marketstatus/now": lambda query: (429, {"status": "ERROR"})}
+    async with StandInMassiveServer(routes=routes) as server:
+        client = MassiveHttpClient("secret", server.base_url)
+        try:
+            with pytest.raises(RuntimeError, match="MARKET_DATA_RATE_LIMITED"):
+                await client.get_market_status()
+        finally:
+            await client.aclose()
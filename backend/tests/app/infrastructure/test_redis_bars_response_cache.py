@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from datetime import date
+
+import redis
+
+from app.infrastructure.coordination import redis_bars_response_cache
+from app.infrastructure.coordination.redis_bars_response_cache import RedisBarsResponseCache
+
+
+class FakePipeline:
+    def __init__(self, client: "FakeRedisClient") -> None:
+        self._client = client
+        self._ops: list[tuple[str, tuple, dict]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    def __getattr__(self, name: str):
+        def _queue(*args, **kwargs) -> None:
+            self._ops.append((name, args, kwargs))
+
+        return _queue
+
+    async def execute(self) -> list[object]:
+        return [await getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in self._ops]
+
+
+class FakeRedisClient:
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.expires: dict[str, int] = {}
+
+    def pipeline(self, *, transaction: bool = True) -> FakePipeline:
+        _ = transaction
+        return FakePipeline(self)
+
+    async def hgetall(self, key: str) -> dict[str, str]:
+        return dict(self.hashes.get(key, {}))
+
+    async def hset(self, key: str, field: str | None = None, value: str | None = None, *, mapping=None) -> int:
+        target = self.hashes.setdefault(key, {})
+        if field is not None:
+            target[field] = value
+        target.update(mapping or {})
+        return 1
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        target = self.hashes.get(key, {})
+        return sum(1 for field in fields if target.pop(field, None) is not None)
+
+    async def delete(self, *keys: str) -> int:
+        return sum(1 for key in keys if self.hashes.pop(key, None) is not None)
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        self.expires[key] = seconds
+        return True
+
+
+class BrokenRedisClient:
+    async def hgetall(self, key: str) -> dict[str, str]:
+        raise redis.ConnectionError("redis unavailable")
+
+
+async def test_bars_response_cache_invalidates_only_entries_covering_written_dates() -> None:
+    client = FakeRedisClient()
+    cache = RedisBarsResponseCache(redis_url="redis://unused", client=client)  # type: ignore[arg-type]
+    fields = {"body": "[]", "data_source": "DB", "partial_range": "false"}
+
+    await cache.put(
+        key="SPY:day:1:regular:2026-02-02:2026-02-06:all",
+        ticker="SPY",
+        start_date=date(2026, 2, 2),
+        end_date=date(2026, 2, 6),
+        fields=fields,
+        ttl_seconds=3600,
+        index_ttl_seconds=3600,
+    )
+    await cache.put(
+        key="SPY:day:1:regular:2026-02-09:2026-02-13:all",
+        ticker="SPY",
+        start_date=date(2026, 2, 9),
+        end_date=date(2026, 2, 13),
+        fields=fields,
+        ttl_seconds=5,
+        index_ttl_seconds=3600,
+    )
+
+    assert client.expires["market:bars:response:SPY:day:1:regular:2026-02-09:2026-02-13:all"] == 5
+    assert await cache.invalidate(ticker="SPY", trade_dates=[date(2026, 2, 10)]) == 1
+
+    assert await cache.get(key="SPY:day:1:regular:2026-02-02:2026-02-06:all") == fields
+    assert await cache.get(key="SPY:day:1:regular:2026-02-09:2026-02-13:all") is None
+    assert list(client.hashes["market:bars:response:index:SPY"]) == [
+        "market:bars:response:SPY:day:1:regular:2026-02-02:2026-02-06:all"
+    ]
+
+
+async def test_bars_response_cache_misses_when_redis_is_unavailable() -> None:
+    cache = RedisBarsResponseCache(redis_url="redis://unused", client=BrokenRedisClient())  # type: ignore[arg-type]
+
+    assert await cache.get(key="SPY:day:1:regular:2026-02-02:2026-02-06:all") is None
+    assert await cache.invalidate(ticker="SPY", trade_dates=[date(2026, 2, 3)]) == 0
+
+
+async def test_bars_response_cache_shares_one_lazily_created_client(monkeypatch) -> None:
+    created: list[FakeRedisClient] = []
+    closed: list[FakeRedisClient] = []
+
+    class ClosableRedisClient(FakeRedisClient):
+        async def aclose(self) -> None:
+            closed.append(self)
+
+    def _from_url(*args: object, **kwargs: object) -> FakeRedisClient:
+        created.append(ClosableRedisClient())
+        return created[-1]
+
+    monkeypatch.setattr(redis_bars_response_cache.redis.Redis, "from_url", _from_url)
+    cache = RedisBarsResponseCache(redis_url="redis://test")
+
+    await cache.put(
+        key="SPY:day:1:regular:2026-02-02:2026-02-06:all",
+        ticker="SPY",
+        start_date=date(2026, 2, 2),
+        end_date=date(2026, 2, 6),
+        fields={"body": "[]"},
+        ttl_seconds=60,
+        index_ttl_seconds=120,
+    )
+    assert await cache.get(key="SPY:day:1:regular:2026-02-02:2026-02-06:all") == {"body": "[]"}
+    assert await cache.invalidate(ticker="SPY", trade_dates=[date(2026, 2, 3)]) == 1
+    await cache.close()
+
+    assert len(created) == 1
+    assert closed == created
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.infrastructure.streaming import redis_event_bus
+from app.infrastructure.streaming.redis_event_bus import (
+    RedisMarketEventPublisher,
+    RedisMarketEventSubscriber,
+    market_event_topic,
+)
+
+
+class FakePubSub:
+    def __init__(self, client: "FakeRedisClient") -> None:
+        self._client = client
+        self.channels: set[str] = set()
+        self.calls: list[tuple[str, tuple[str, ...]]] = []
+        self.closed = False
+
+    async def subscribe(self, *channels: str) -> None:
+        self.calls.append(("subscribe", channels))
+        self.channels.update(channels)
+
+    async def unsubscribe(self, *channels: str) -> None:
+        self.calls.append(("unsubscribe", channels))
+        if channels:
+            self.channels.difference_update(channels)
+        else:
+            self.channels.clear()
+
+    async def get_message(self, *, ignore_subscribe_messages: bool, timeout: float):
+        _ = ignore_subscribe_messages
+        for index, (channel, data) in enumerate(self._client.published):
+            if channel in self.channels:
+                del self._client.published[index]
+                return {"channel": channel, "data": data}
+        await asyncio.sleep(min(timeout, 0.01))
+        return None
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakePipeline:
+    def __init__(self, client: "FakeRedisClient") -> None:
+        self._client = client
+        self._ops: list[tuple[str, str]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    def publish(self, channel: str, message: str) -> None:
+        self._ops.append((channel, message))
+
+    async def execute(self) -> list[int]:
+        self._client.round_trips += 1
+        self._client.published.extend(self._ops)
+        return [1 for _ in self._ops]
+
+
+class FakeRedisClient:
+    def __init__(self) -> None:
+        self.published: list[tuple[str, str]] = []
+        self.pubsubs: list[FakePubSub] = []
+        self.round_trips = 0
+
+    def pipeline(self, *, transaction: bool = True) -> FakePipeline:
+        _ = transaction
+        return FakePipeline(self)
+
+    async def publish(self, channel: str, message: str) -> None:
+        self.round_trips += 1
+        self.published.append((channel, message))
+
+    def pubsub(self) -> FakePubSub:
+        pubsub = FakePubSub(self)
+        self.pubsubs.append(pubsub)
+        return pubsub
+
+    async def aclose(self) -> None:
+        return None
+
+
+def _event(message_type: str, symbol: str, **data: object) -> dict:
+    return {"type": message_type, "data": {"symbol": symbol, **data}}
+
+
+def test_market_event_topic_matches_stream_topics() -> None:
+    assert market_event_topic(_event("market.quote", "aapl")) == "Q.AAPL"
+    assert market_event_topic(_event("market.trade", "AAPL")) == "T.AAPL"
+    assert market_event_topic(_event("market.aggregate", "AAPL", timespan="minute")) == "AM.AAPL"
+    assert market_event_topic(_event("market.aggregate", "AAPL", timespan="second")) == "A.AAPL"
+    assert market_event_topic({"type": "system.status", "data": {"state": "ok"}}) is None
+    assert market_event_topic(_event("market.quote", "")) is None
+
+
+async def test_sharded_publisher_routes_market_events_to_topic_channels(monkeypatch) -> None:
+    client = FakeRedisClient()
+    monkeypatch.setattr(redis_event_bus.redis, "from_url", lambda *args, **kwargs: client)
+    publisher = RedisMarketEventPublisher(redis_url="redis://test", channel="market:events", sharded=True)
+
+    await publisher.publish(_event("market.trade", "AAPL", price=1.0))
+    await publisher.publish({"type": "system.status", "data": {"state": "ok"}})
+
+    assert [channel for channel, _ in client.published] == ["market:events:T.AAPL", "market:events"]
+
+    unsharded = RedisMarketEventPublisher(redis_url="redis://test", channel="market:events")
+    await unsharded.publish(_event("market.trade", "AAPL", price=1.0))
+    assert client.published[-1][0] == "market:events"
+
+
+async def test_publish_many_pipelines_events_in_bounded_batches(monkeypatch) -> None:
+    client = FakeRedisClient()
+    monkeypatch.setattr(redis_event_bus.redis, "from_url", lambda *args, **kwargs: client)
+    publisher = RedisMarketEventPublisher(
+        redis_url="redis://test",
+        channel="market:events",
+        sharded=True,
+        max_batch_size=2,
+    )
+
+    await publisher.publish_many([_event("market.trade", symbol, price=1.0) for symbol in ("AAPL", "MSFT", "NVDA")])
+    await publisher.publish_many([])
+
+    assert client.round_trips == 2
+    assert [channel for channel, _ in client.published] == [
+        "market:events:T.AAPL",
+        "market:events:T.MSFT",
+        "market:events:T.NVDA",
+    ]
+
+
+async def test_sharded_subscriber_follows_topics_incrementally(monkeypatch) -> None:
+    client = FakeRedisClient()
+    monkeypatch.setattr(redis_event_bus.redis, "from_url", lambda *args, **kwargs: client)
+    subscriber = RedisMarketEventSubscriber(redis_url="redis://test", channel="market:events", sharded=True)
+    received: list[dict] = []
+
+    async def on_message(payload: dict) -> None:
+        received.append(payload)
+
+    # Topics set before the listener starts are applied once it subscribes.
+    await subscriber.set_topics({"Q.AAPL"})
+    stop_event = asyncio.Event()
+    listener = asyncio.create_task(subscriber.listen(stop_event=stop_event, on_message=on_message))
+    await asyncio.sleep(0.02)
+    pubsub = client.pubsubs[0]
+    assert pubsub.channels == {"market:events", "market:events:Q.AAPL"}
+
+    await subscriber.set_topics({"Q.AAPL", "T.MSFT"})
+    await subscriber.set_topics({"T.MSFT"})
+    assert pubsub.calls[-2:] == [
+        ("subscribe", ("market:events:T.MSFT",)),
+        ("unsubscribe", ("market:events:Q.AAPL",)),
+    ]
+
+    await client.publish("market:events:Q.AAPL", '{"type":"market.quote","data":{"symbol":"AAPL"}}')
+    await client.publish("market:events:T.MSFT", '{"type":"market.trade","data":{"symbol":"MSFT"}}')
+    await client.publish("market:events", '{"type":"system.status","data":{"state":"ok"}}')
+    await asyncio.sleep(0.05)
+    stop_event.set()
+    await asyncio.wait_for(listener, timeout=1.0)
+
+    assert [payload["type"] for payload in received] == ["market.trade", "system.status"]
+    assert pubsub.channels == set()
+    assert pubsub.closed
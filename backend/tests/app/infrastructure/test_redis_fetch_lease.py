@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import asyncio
+
+import redis
+
+from app.infrastructure.coordination import redis_fetch_lease
+from app.infrastructure.coordination.redis_fetch_lease import RedisFetchLeaseCoordinator
+
+
+class FakePubSub:
+    def __init__(self, client: "FakeRedisClient") -> None:
+        self._client = client
+        self._channels: set[str] = set()
+        self._messages: asyncio.Queue[dict] = asyncio.Queue()
+
+    async def subscribe(self, channel: str) -> None:
+        self._channels.add(channel)
+        self._client.subscribers.setdefault(channel, []).append(self._messages)
+
+    async def unsubscribe(self, channel: str) -> None:
+        self._channels.discard(channel)
+        queues = self._client.subscribers.get(channel, [])
+        if self._messages in queues:
+            queues.remove(self._messages)
+
+    async def get_message(self, *, ignore_subscribe_messages: bool, timeout: float):
+        _ = ignore_subscribe_messages
+        try:
+            return await asyncio.wait_for(self._messages.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self) -> None:
+        return None
+
+
+class FakeRedisClient:
+    def __init__(self, now_provider) -> None:
+        self._now_provider = now_provider
+        self._values: dict[str, str] = {}
+        self._expires_at: dict[str, float] = {}
+        self.subscribers: dict[str, list[asyncio.Queue[dict]]] = {}
+        self.closed = False
+
+    async def set(
+        self,
+        key: str,
+        value: str,
+        *,
+        nx: bool = False,
+        px: int | None = None,
+        ex: int | None = None,
+    ) -> bool | None:
+        self._purge_expired()
+        if nx and key in self._values:
+            return None
+        self._values[key] = value
+        self._expires_at.pop(key, None)
+        if px is not None:
+            self._expires_at[key] = self._now_provider() + px / 1000
+        if ex is not None:
+            self._expires_at[key] = self._now_provider() + ex
+        return True
+
+    async def get(self, key: str):
+        self._purge_expired()
+        return self._values.get(key)
+
+    async def eval(self, script: str, numkeys: int, key: str, token: str, *args: object) -> int:
+        _ = numkeys
+        self._purge_expired()
+        if self._values.get(key) != token:
+            return 0
+        if "pexpire" in script:
+            self._expires_at[key] = self._now_provider() + int(args[0]) / 1000
+            return 1
+        self._values.pop(key, None)
+        self._expires_at.pop(key, None)
+        return 1
+
+    async def publish(self, channel: str, message: str) -> int:
+        queues = list(self.subscribers.get(channel, []))
+        for queue in queues:
+            queue.put_nowait({"type": "message", "data": message})
+        return len(queues)
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self)
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+    def _purge_expired(self) -> None:
+        now = self._now_provider()
+        expired = [key for key, expire_at in self._expires_at.items() if expire_at <= now]
+        for key in expired:
+            self._values.pop(key, None)
+            self._expires_at.pop(key, None)
+
+
+class BrokenRedisClient:
+    async def set(self, key: str, value: str, **kwargs) -> bool:
+        raise redis.ConnectionError("redis unavailable")
+
+
+def _coordinator(client: object, *, now_provider, wait_timeout_seconds: int = 5) -> RedisFetchLeaseCoordinator:
+    return RedisFetchLeaseCoordinator(
+        redis_url="redis://unused",
+        lease_ttl_seconds=2,
+        wait_timeout_seconds=wait_timeout_seconds,
+        poll_interval_seconds=0.01,
+        renew_interval_seconds=0.01,
+        client=client,  # type: ignore[arg-type]
+        time_provider=now_provider,
+    )
+
+
+async def test_fetch_lease_lets_followers_reuse_leader_result() -> None:
+    loop = asyncio.get_running_loop()
+    client = FakeRedisClient(now_provider=loop.time)
+    leader_started = asyncio.Event()
+    release_leader = asyncio.Event()
+    calls: list[str] = []
+
+    async def leader() -> str:
+        calls.append("leader")
+        leader_started.set()
+        await release_leader.wait()
+        return "fetched"
+
+    async def follower() -> str:
+        calls.append("follower")
+        return "reread"
+
+    first = asyncio.create_task(
+        _coordinator(client, now_provider=loop.time).run_or_wait(key="minute:AAPL", leader=leader, follower=follower)
+    )
+    await leader_started.wait()
+    second = asyncio.create_task(
+        _coordinator(client, now_provider=loop.time).run_or_wait(key="minute:AAPL", leader=leader, follower=follower)
+    )
+    await asyncio.sleep(0.02)
+    release_leader.set()
+
+    assert await first == "fetched"
+    assert await second == "reread"
+    assert calls == ["leader", "follower"]
+
+
+async def test_fetch_lease_follower_takes_over_when_leader_fails() -> None:
+    loop = asyncio.get_running_loop()
+    client = FakeRedisClient(now_provider=loop.time)
+    leader_started = asyncio.Event()
+    release_leader = asyncio.Event()
+
+    async def failing_leader() -> str:
+        leader_started.set()
+        await release_leader.wait()
+        raise RuntimeError("upstream failed")
+
+    async def healthy_leader() -> str:
+        return "fetched"
+
+    async def follower() -> str:
+        raise AssertionError("follower should not reuse a failed fetch")
+
+    first = asyncio.create_task(
+        _coordinator(client, now_provider=loop.time).run_or_wait(
+            key="day:AAPL",
+            leader=failing_leader,
+            follower=follower,
+        )
+    )
+    await leader_started.wait()
+    second = asyncio.create_task(
+        _coordinator(client, now_provider=loop.time).run_or_wait(
+            key="day:AAPL",
+            leader=healthy_leader,
+            follower=follower,
+        )
+    )
+    await asyncio.sleep(0.02)
+    release_leader.set()
+
+    results = await asyncio.gather(first, second, return_exceptions=True)
+    assert isinstance(results[0], RuntimeError)
+    assert results[1] == "fetched"
+
+
+async def test_fetch_lease_recovers_after_lost_lease_expires() -> None:
+    current = 100.0
+    client = FakeRedisClient(now_provider=lambda: current)
+    await client.set("market:bars:fetch-lease:lease:minute:AAPL", "crashed-owner", nx=True, px=2000)
+
+    async def leader() -> str:
+        return "fetched"
+
+    async def follower() -> str:
+        raise AssertionError("follower should not run without a leader result")
+
+    coordinator = _coordinator(client, now_provider=lambda: current)
+    task = asyncio.create_task(coordinator.run_or_wait(key="minute:AAPL", leader=leader, follower=follower))
+    await asyncio.sleep(0.03)
+    assert not task.done()
+
+    current = 103.0
+
+    assert await task == "fetched"
+
+
+async def test_fetch_lease_renews_slow_leader_and_never_duplicates_its_fetch() -> None:
+    current = 100.0
+    client = FakeRedisClient(now_provider=lambda: current)
+    leader_started = asyncio.Event()
+    release_leader = asyncio.Event()
+    calls: list[str] = []
+
+    async def slow_leader() -> str:
+        calls.append("leader")
+        leader_started.set()
+        await release_leader.wait()
+        return "fetched"
+
+    async def follower() -> str:
+        calls.append("follower")
+        return "reread"
+
+    first = asyncio.create_task(
+        _coordinator(client, now_provider=lambda: current, wait_timeout_seconds=1).run_or_wait(
+            key="minute:AAPL",
+            leader=slow_leader,
+            follower=follower,
+        )
+    )
+    await leader_started.wait()
+    second = asyncio.create_task(
+        _coordinator(client, now_provider=lambda: current, wait_timeout_seconds=1).run_or_wait(
+            key="minute:AAPL",
+            leader=slow_leader,
+            follower=follower,
+        )
+    )
+    # Well past the 2s lease TTL and the follower's 1s wait: the lease is still held thanks to
+    # renewal, so the follower reuses stored bars instead of fetching upstream itself.
+    for _ in range(5):
+        current += 0.9
+        await asyncio.sleep(0.03)
+
+    assert await second == "reread"
+    assert await client.get("market:bars:fetch-lease:lease:minute:AAPL") is not None
+    release_leader.set()
+    assert await first == "fetched"
+    assert calls == ["leader", "follower"]
+
+
+async def test_fetch_lease_runs_leader_when_redis_is_unavailable() -> None:
+    async def leader() -> str:
+        return "fetched"
+
+    async def follower() -> str:
+        raise AssertionError("follower should not run without redis")
+
+    coordinator = _coordinator(BrokenRedisClient(), now_provider=lambda: 0.0)
+
+    assert await coordinator.run_or_wait(key="minute:AAPL", leader=leader, follower=follower) == "fetched"
+
+
+async def test_fetch_lease_reuses_one_lazily_created_client(monkeypatch) -> None:
+    loop = asyncio.get_running_loop()
+    clients: list[FakeRedisClient] = []
+
+    def _from_url(*args: object, **kwargs: object) -> FakeRedisClient:
+        clients.append(FakeRedisClient(now_provider=loop.time))
+        return clients[-1]
+
+    monkeypatch.setattr(redis_fetch_lease.redis.Redis, "from_url", _from_url)
+    coordinator = RedisFetchLeaseCoordinator(
+        redis_url="redis://test",
+        poll_interval_seconds=0.01,
+        renew_interval_seconds=0.01,
+    )
+
+    async def leader() -> str:
+        await asyncio.sleep(0.03)
+        return "fetched"
+
+    async def follower() -> str:
+        return "reread"
+
+    results = await asyncio.gather(
+        *(coordinator.run_or_wait(key="minute:AAPL", leader=leader, follower=follower) for _ in range(3))
+    )
+    await coordinator.close()
+
+    assert sorted(results) == ["fetched", "reread", "reread"]
+    assert len(clients) == 1
+    assert clients[0].closed
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from datetime import date
+
+import redis
+
+from app.infrastructure.coordination.redis_final_bar_generations import RedisFinalBarGenerations
+
+
+class FakePipeline:
+    def __init__(self, client: "FakeRedisClient") -> None:
+        self._client = client
+        self._ops: list[tuple[str, tuple]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    def hincrby(self, key: str, field: str, amount: int) -> None:
+        self._ops.append(("hincrby", (key, field, amount)))
+
+    def expire(self, key: str, seconds: int) -> None:
+        self._ops.append(("expire", (key, seconds)))
+
+    async def execute(self) -> list[object]:
+        return [await getattr(self._client, name)(*args) for name, args in self._ops]
+
+
+class FakeRedisClient:
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.reads = 0
+
+    def pipeline(self, *, transaction: bool = True) -> FakePipeline:
+        _ = transaction
+        return FakePipeline(self)
+
+    async def hgetall(self, key: str) -> dict[str, str]:
+        self.reads += 1
+        return dict(self.hashes.get(key, {}))
+
+    async def hincrby(self, key: str, field: str, amount: int) -> int:
+        target = self.hashes.setdefault(key, {})
+        target[field] = str(int(target.get(field, "0")) + amount)
+        return int(target[field])
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        return True
+
+
+class BrokenRedisClient:
+    async def hgetall(self, key: str) -> dict[str, str]:
+        raise redis.ConnectionError("redis unavailable")
+
+
+async def test_generations_reach_other_processes_after_the_sync_interval() -> None:
+    client = FakeRedisClient()
+    current = 100.0
+    writer = RedisFinalBarGenerations(redis_url="redis://unused", client=client)  # type: ignore[arg-type]
+    reader = RedisFinalBarGenerations(
+        redis_url="redis://unused",
+        sync_interval_seconds=1.0,
+        client=client,  # type: ignore[arg-type]
+        time_provider=lambda: current,
+    )
+
+    assert await reader.current(ticker="AAPL", timespan="minute") == {}
+    await writer.bump(touched={("AAPL", "minute"): {date(2026, 2, 10), date(2026, 2, 11)}})
+
+    # Inside the interval the reader keeps its copy.
+    assert await reader.current(ticker="AAPL", timespan="minute") == {}
+    current = 101.0
+    assert await reader.current(ticker="AAPL", timespan="minute") == {date(2026, 2, 10): 1, date(2026, 2, 11): 1}
+    assert client.reads == 2
+
+    # A process sees its own writes without waiting for the next sync.
+    await reader.bump(touched={("AAPL", "minute"): {date(2026, 2, 11)}})
+    assert await reader.current(ticker="AAPL", timespan="minute") == {date(2026, 2, 10): 1, date(2026, 2, 11): 2}
+    assert client.reads == 2
+
+
+async def test_generations_are_unknown_when_redis_is_unavailable() -> None:
+    generations = RedisFinalBarGenerations(redis_url="redis://unused", client=BrokenRedisClient())  # type: ignore[arg-type]
+
+    assert await generations.current(ticker="AAPL", timespan="day") is None
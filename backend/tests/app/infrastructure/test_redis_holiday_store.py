@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import redis
+
+from app.infrastructure.coordination.redis_holiday_store import RedisHolidayOverrideStore
+
+
+class FakeRedisClient:
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+        self.expires: dict[str, int] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: str, *, nx: bool = False, ex: int | None = None) -> bool | None:
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        if ex is not None:
+            self.expires[key] = ex
+        return True
+
+
+class BrokenRedisClient:
+    async def get(self, key: str) -> str | None:
+        raise redis.ConnectionError("redis unavailable")
+
+    async def set(self, key: str, value: str, **kwargs) -> bool:
+        raise redis.ConnectionError("redis unavailable")
+
+
+async def test_holiday_store_round_trips_versioned_payload() -> None:
+    client = FakeRedisClient()
+    store = RedisHolidayOverrideStore(redis_url="redis://unused", client=client)  # type: ignore[arg-type]
+    overrides = [{"date": "2026-07-03", "closed": True, "open": None, "close": None}]
+
+    assert await store.read_version() is None
+    assert await store.write(version="v1", refreshed_at=1.0, overrides=overrides, ttl_seconds=1800) is True
+
+    assert await store.read_version() == "v1"
+    assert await store.read() == {"version": "v1", "refreshed_at": 1.0, "overrides": overrides}
+    assert client.expires == {"market:calendar:holidays:payload": 1800, "market:calendar:holidays:version": 1800}
+    assert await store.try_acquire_refresh_lease(ttl_seconds=60) is True
+    assert await store.try_acquire_refresh_lease(ttl_seconds=60) is False
+
+
+async def test_holiday_store_reports_empty_when_redis_is_unavailable() -> None:
+    store = RedisHolidayOverrideStore(redis_url="redis://unused", client=BrokenRedisClient())  # type: ignore[arg-type]
+
+    assert await store.read_version() is None
+    assert await store.read() is None
+    assert await store.write(version="v1", refreshed_at=1.0, overrides=[], ttl_seconds=60) is False
+    assert await store.try_acquire_refresh_lease(ttl_seconds=60) is True